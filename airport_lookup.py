@@ -0,0 +1,83 @@
+"""IATA-indexed airport metadata from airports.csv.
+
+``AirportLookup`` keeps airports.csv as column arrays plus one position
+array indexed by the shared ``schema.IATA`` code: looking up any number of
+airports is one integer gather per column, instead of a hash join against
+the whole file.  ``take`` is the bulk form (unknown codes give NaN, like a
+left merge), ``info`` returns one airport's row through a plain dict, as
+encoding a single code against the table costs more than the lookup.
+
+``airport_lookup()`` is the process-wide instance.  It is keyed on the
+frame ``data_loader`` returns for airports.csv, so editing the file swaps
+in a fresh lookup on the next call (hot reload) without a server restart.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_loader import load_airports
+from schema import IATA
+
+_lookup = {}
+_lookup_lock = threading.Lock()
+
+
+class AirportLookup:
+    """airports.csv rows addressed by IATA table code."""
+
+    def __init__(self, airports):
+        self.frame = airports.drop_duplicates('IATA').reset_index(drop=True)
+        codes = IATA.encode(self.frame['IATA']).cat.codes.to_numpy()
+        known = codes >= 0
+        # Row of every code in the table at build time; -1 where no airport
+        self._rows = np.full(len(IATA), -1, dtype=np.int64)
+        self._rows[codes[known]] = np.flatnonzero(known)
+        self._row_of = {code: row for row, code in enumerate(self.frame['IATA'].astype(object)) if known[row]}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def positions(self, codes):
+        """Row in ``frame`` for each airport code (-1 where unknown)."""
+        codes = IATA.encode(codes).cat.codes.to_numpy()
+        # Codes added to the table after this lookup was built are unknown
+        valid = (codes >= 0) & (codes < len(self._rows))
+        return np.where(valid, self._rows[np.where(valid, codes, 0)], -1)
+
+    def contains(self, codes):
+        return self.positions(codes) >= 0
+
+    def take(self, codes, columns=None):
+        """Metadata for each code, in order; ``columns`` maps (or lists) the columns wanted.
+
+        Rows for unknown codes are all-NaN, as with a left merge.
+        """
+        columns = columns if columns is not None else list(self.frame.columns)
+        if not isinstance(columns, dict):
+            columns = {col: col for col in columns}
+        rows = self.positions(codes)
+        return pd.DataFrame({new: pd.api.extensions.take(self.frame[col].array, rows, allow_fill=True)
+                             for col, new in columns.items()})
+
+    def info(self, code):
+        """One airport's metadata row (name, city, coordinates...)."""
+        return self.frame.iloc[self._row_of[code]]
+
+
+def airport_lookup(airports=None):
+    """Process-wide AirportLookup, rebuilt whenever airports.csv changes.
+
+    ``airports`` defaults to ``data_loader.load_airports()``; any other
+    frame gets (and keeps, while it is the latest) its own lookup.
+    """
+    airports = load_airports() if airports is None else airports
+    with _lookup_lock:
+        cached = _lookup.get(id(airports))
+        if cached is not None and cached[0] is airports:
+            return cached[1]
+        lookup = AirportLookup(airports)
+        _lookup.clear()
+        _lookup[id(airports)] = (airports, lookup)
+        return lookup
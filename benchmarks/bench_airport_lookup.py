@@ -0,0 +1,66 @@
+"""Origin enrichment: merge + rename against airports.csv vs. the IATA-indexed gather.
+
+Times the join the airports tab used to run on every render (a left merge
+of the flight rows on ``Origin_airport``/``IATA`` followed by renaming six
+columns) against ``flights.enrich_origins``, which gathers the same columns
+through ``airport_lookup``.  Results are checked for equality.
+
+    python benchmarks/bench_airport_lookup.py --rows 1000 100000 1000000 --airports 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import pandas as pd
+
+from airport_lookup import airport_lookup
+from flights import AIRPORT_COLUMNS, enrich_origins
+from schema import apply_schema
+from synthetic import synthetic_airports
+
+
+def timed(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def merge_origins(flights, airports):
+    """The original per-render join."""
+    return flights.merge(
+        airports[['IATA'] + list(AIRPORT_COLUMNS)],
+        how='left', left_on='Origin_airport', right_on='IATA'
+    ).rename(columns=AIRPORT_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--airports', type=int, default=1_000, help='extra synthetic airports')
+    args = parser.parse_args()
+
+    airports = apply_schema(synthetic_airports(args.airports))
+    build_ms, _ = timed(lambda: airport_lookup(airports.copy()), repeat=1)
+    airport_lookup(airports)
+    print(f"# {len(airports):,} airports, lookup built in {build_ms:.1f} ms")
+    print(f"{'rows':>12} {'merge ms':>9} {'gather ms':>10} {'speedup':>8}")
+    rng = np.random.default_rng(0)
+    codes = airports['IATA'].astype(object).to_numpy()
+    for rows in args.rows:
+        flights = apply_schema(pd.DataFrame({'Origin_airport': rng.choice(codes, rows),
+                                             'Flight_Count': rng.integers(1, 100, rows)}))
+        merge_ms, merged = timed(lambda: merge_origins(flights, airports))
+        gather_ms, gathered = timed(lambda: enrich_origins(flights, airports))
+        pd.testing.assert_frame_equal(merged.astype(object), gathered.astype(object))
+        print(f"{rows:>12,} {merge_ms:>9.2f} {gather_ms:>10.2f} {merge_ms / gather_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Time to first paint of a fresh dashboard process, with and without warm-up.
+
+Every measurement runs in a new Python process (the cost being measured is
+the cold start itself), which loads ``testone.py`` through Streamlit's
+``AppTest`` and times its first complete run on the default tab:
+
+* ``cold``: the first session arrives as soon as the process is up; the
+  warm-up starts with it, in the background (plain ``streamlit run``);
+* ``warmed``: the process warms up first, as ``python startup.py`` does at
+  boot, and the session arrives when it is done.
+
+Each mode runs with an empty ``.data_cache`` (a new image) and with the
+Parquet sidecars of an earlier process on disk.  Reported: the first run,
+the cold import time of the dashboard modules and of the deferred Plotly
+Express and Matplotlib imports (None: not imported by then), and the
+warm-up's wall time.
+
+    python benchmarks/bench_cold_start.py --scale small --repeat 3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+MODES = ('cold', 'warmed')
+
+
+def child(mode):
+    """One fresh process: optionally warm up, then time the first run of the app."""
+    import startup
+    from streamlit.testing.v1 import AppTest
+
+    if mode == 'warmed':
+        startup.start_warm_up()
+        while startup.warm_up_report() is None:
+            time.sleep(0.01)
+    at = AppTest.from_file(str(ROOT / 'testone.py'), default_timeout=600)
+    start = time.perf_counter()
+    at.run()
+    first_run_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError([e.message for e in at.exception])
+    timings = startup.timeline.to_dict()
+    warm = startup.warm_up_report() or {}
+    print(json.dumps({'first_run_ms': round(first_run_ms, 1), 'imports_ms': timings['imports_ms'],
+                      'warm_up_ms': warm.get('wall_ms')}))
+
+
+def run_child(mode, env):
+    out = subprocess.run([sys.executable, __file__, '--child', mode], env=env, capture_output=True,
+                         text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    from synthetic import SCALES, write_dataset
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', default='tiny', choices=list(SCALES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    work_dir = Path(tempfile.mkdtemp(prefix='bench_cold_start-'))
+    try:
+        data_dir = write_dataset(work_dir / 'data', **SCALES[args.scale])
+        print(f"# scale {args.scale}: {SCALES[args.scale]}")
+        print(f"{'mode':>7} {'disk cache':>10} {'first run ms':>13} {'modules ms':>11} "
+              f"{'px ms':>7} {'mpl ms':>7} {'warm-up ms':>11}")
+        for disk in ('empty', 'warm'):
+            for mode in MODES:
+                runs = []
+                for _ in range(args.repeat):
+                    cache_dir = work_dir / 'cache'
+                    if disk == 'empty':
+                        shutil.rmtree(cache_dir, ignore_errors=True)
+                    env = {**os.environ, 'DASHBOARD_DATA_DIR': str(data_dir), 'DASHBOARD_CACHE_DIR': str(cache_dir)}
+                    runs.append(run_child(mode, env))
+                best = min(runs, key=lambda r: r['first_run_ms'])
+                imports = best['imports_ms']
+                print(f"{mode:>7} {disk:>10} {best['first_run_ms']:>13.0f} "
+                      f"{imports.get('dashboard modules', 0):>11.0f} {str(imports.get('plotly.express')):>7} "
+                      f"{str(imports.get('matplotlib.figure')):>7} {str(best['warm_up_ms']):>11}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Eager vs. streaming construction of the tab-1 route table.
+
+Generates a synthetic flight log shaped like "Airports_P 1.csv" (or uses an
+existing file) and folds it into one row per (destination, origin) route:
+
+* eager: the whole CSV in memory (every column, as ``pd.read_csv`` gives
+  it), then one groupby;
+* stream: ``route_index.build_routes``, the chunked scan the dashboard
+  builds its route index with, holding one chunk plus the per-chunk route
+  counts at a time.
+
+Each mode runs in its own subprocess so the peak RSS numbers are not
+polluted by the other run; both must agree on the routes, the total
+flights and the flights into ``--destination``.
+
+    python benchmarks/bench_flights_streaming.py --rows 5000000
+    python benchmarks/bench_flights_streaming.py --csv "Airports_P 1.csv"
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from synthetic import write_synthetic_flights
+
+
+def eager_routes(csv):
+    from data_loader import DTYPES, FLIGHTS_CSV
+    from route_index import ROUTE_KEYS
+
+    flights = pd.read_csv(csv, dtype=DTYPES[FLIGHTS_CSV])
+    return flights.groupby(ROUTE_KEYS, sort=False).agg(
+        Flight_Count=('Origin_airport', 'size'),
+        Origin_population=('Origin_population', 'first'),
+    ).reset_index()
+
+
+def run_mode(mode, csv, destination):
+    from route_index import build_routes
+
+    start = time.perf_counter()
+    routes = eager_routes(csv) if mode == 'eager' else build_routes(csv)[0]
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        'mode': mode,
+        'seconds': round(elapsed, 3),
+        'peak_rss_mb': round(peak_kb / 1024, 1),
+        'routes': len(routes),
+        'flights': int(routes['Flight_Count'].sum()),
+        'hub_flights': int(routes.loc[routes['Destination_airport'] == destination, 'Flight_Count'].sum()),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--csv', help='existing flight log to use instead of a synthetic one')
+    parser.add_argument('--destination', default='ORD')
+    parser.add_argument('--run', choices=['eager', 'stream'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_mode(args.run, args.csv, args.destination)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = args.csv
+        if csv is None:
+            csv = os.path.join(tmp, 'flights.csv')
+            write_synthetic_flights(csv, args.rows, args.destination)
+        print(f"# {csv}: {os.path.getsize(csv) / 1e6:.0f} MB")
+        results = []
+        for mode in ('eager', 'stream'):
+            out = subprocess.run(
+                [sys.executable, __file__, '--run', mode, '--csv', csv, '--destination', args.destination],
+                check=True, capture_output=True, text=True)
+            results.append(json.loads(out.stdout))
+            print(out.stdout.strip())
+
+    eager, stream = results
+    keys = ('routes', 'flights', 'hub_flights')
+    if [eager[k] for k in keys] != [stream[k] for k in keys]:
+        sys.exit("eager and streaming results differ")
+    print(f"# streaming: {eager['peak_rss_mb'] / stream['peak_rss_mb']:.1f}x less peak RSS, "
+          f"{eager['seconds'] / stream['seconds']:.2f}x wall-time ratio")
+
+
+if __name__ == '__main__':
+    main()
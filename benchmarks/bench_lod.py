@@ -0,0 +1,71 @@
+"""Plotly payload size of the dense tab-1 charts, full detail vs. the point budget.
+
+Builds a synthetic hub with a growing number of origin airports and
+serializes the route map (great-circle paths), the stacked city bar, the
+state bar and the distance histogram with ``budget=None`` and with
+``lod.POINT_BUDGET``.  With the budget, payloads should stop growing once
+the data exceeds it.
+
+    python benchmarks/bench_lod.py --origins 300 3000 30000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import plotly.io as pio
+
+import charts
+from flights import AIRPORT_COLUMNS, state_flight_counts
+from geo import haversine
+from lod import POINT_BUDGET
+from synthetic import synthetic_airports
+
+HUB_LON, HUB_LAT = -87.9, 41.98
+
+
+def synthetic_hub_routes(origins, seed=0):
+    """One enriched row per origin airport, shaped like ``RouteIndex.hub_routes``."""
+    rng = np.random.default_rng(seed)
+    airports = synthetic_airports(max(0, origins - 300), seed).head(origins)
+    routes = airports[list(AIRPORT_COLUMNS)].rename(columns=AIRPORT_COLUMNS).reset_index(drop=True)
+    routes['Origin_airport'] = airports['IATA'].to_numpy()
+    routes['Origin_population'] = rng.integers(50_000, 9_000_000, len(routes)).astype(float)
+    routes['Flight_Count'] = rng.integers(1, 5_000, len(routes))
+    routes['Distance_miles'] = haversine(routes['Origin_longitude'], routes['Origin_latitude'], HUB_LON, HUB_LAT)
+    return routes
+
+
+def payloads(routes, budget):
+    figures = {
+        'route_map': charts.route_map(routes, 'HUB', 'Hub', HUB_LON, HUB_LAT, great_circle=True, budget=budget),
+        'city_bar': charts.city_population_bar(routes, budget=budget),
+        'state_bar': charts.state_flights_bar(state_flight_counts(routes), 'HUB', 'Hub', budget=budget),
+        'distance_hist': charts.distance_histogram(routes, 'HUB', budget=budget),
+    }
+    return {name: len(pio.to_json(fig, validate=False)) / 1024 for name, fig in figures.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--origins', type=int, nargs='+', default=[300, 3_000, 30_000])
+    args = parser.parse_args()
+
+    print(f"# point budget {POINT_BUDGET:,}; payload KiB per chart")
+    header = None
+    for origins in args.origins:
+        routes = synthetic_hub_routes(origins)
+        full, reduced = payloads(routes, None), payloads(routes, POINT_BUDGET)
+        if header is None:
+            header = list(full)
+            print(f"{'origins':>8} " + ' '.join(f"{name:>24}" for name in header))
+        cells = ' '.join(f"{full[name]:>10.0f} -> {reduced[name]:>10.0f}" for name in header)
+        print(f"{len(routes):>8,} {cells}")
+
+
+if __name__ == '__main__':
+    main()
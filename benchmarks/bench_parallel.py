@@ -0,0 +1,89 @@
+"""Serial vs. parallel execution of the tab pipelines and the pay-gap engine.
+
+1. All three tabs' data preparation (``pipelines.prepare_tabs``) on a
+   synthetic dataset, with 1 worker and with ``--workers`` threads, each in
+   a fresh subprocess with empty caches.
+2. ``paygap.mean_pay_by_gender`` with 1 worker and with ``--workers``
+   processes reading from shared memory; results are checked for equality.
+
+On a single core the parallel runs fall back to (or cost more than) serial;
+the numbers say so rather than hiding it.
+
+    python benchmarks/bench_parallel.py --scale medium --rows 2000000 10000000 --workers 4
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from synthetic import SCALES, synthetic_genderpay, write_dataset
+
+
+def run_prepare(workers):
+    from pipelines import prepare_tabs
+
+    print(json.dumps(prepare_tabs(workers=workers)))
+
+
+def bench_pipelines(scale, workers):
+    print(f"# tab pipelines, scale {scale}: {SCALES[scale]}")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = write_dataset(Path(tmp) / 'data', **SCALES[scale])
+        reports = {}
+        for n in (1, workers):
+            env = dict(os.environ, DASHBOARD_DATA_DIR=str(data_dir), DASHBOARD_CACHE_DIR=str(Path(tmp) / f'cache-{n}'))
+            out = subprocess.run([sys.executable, __file__, '--run-prepare', str(n)], env=env,
+                                 check=True, capture_output=True, text=True).stdout
+            reports[n] = json.loads(out.strip().splitlines()[-1])
+            r = reports[n]
+            print(f"{n:>3} worker(s) [{r['mode']:>6}]: wall {r['wall_ms']:>9.1f} ms  tasks {r['tasks']}")
+    print(f"# measured speedup over serial: {reports[1]['wall_ms'] / reports[workers]['wall_ms']:.2f}x "
+          f"on {os.cpu_count()} core(s)")
+
+
+def bench_paygap(rows_list, workers):
+    import paygap
+
+    print(f"\n# pay-gap engine, {workers} processes vs serial")
+    print(f"{'rows':>12} {'serial s':>9} {'parallel s':>11} {'speedup':>8}")
+    for rows in rows_list:
+        genderpay = synthetic_genderpay(rows)
+        timings = {}
+        results = {}
+        for n in (1, workers):
+            # First call starts the worker processes; time the second
+            paygap.mean_pay_by_gender(genderpay, workers=n)
+            start = time.perf_counter()
+            results[n] = paygap.mean_pay_by_gender(genderpay, workers=n)
+            timings[n] = time.perf_counter() - start
+        pd.testing.assert_frame_equal(results[1], results[workers], rtol=1e-9)
+        print(f"{rows:>12,} {timings[1]:>9.3f} {timings[workers]:>11.3f} {timings[1] / timings[workers]:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', default='small', choices=list(SCALES))
+    parser.add_argument('--rows', type=int, nargs='+', default=[2_000_000, 10_000_000])
+    parser.add_argument('--workers', type=int, default=max(2, os.cpu_count() or 1))
+    parser.add_argument('--run-prepare', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_prepare:
+        run_prepare(args.run_prepare)
+        return
+    bench_pipelines(args.scale, args.workers)
+    bench_paygap(args.rows, args.workers)
+
+
+if __name__ == '__main__':
+    main()
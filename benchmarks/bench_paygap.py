@@ -0,0 +1,90 @@
+"""Vectorized pay-gap engine vs. the original per-dimension groupby loop.
+
+Both implementations run on synthetic employee tables shaped like
+"Glassdoor Gender Pay Gap.csv"; results are checked for equality before
+timings are reported.
+
+    python benchmarks/bench_paygap.py --rows 10000 1000000 10000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from paygap import DIMENSION_LABELS, GROUP_COLS, pay_gap_tables
+from synthetic import synthetic_genderpay
+
+
+def loop_pay_gap_tables(genderpay):
+    """The tab-3 code before the vectorized engine, kept as a reference."""
+    all_results = []
+    for col in GROUP_COLS:
+        group = genderpay.groupby([col, 'Gender'])['TotalPay'].mean().reset_index()
+        pivot = group.pivot(index=col, columns='Gender', values='TotalPay')
+        pivot['Male_ratio'] = pivot['Male'] / pivot[['Male', 'Female']].max(axis=1)
+        pivot['Female_ratio'] = pivot['Female'] / pivot[['Male', 'Female']].max(axis=1)
+        result = pivot[['Male_ratio', 'Female_ratio']].rename(columns={'Male_ratio': 'Male', 'Female_ratio': 'Female'}).reset_index()
+        result['Dimension'] = DIMENSION_LABELS[col]
+        result = result.rename(columns={col: 'Category'})
+        all_results.append(result)
+    final_df = pd.concat(all_results, ignore_index=True)
+    final_df = final_df[['Dimension', 'Category', 'Male', 'Female']]
+
+    def compute_summary(group):
+        num_groups = group['Category'].nunique()
+        avg_male = int(round(group['Male'].mean() * 100))
+        avg_female = int(round(group['Female'].mean() * 100))
+        avg_gap = int(round((group['Male'] - group['Female']).abs().mean() * 100))
+        female_less = (group['Female'] < group['Male']).sum()
+        percent_female_less = int(round((female_less / num_groups) * 100))
+        return pd.Series({
+            'Number of Categories': num_groups,
+            '% of Categories Where Women Earn Less': percent_female_less,
+            'Average Male Earnings (%)': avg_male,
+            'Average Female Earnings (%)': avg_female,
+            'Average Earnings Gap (%)': avg_gap
+        })
+
+    summary = final_df.groupby('Dimension').apply(compute_summary).reset_index()
+    return final_df, summary
+
+
+def check_equal(a, b):
+    final_a, summary_a = a
+    final_b, summary_b = b
+    pd.testing.assert_frame_equal(final_a.astype({'Category': str}), final_b.astype({'Category': str}), check_names=False)
+    pd.testing.assert_frame_equal(summary_a, summary_b, check_dtype=False, check_names=False)
+
+
+def best_of(func, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'loop s':>10} {'vectorized s':>13} {'speedup':>8}")
+    for rows in args.rows:
+        genderpay = synthetic_genderpay(rows)
+        loop_s, expected = best_of(loop_pay_gap_tables, genderpay, args.repeat)
+        vec_s, actual = best_of(pay_gap_tables, genderpay, args.repeat)
+        check_equal(expected, actual)
+        print(f"{rows:>12,} {loop_s:>10.3f} {vec_s:>13.3f} {loop_s / vec_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
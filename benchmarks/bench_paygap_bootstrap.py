@@ -0,0 +1,67 @@
+"""Bucketed bootstrap of the pay-gap intervals vs. a row-level resampling loop.
+
+The reference draws Poisson(1) weights per employee and recomputes the raw
+female/male ratios for each replicate (one pass over the rows per
+replicate); ``paygap_stats.bootstrap_pay_gaps`` does one pass in total and
+also fits the adjusted-gap regressions.  Reported: wall time and, for the
+raw ratios, how far the interval bounds of the two methods are apart.
+
+    python benchmarks/bench_paygap_bootstrap.py --rows 100000 1000000 --replicates 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from paygap import GROUP_COLS, dimension_codes, gender_codes, total_pay
+from paygap_stats import bootstrap_pay_gaps
+from synthetic import synthetic_genderpay
+
+
+def row_bootstrap(genderpay, replicates, seed=0):
+    """(2, categories) 95% bounds of the raw ratio, resampling employees one replicate at a time."""
+    codes, _, _, n_categories = dimension_codes(genderpay, GROUP_COLS)
+    keys = (codes * 3 + gender_codes(genderpay)[:, None]).ravel()
+    pay = np.repeat(total_pay(genderpay), codes.shape[1])
+    rng = np.random.default_rng(seed)
+    ratios = np.empty((replicates, n_categories))
+    for r in range(replicates):
+        w = np.repeat(rng.poisson(1.0, len(genderpay)), codes.shape[1])
+        sums = np.bincount(keys, weights=w * pay, minlength=3 * (n_categories + 1)).reshape(-1, 3)
+        counts = np.bincount(keys, weights=w, minlength=3 * (n_categories + 1)).reshape(-1, 3)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        ratios[r] = means[:n_categories, 0] / means[:n_categories, 1]
+    return np.nanquantile(ratios, [0.025, 0.975], axis=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--replicates', type=int, default=1000)
+    parser.add_argument('--reference-replicates', type=int, default=100,
+                        help='replicates for the (slow) row-level loop; its time is scaled up')
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'row loop s':>11} {'bucketed s':>11} {'speedup':>8} {'max bound diff':>15}")
+    for rows in args.rows:
+        genderpay = synthetic_genderpay(rows)
+        start = time.perf_counter()
+        reference = row_bootstrap(genderpay, args.reference_replicates)
+        loop_s = (time.perf_counter() - start) * args.replicates / args.reference_replicates
+        start = time.perf_counter()
+        result = bootstrap_pay_gaps(genderpay, replicates=args.replicates)
+        bucketed_s = time.perf_counter() - start
+        bounds = result[['Female_per_dollar_low', 'Female_per_dollar_high']].to_numpy().T
+        diff = np.nanmax(np.abs(bounds - reference[:, :bounds.shape[1]]))
+        print(f"{rows:>12,} {loop_s:>11.2f} {bucketed_s:>11.2f} {loop_s / bucketed_s:>7.1f}x {diff:>15.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Soak test: RSS over many reruns of the tab-3 Matplotlib chart.
+
+``legacy`` mimics the old tab code (``plt.subplots`` + ``st.pyplot``'s
+savefig, never closed); ``cached`` goes through ``render_cache`` the way the
+dashboard does now, with the data version changing every ``--versions``
+reruns to exercise rendering and eviction too.  Each mode runs in its own
+subprocess and prints RSS samples as it goes.
+
+    python benchmarks/bench_render_soak.py --reruns 2000
+"""
+
+import argparse
+import io
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from profiling import rss_mb
+
+
+def soak(mode, reruns, samples, versions):
+    import matplotlib
+    matplotlib.use('Agg')
+    import pandas as pd
+
+    import charts
+    from render_cache import cached_render, image_cache
+
+    totals = pd.Series({'Female': 4.1e7, 'Male': 5.2e7})
+    every = max(1, reruns // samples)
+    points = []
+    start = time.perf_counter()
+    for i in range(reruns):
+        if mode == 'legacy':
+            import matplotlib.pyplot as plt
+            fig, ax = plt.subplots(figsize=(6, 5))
+            ax.bar(totals.index, totals.values, color='orange')
+            plt.tight_layout()
+            fig.savefig(io.BytesIO(), format='png', bbox_inches='tight', dpi=200)
+        else:
+            cached_render('ugly_earnings', i // versions, lambda: charts.ugly_earnings_figure(totals))
+        if i % every == 0 or i == reruns - 1:
+            points.append((i + 1, round(rss_mb(), 1)))
+    result = {'mode': mode, 'seconds': round(time.perf_counter() - start, 2), 'rss': points}
+    if mode == 'cached':
+        result['image_cache'] = image_cache.stats()
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reruns', type=int, default=2000)
+    parser.add_argument('--samples', type=int, default=10)
+    parser.add_argument('--versions', type=int, default=100,
+                        help='reruns per data version in cached mode')
+    parser.add_argument('--mode', choices=['legacy', 'cached'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        soak(args.mode, args.reruns, args.samples, args.versions)
+        return
+
+    for mode in ('legacy', 'cached'):
+        out = subprocess.run([sys.executable, __file__, '--mode', mode, '--reruns', str(args.reruns),
+                              '--samples', str(args.samples), '--versions', str(args.versions)],
+                             check=True, capture_output=True, text=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        first, last = result['rss'][0][1], result['rss'][-1][1]
+        print(f"{mode:>7}: {result['seconds']:>7.2f} s  RSS {first:.1f} -> {last:.1f} MB ({last - first:+.1f} MB)")
+        print('         ' + '  '.join(f'{n}:{mb}' for n, mb in result['rss']))
+        if 'image_cache' in result:
+            print(f"         image cache {result['image_cache']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Memory and hot-path times of plain-string vs. categorical dimension columns.
+
+Writes a synthetic flight log, loads it with the plain string dtypes and
+with ``schema.read_dtypes`` + ``apply_schema`` (IATA codes shared with
+airports.csv), then times the route groupby and the airports merge the
+route index and tab 1 are built from.
+
+    python benchmarks/bench_schema.py --rows 1000000 5000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+
+from data_loader import DTYPES, FLIGHTS_CSV
+from flights import enrich_origins
+from schema import apply_schema, read_dtypes
+from synthetic import synthetic_airports, write_synthetic_flights
+
+ROUTE_KEYS = ['Destination_airport', 'Origin_airport']
+
+
+def timed(func, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def measure(flights, airports):
+    memory_mb = flights.memory_usage(deep=True).sum() / 1e6
+    group_ms, _ = timed(lambda: flights.groupby(ROUTE_KEYS, sort=False, observed=True)['Passengers'].sum())
+    merge_ms, _ = timed(lambda: enrich_origins(flights[['Origin_airport', 'Passengers']], airports))
+    return memory_mb, group_ms, merge_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    airports = synthetic_airports()
+    encoded_airports = apply_schema(airports.copy())
+    print(f"{'rows':>12} {'layout':>12} {'memory MB':>10} {'groupby ms':>11} {'merge ms':>9}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'flights.csv'
+            write_synthetic_flights(path, rows, airports=airports)
+            plain = pd.read_csv(path, dtype=DTYPES[FLIGHTS_CSV])
+            encoded = apply_schema(pd.read_csv(path, dtype=read_dtypes(DTYPES[FLIGHTS_CSV])))
+        results = {'plain': measure(plain, airports), 'categorical': measure(encoded, encoded_airports)}
+        for layout, (memory_mb, group_ms, merge_ms) in results.items():
+            print(f"{rows:>12,} {layout:>12} {memory_mb:>10.1f} {group_ms:>11.1f} {merge_ms:>9.1f}")
+        (plain_mb, plain_group, plain_merge), (cat_mb, cat_group, cat_merge) = results.values()
+        print(f"{'':>12} {'ratio':>12} {plain_mb / cat_mb:>9.1f}x {plain_group / cat_group:>10.1f}x "
+              f"{plain_merge / cat_merge:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""RSS of one dashboard process under many concurrent simulated sessions.
+
+Runs ``testone.py`` through Streamlit's ``AppTest`` harness once per
+simulated user, all in one process like a real server, and keeps every
+session alive (its session state and rendered element tree) so they add up
+as concurrent sessions would.  Each session opens a random tab with random
+filter values.  Reported at checkpoints: process RSS, the shared store's
+size, and the mean RSS added per session since the first one.
+
+This measures memory held by many open sessions, not contention: the
+sessions' script runs happen one after another, because ``AppTest``
+installs a process-global mock runtime for each run and two runs in
+flight at once replace each other's.
+
+If every session held its own copies of the data frames, RSS would grow by
+at least ``data MB`` per session; with the shared store it should grow by
+little more than each session's rendered output.
+
+    python benchmarks/bench_sessions.py --sessions 100 --scale tiny
+"""
+
+import argparse
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# The dashboard's modules read these at import time, so they are set before
+# anything imports data_loader
+WORK_DIR = Path(tempfile.mkdtemp(prefix='bench_sessions-'))
+os.environ['DASHBOARD_DATA_DIR'] = str(WORK_DIR / 'data')
+os.environ['DASHBOARD_CACHE_DIR'] = str(WORK_DIR / 'cache')
+
+from profiling import data_size_mb, rss_mb
+from shared_store import shared_store
+from synthetic import SCALES, write_dataset
+
+TAB_NAMES = ["Q1: Airports", "Q2: University Dashboard", "Q3: Best & Worst Graph"]
+
+
+def simulate(rng, default_timeout):
+    """One session: open a random tab and pick random filters."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / 'testone.py'), default_timeout=default_timeout).run()
+    tab = rng.choice(TAB_NAMES)
+    if tab != TAB_NAMES[0]:
+        at.session_state['active_tab'] = tab
+        at.run()
+    if tab == TAB_NAMES[0] and at.selectbox:
+        hub = at.selectbox[0]
+        # options are the "CODE – name" labels; the widget's value is the code
+        hub.set_value(rng.choice(hub.options[:20]).split(' – ')[0]).run()
+    elif tab == TAB_NAMES[1] and at.multiselect:
+        years = at.multiselect[0]
+        years.set_value(rng.sample(years.options, k=rng.randint(1, len(years.options)))).run()
+    elif tab == TAB_NAMES[2]:
+        dimension = [s for s in at.selectbox if 'Dimension' in s.label]
+        if dimension:
+            dimension[0].set_value(rng.choice(dimension[0].options)).run()
+    if at.exception:
+        raise RuntimeError([e.message for e in at.exception])
+    return at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--scale', default='tiny', choices=list(SCALES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300)
+    args = parser.parse_args()
+
+    try:
+        data_dir = write_dataset(WORK_DIR / 'data', **SCALES[args.scale])
+        data_mb = data_size_mb(data_dir.iterdir())
+        print(f"# scale {args.scale}: {SCALES[args.scale]}, data {data_mb:.1f} MB")
+        print(f"{'sessions':>9} {'RSS MB':>8} {'shared MB':>10} {'MB/session':>11}")
+        rng = random.Random(args.seed)
+        sessions = []
+        checkpoints = {1, 10, 25, 50, 100, args.sessions}
+        first_rss = None
+        for n in range(1, args.sessions + 1):
+            sessions.append(simulate(rng, args.timeout))
+            if n in checkpoints:
+                gc.collect()
+                rss = rss_mb()
+                first_rss = rss if first_rss is None else first_rss
+                per_session = (rss - first_rss) / (n - 1) if n > 1 else float('nan')
+                shared_mb = shared_store.stats()['bytes'] / 1e6
+                print(f"{n:>9} {rss:>8.1f} {shared_mb:>10.1f} {per_session:>11.2f}")
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
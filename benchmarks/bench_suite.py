@@ -0,0 +1,245 @@
+"""Headless benchmark of all three tabs on synthetic data at several scales.
+
+For each scale a full synthetic dataset is written (see ``synthetic.py``),
+then each tab's data pipeline and figure construction runs in its own
+subprocess against it, twice: a ``cold`` pass with empty caches and a
+``warm`` pass that reuses the process-wide caches, as a second session
+would.  Every stage reports wall time, RSS growth, the process peak RSS
+after the stage and, for charts, the serialized size sent to the browser.
+
+Results are written as JSON (sorted keys, one record per scale/tab/pass/
+stage) and CSV, so two runs can be diffed, or compared directly:
+
+    python benchmarks/bench_suite.py --scales tiny small --out base.json
+    python benchmarks/bench_suite.py --scales tiny small --out new.json --compare base.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from synthetic import SCALES, write_dataset
+
+TABS = ['airports', 'university', 'paygap']
+FIELDS = ['scale', 'tab', 'pass', 'stage', 'ms', 'rss_delta_mb', 'peak_rss_mb', 'payload_bytes']
+
+
+def peak_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def airports_pipeline(stage, hub='ORD'):
+    import charts
+    from data_loader import load_airports
+    from flights import state_distance_stats, state_flight_counts
+    from route_graph import route_graph
+    from route_index import route_index
+
+    with stage('load airports'):
+        airports = load_airports()
+    with stage('route index'):
+        routes = route_index(airports)
+    if hub not in routes.offsets:
+        hub = routes.destinations()[0]
+    info = routes.hub_info(hub)
+    with stage('hub routes'):
+        hub_routes = routes.hub_routes(hub)
+    with stage('route graph'):
+        route_graph(routes)
+    with stage('state flight counts'):
+        state_counts = state_flight_counts(hub_routes)
+    with stage('flights per capita'):
+        combined = charts.flights_per_capita(hub_routes, state_counts)
+    with stage('distance stats'):
+        distances = state_distance_stats(hub_routes)
+    return {
+        'route_map': lambda: charts.route_map(hub_routes, hub, info['AIRPORT'], info['LONGITUDE'], info['LATITUDE']),
+        'route_map_great_circle': lambda: charts.route_map(
+            hub_routes, hub, info['AIRPORT'], info['LONGITUDE'], info['LATITUDE'], great_circle=True),
+        'state_flights_bar': lambda: charts.state_flights_bar(state_counts, hub, info['AIRPORT']),
+        'city_population_bar': lambda: charts.city_population_bar(hub_routes),
+        'per_capita_bar': lambda: charts.per_capita_bar(combined, hub),
+        'per_capita_choropleth': lambda: charts.per_capita_choropleth(combined, hub),
+        'distance_histogram': lambda: charts.distance_histogram(hub_routes, hub),
+        'state_distance_bar': lambda: charts.state_distance_bar(distances, hub),
+    }
+
+
+def university_pipeline(stage):
+    import charts
+    from term_kpis import load_term_kpis
+
+    with stage('load term KPIs'):
+        kpis = load_term_kpis()
+    with stage('term series'):
+        students = kpis.terms()
+        changes = kpis.yearly_changes()
+        rolling = kpis.rolling()
+        comparison = kpis.term_comparison('Enrolled')
+        correlations = kpis.lag_correlation()
+    return {
+        'admissions_area': lambda: charts.admissions_area(students),
+        'departments_area': lambda: charts.departments_area(students),
+        'growth_satisfaction': lambda: charts.growth_satisfaction_chart(changes),
+        'rates_chart': lambda: charts.rates_chart(students, rolling),
+        'term_comparison': lambda: charts.term_comparison_chart(comparison, 'Enrolled'),
+        'lag_correlation': lambda: charts.lag_correlation_chart(correlations),
+    }
+
+
+def paygap_pipeline(stage):
+    import charts
+    from data_loader import GENDERPAY_CSV, data_version
+    from paygap import load_genderpay_totals, pay_gap_tables
+    from paygap_stats import pay_gap_analysis
+    from render_cache import render_figure
+    from startup import default_dimension
+
+    with stage('load genderpay'):
+        genderpay = load_genderpay_totals()
+    # Same data version as the tab, so the warm pass is served from the shared store as it is there
+    version = data_version(GENDERPAY_CSV)
+    with stage('earnings totals'):
+        totals = genderpay.groupby('Gender', observed=True)['TotalPay'].sum()
+    with stage('render ugly_earnings') as record:
+        record['payload_bytes'] = len(render_figure(charts.ugly_earnings_figure(totals)))
+    with stage('pay gap tables'):
+        final_df, _ = pay_gap_tables(genderpay, version=version)
+    with stage('pay gap table payload') as record:
+        record['payload_bytes'] = int(final_df.memory_usage(deep=True).sum())
+    with stage('pay gap analysis'):
+        analysis = pay_gap_analysis(genderpay, version=version)
+    dimension = default_dimension(final_df)
+    stats = analysis[analysis['Dimension'] == dimension]
+    return {'pay_gap_intervals': lambda: charts.pay_gap_intervals(stats, dimension)}
+
+
+PIPELINES = {'airports': airports_pipeline, 'university': university_pipeline, 'paygap': paygap_pipeline}
+
+
+def run_tab(tab):
+    """Child process: run one tab cold then warm, printing records as JSON."""
+    import plotly.io as pio
+
+    from profiling import RerunProfile
+
+    records = []
+    for pass_name in ('cold', 'warm'):
+        profile = RerunProfile(kind=pass_name)
+
+        @contextmanager
+        def stage(name, payload_bytes=None):
+            with profile.span(name, payload_bytes) as record:
+                yield record
+            record['peak_rss_mb'] = peak_rss_mb()
+
+        figures = PIPELINES[tab](stage)
+        for chart_id, build in figures.items():
+            with stage(f'build {chart_id}'):
+                fig = build()
+            with stage(f'serialize {chart_id}') as record:
+                record['payload_bytes'] = len(pio.to_json(fig, validate=False))
+        records += [{'tab': tab, 'pass': pass_name, **{k: span[k] for k in FIELDS[3:]}}
+                    for span in profile.spans]
+    print(json.dumps(records))
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scale(scale, sizes, tabs, seed):
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = write_dataset(Path(tmp) / 'data', seed=seed, **sizes)
+        for tab in tabs:
+            env = dict(os.environ, DASHBOARD_DATA_DIR=str(data_dir),
+                       DASHBOARD_CACHE_DIR=str(Path(tmp) / f'cache-{tab}'))
+            out = subprocess.run([sys.executable, __file__, '--run-tab', tab], env=env,
+                                 check=True, capture_output=True, text=True).stdout
+            for record in json.loads(out.strip().splitlines()[-1]):
+                records.append({'scale': scale, **record})
+    return records
+
+
+def write_results(records, meta, out):
+    out = Path(out)
+    with open(out, 'w') as fh:
+        json.dump({'meta': meta, 'results': records}, fh, indent=1, sort_keys=True)
+        fh.write('\n')
+    with open(out.with_suffix('.csv'), 'w', newline='') as fh:
+        writer = csv.DictWriter(fh, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def compare(records, base_path):
+    """Print per-stage time and payload changes against an earlier results file."""
+    with open(base_path) as fh:
+        base = {(r['scale'], r['tab'], r['pass'], r['stage']): r for r in json.load(fh)['results']}
+    print(f"\n{'scale':<7} {'tab':<11} {'pass':<5} {'stage':<34} {'base ms':>9} {'ms':>9} {'ratio':>7} {'payload':>9}")
+    for r in records:
+        old = base.get((r['scale'], r['tab'], r['pass'], r['stage']))
+        if old is None:
+            continue
+        ratio = r['ms'] / old['ms'] if old['ms'] else float('nan')
+        payload = ''
+        if r['payload_bytes'] is not None and old['payload_bytes'] is not None:
+            payload = f"{r['payload_bytes'] - old['payload_bytes']:+d}"
+        print(f"{r['scale']:<7} {r['tab']:<11} {r['pass']:<5} {r['stage']:<34} "
+              f"{old['ms']:>9.1f} {r['ms']:>9.1f} {ratio:>6.2f}x {payload:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', nargs='+', default=['tiny', 'small'], choices=list(SCALES))
+    parser.add_argument('--tabs', nargs='+', default=TABS, choices=TABS)
+    parser.add_argument('--flights', type=int, help='override the flight rows of every scale')
+    parser.add_argument('--institutions', type=int, help='override the institutions of every scale')
+    parser.add_argument('--employees', type=int, help='override the employees of every scale')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='bench_suite.json')
+    parser.add_argument('--compare', metavar='BASE_JSON')
+    parser.add_argument('--run-tab', choices=TABS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_tab:
+        run_tab(args.run_tab)
+        return
+
+    overrides = {k: getattr(args, k) for k in ('flights', 'institutions', 'employees') if getattr(args, k)}
+    scales = {name: {**SCALES[name], **overrides} for name in args.scales}
+    meta = {'commit': git_commit(), 'python': platform.python_version(), 'seed': args.seed, 'scales': scales}
+
+    records = []
+    for name, sizes in scales.items():
+        print(f"# {name}: {sizes}", file=sys.stderr)
+        records += run_scale(name, sizes, args.tabs, args.seed)
+    write_results(records, meta, args.out)
+
+    print(f"{'scale':<7} {'tab':<11} {'pass':<5} {'stage':<34} {'ms':>9} {'rss +MB':>8} {'peak MB':>8} {'payload':>10}")
+    for r in records:
+        payload = '' if r['payload_bytes'] is None else f"{r['payload_bytes']:,}"
+        print(f"{r['scale']:<7} {r['tab']:<11} {r['pass']:<5} {r['stage']:<34} "
+              f"{r['ms']:>9.1f} {r['rss_delta_mb']:>8.1f} {r['peak_rss_mb']:>8.1f} {payload:>10}")
+    if args.compare:
+        compare(records, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Term KPI engine vs. recomputing the tab-2 trends inline per query.
+
+The inline reference is what tab 2 used to do on every filter change: slice
+the cube's fact table and fold it per term, then ``groupby('Year')`` sums with
+``pct_change``/``diff`` and a ``rolling`` mean over the rows.  The engine
+builds every institution's series once, after which a query is a slice of
+precomputed arrays.  Reported: the one-off build time and the mean time per
+query (random institution, random year selection) for both.
+
+    python benchmarks/bench_term_kpis.py --institutions 100 1000 5000 --queries 200
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from synthetic import synthetic_students
+from term_kpis import RATES, TermKPIs
+from university_cube import UniversityCube, build_cube, term_totals
+
+
+def term_frame(facts, institution, years):
+    """The slice tab 2 used to rebuild per filter change: wide per-term rows plus Term_Label."""
+    mask = facts['Year'].isin(years)
+    if institution is not None:
+        mask &= facts['Institution'] == institution
+    frame = term_totals(facts[mask]).reset_index()
+    frame['Term'] = frame['Term'].astype(str)
+    frame['Term_Label'] = frame['Year'].astype(str) + ' ' + frame['Term']
+    return frame
+
+
+def inline_query(facts, institution, years, columns):
+    students = term_frame(facts, institution, years)
+    yearly = students.groupby('Year')[columns].sum()
+    growth = yearly.pct_change() * 100
+    growth['Student Satisfaction (%)'] = yearly['Student Satisfaction (%)'].diff()
+    rolling = students[RATES].rolling(2).mean()
+    return students, growth, rolling
+
+
+def engine_query(kpis, institution, years):
+    return kpis.terms(institution, years), kpis.yearly_changes(institution, years), kpis.rolling(institution, years)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--institutions', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'institutions':>12} {'build ms':>9} {'inline ms/q':>12} {'engine ms/q':>12} {'speedup':>8}")
+    for n in args.institutions:
+        facts = build_cube(synthetic_students(n))
+        start = time.perf_counter()
+        kpis = TermKPIs(UniversityCube(facts))
+        build_ms = (time.perf_counter() - start) * 1000
+
+        rng = random.Random(args.seed)
+        names = [None] + kpis.institutions
+        queries = []
+        for _ in range(args.queries):
+            institution = rng.choice(names)
+            years = kpis.years(institution)
+            queries.append((institution, rng.sample(years, k=rng.randint(1, len(years)))))
+
+        columns = [m for m in kpis.measures if m not in RATES] + ['Student Satisfaction (%)']
+        start = time.perf_counter()
+        for institution, years in queries:
+            inline_query(facts, institution, years, columns)
+        inline_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        start = time.perf_counter()
+        for institution, years in queries:
+            engine_query(kpis, institution, years)
+        engine_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        print(f"{n:>12,} {build_ms:>9.1f} {inline_ms:>12.2f} {engine_ms:>12.2f} {inline_ms / engine_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
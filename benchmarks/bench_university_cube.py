@@ -0,0 +1,46 @@
+"""Build and query times of the university cube at many institutions.
+
+Replicates university_student_dashboard_data.csv across synthetic
+institutions (with noise), builds the cube once and then times
+``term_totals`` over a one-institution slice and over all institutions,
+the aggregation the tab-2 term series are built from.
+
+    python benchmarks/bench_university_cube.py --institutions 100 1000 5000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from synthetic import synthetic_students
+from university_cube import build_cube, term_totals
+
+
+def timed(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--institutions', type=int, nargs='+', default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    print(f"{'institutions':>12} {'raw rows':>9} {'build ms':>9} {'one inst ms':>12} {'all inst ms':>12}")
+    for n in args.institutions:
+        students = synthetic_students(n)
+        build_ms, facts = timed(lambda: build_cube(students), repeat=1)
+        one = (facts['Institution'] == 'Institution 00000') & facts['Year'].isin([2016, 2017, 2018])
+        one_ms, _ = timed(lambda: term_totals(facts[one]))
+        all_ms, _ = timed(lambda: term_totals(facts))
+        print(f"{n:>12,} {len(students):>9,} {build_ms:>9.1f} {one_ms:>12.2f} {all_ms:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Seeded synthetic versions of the dashboard's CSV files.
+
+Every generator is deterministic for a given seed and produces the same
+columns as the bundled file it imitates, so the dashboard's loaders and
+pipelines run on the output unchanged.  ``write_dataset`` writes a full set
+of the four files under their real names into a directory that can be used
+as ``DASHBOARD_DATA_DIR``.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+import pandas as pd
+
+from data_loader import AIRPORTS_CSV, FLIGHTS_CSV, GENDERPAY_CSV, STUDENTS_CSV
+from paygap import GROUP_COLS
+from university_cube import department_columns
+
+# Rows, extra airports, institutions and employees per named scale
+SCALES = {
+    'tiny': {'flights': 10_000, 'airports': 0, 'institutions': 1, 'employees': 1_000},
+    'small': {'flights': 200_000, 'airports': 100, 'institutions': 10, 'employees': 100_000},
+    'medium': {'flights': 2_000_000, 'airports': 1_000, 'institutions': 100, 'employees': 1_000_000},
+    'large': {'flights': 10_000_000, 'airports': 5_000, 'institutions': 1_000, 'employees': 10_000_000},
+}
+
+
+def synthetic_airports(extra=0, seed=0):
+    """airports.csv plus ``extra`` made-up US airports (codes ``X0000``...)."""
+    airports = pd.read_csv(ROOT / AIRPORTS_CSV)
+    if not extra:
+        return airports
+    rng = np.random.default_rng(seed)
+    template = airports.sample(extra, replace=True, random_state=seed).reset_index(drop=True)
+    template['IATA'] = [f'X{i:04d}' for i in range(extra)]
+    template['AIRPORT'] = template['IATA'] + ' Regional'
+    template['LATITUDE'] = rng.uniform(25, 49, extra)
+    template['LONGITUDE'] = rng.uniform(-124, -67, extra)
+    return pd.concat([airports, template], ignore_index=True)
+
+
+def write_synthetic_flights(path, rows, destination='ORD', seed=0, airports=None):
+    """Write a random flight log with ``rows`` rows in 1M-row pieces."""
+    if airports is None:
+        airports = pd.read_csv(ROOT / AIRPORTS_CSV)
+    codes = airports['IATA'].to_numpy()
+    rng = np.random.default_rng(seed)
+    population = dict(zip(codes, rng.integers(50_000, 9_000_000, len(codes))))
+    # Make the benchmark hub a little more popular than the rest
+    dest_pool = np.concatenate([codes, [destination] * max(1, len(codes) // 10)])
+    dates = pd.date_range('1990-01-01', '2009-12-01', freq='MS').strftime('%Y-%m-%d').to_numpy()
+    step = 1_000_000
+    for start in range(0, rows, step):
+        n = min(step, rows - start)
+        origin = rng.choice(codes, n)
+        pd.DataFrame({
+            'Origin_airport': origin,
+            'Destination_airport': rng.choice(dest_pool, n),
+            'Passengers': rng.integers(0, 300, n),
+            'Seats': rng.integers(50, 400, n),
+            'Flights': rng.integers(1, 30, n),
+            'Fly_date': rng.choice(dates, n),
+            'Origin_population': pd.Series(origin).map(population),
+        }).to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+
+
+def synthetic_students(institutions, seed=0):
+    """The admissions table replicated across institutions, counts rescaled per institution.
+
+    A single institution returns the bundled file unchanged (no Institution column).
+    """
+    source = pd.read_csv(ROOT / STUDENTS_CSV)
+    if institutions <= 1:
+        return source
+    rng = np.random.default_rng(seed)
+    frame = pd.concat([source] * institutions, ignore_index=True)
+    frame.insert(0, 'Institution', np.repeat([f'Institution {i:05d}' for i in range(institutions)], len(source)))
+    scale = rng.uniform(0.2, 5.0, institutions).repeat(len(source))
+    for col in ['Applications', 'Admitted', 'Enrolled'] + department_columns(source):
+        frame[col] = (frame[col] * scale).round().astype('int64')
+    return frame
+
+
+def synthetic_genderpay(rows, seed=0, with_total=True):
+    """Random employees drawn from the bundled file's categories."""
+    source = pd.read_csv(ROOT / GENDERPAY_CSV)
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({col: rng.choice(source[col].unique(), rows) for col in GROUP_COLS + ['Gender']})
+    pay = rng.normal(95_000, 25_000, rows) + np.where(frame['Gender'] == 'Male', 8_000, 0)
+    if with_total:
+        frame['TotalPay'] = pay
+    else:
+        bonus = rng.integers(1_000, 12_000, rows)
+        frame['BasePay'] = (pay - bonus).round().astype('int64')
+        frame['Bonus'] = bonus
+    return frame
+
+
+def write_dataset(directory, flights, airports=0, institutions=1, employees=1_000, seed=0):
+    """Write all four dashboard CSVs, under their real names, into ``directory``."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    airport_table = synthetic_airports(airports, seed)
+    airport_table.to_csv(directory / AIRPORTS_CSV, index=False)
+    write_synthetic_flights(directory / FLIGHTS_CSV, flights, seed=seed, airports=airport_table)
+    synthetic_students(institutions, seed).to_csv(directory / STUDENTS_CSV, index=False)
+    genderpay = synthetic_genderpay(employees, seed, with_total=False)
+    genderpay[['JobTitle', 'Gender', 'Age', 'PerfEval', 'Education', 'Dept', 'Seniority', 'BasePay', 'Bonus']].to_csv(
+        directory / GENDERPAY_CSV, index=False)
+    return directory
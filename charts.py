@@ -0,0 +1,441 @@
+"""Figure builders for the dashboard tabs.
+
+Each function takes already-prepared frames and returns a figure, without
+touching Streamlit, so the dashboard can memoize them (see
+``figure_cache`` and ``render_cache``) and they can be rebuilt headlessly.
+``plotly.express`` and Matplotlib are imported by the first builder that
+needs them, not with this module (see ``startup``).
+"""
+
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+import lod
+from route_map import route_path_traces
+from startup import timeline
+
+
+def express():
+    """``plotly.express``, imported when the first chart that uses it is built."""
+    return timeline.import_module('plotly.express')
+
+
+# --- Tab 1: flight routes -------------------------------------------------
+
+def state_color_map(hub_routes):
+    """Semi-transparent colour per origin state, in order of appearance."""
+    unique_states = hub_routes['Origin_state'].unique()
+    color_pool = qualitative.Alphabet + qualitative.Set3 + qualitative.Dark24
+    return {state: color.replace('rgb', 'rgba').replace(')', ',0.5)') for state, color in zip(unique_states, color_pool)}
+
+
+def route_map(hub_routes, hub, hub_name, hub_lon, hub_lat, great_circle=False, budget=None):
+    # One NaN-separated trace per origin state instead of one trace per route
+    color_map = state_color_map(hub_routes)
+    # Over budget: fewer points per curve, then only the busiest routes (3 points each at least)
+    shown = lod.top_rows(hub_routes, 'Flight_Count', None if budget is None else budget // 3)
+    n_points = lod.path_points(len(shown), budget, max_points=16)
+    flight_paths = route_path_traces(shown, hub_lon, hub_lat, color_map, great_circle=great_circle,
+                                     n_points=n_points)
+
+    title = f"Unique Flight Routes into {hub_name} ({hub}) by Origin State"
+    if len(shown) < len(hub_routes):
+        title += f" (busiest {len(shown):,} of {len(hub_routes):,})"
+    fig = go.Figure(data=flight_paths)
+    fig.update_layout(
+        title=title,
+        geo=dict(scope='usa', projection_type='albers usa', showland=True, landcolor='rgb(243, 243, 243)',
+                 subunitwidth=1, countrywidth=1, subunitcolor='rgb(217, 217, 217)', countrycolor='rgb(217, 217, 217)'),
+        margin=dict(l=0, r=0, t=40, b=0)
+    )
+    return fig
+
+
+def state_flights_bar(state_counts, hub, hub_name, budget=None):
+    state_counts = lod.top_n(state_counts, 'Origin_state', 'Flight_Count', budget)
+    fig2 = go.Figure(go.Bar(
+        x=state_counts['Origin_state'], y=state_counts['Flight_Count'],
+        text=state_counts['Flight_Count'], textposition='outside', marker_color='green'))
+    fig2.update_layout(
+        title=f"Flights into {hub_name} ({hub}) by Origin State",
+        xaxis_title="Origin State", yaxis_title="Number of Flights",
+        xaxis_tickangle=-45, bargap=0.2, margin=dict(l=20, r=20, t=60, b=40))
+    return fig2
+
+
+def city_population_bar(hub_routes, budget=None):
+    px = express()
+    # Stacked bar: population by city/state
+    data = hub_routes[['Origin_state', 'Origin_city', 'Origin_airport_name', 'Origin_population']].dropna()
+    state_totals = data.groupby('Origin_state')['Origin_population'].sum().sort_values(ascending=False)
+    # Over budget: each state's smallest cities become one "Other" segment
+    data, _ = lod.top_segments(data, 'Origin_state', 'Origin_population', budget, label='Origin_city')
+    names = data['Origin_airport_name'].fillna(lod.OTHER + ": " + data['Folded'].astype(str) + " airports")
+    data['hover_text'] = names + "<br>Population: " + data['Origin_population'].astype(int).astype(str)
+    fig3 = px.bar(
+        data, x='Origin_state', y='Origin_population', color='Origin_city', text='hover_text',
+        category_orders={'Origin_state': state_totals.index.tolist()},
+        labels={'Origin_population': 'Population', 'Origin_state': 'State'},
+        title='Stacked Bar: Origin City Populations by State')
+    fig3.update_traces(hoverinfo='text', texttemplate=None)
+    fig3.update_layout(barmode='stack', xaxis_tickangle=-45, yaxis_title='Total Population (Sum)',
+                       showlegend=False, margin=dict(l=0, r=0, t=40, b=0))
+    return fig3
+
+
+def flights_per_capita(hub_routes, state_counts):
+    """Population-normalized flight count per origin state."""
+    pop_by_state = hub_routes.groupby('Origin_state')['Origin_population'].sum().reset_index()
+    combined = pd.merge(pop_by_state, state_counts, on='Origin_state')
+    combined['Flights_per_100k'] = (combined['Flight_Count'] / combined['Origin_population']) * 100000
+    combined['hover_text'] = "State: " + combined['Origin_state'] + "<br>Flights: " + combined['Flight_Count'].astype(str) + "<br>Population: " + combined['Origin_population'].astype(int).astype(str)
+    return combined.sort_values(by='Flights_per_100k', ascending=False)
+
+
+def per_capita_bar(combined, hub):
+    px = express()
+    fig4 = px.bar(
+        combined, x='Flights_per_100k', y='Origin_state', orientation='h',
+        text=combined['Flights_per_100k'].round(1),
+        labels={'Flights_per_100k': 'Flights per 100,000 Residents', 'Origin_state': 'State'},
+        title=f'Flights into {hub} per 100,000 Residents by State')
+    fig4.update_traces(hoverinfo='text', hovertext=combined['hover_text'], marker_color='darkgreen', textposition='outside')
+    fig4.update_layout(xaxis_title='Flights per 100,000 Residents', yaxis_title='Origin State',
+                       showlegend=False, margin=dict(l=40, r=40, t=60, b=40))
+    return fig4
+
+
+def per_capita_choropleth(combined, hub):
+    px = express()
+    fig5 = px.choropleth(
+        combined,
+        locations='Origin_state', locationmode='USA-states', color='Flights_per_100k',
+        color_continuous_scale='Greens', scope='usa',
+        hover_data={'Flights_per_100k': ':.1f', 'Flight_Count': True, 'Origin_population': True, 'Origin_state': False},
+        labels={'Flights_per_100k': 'Flights per 100,000'},
+        title=f'Flights into {hub} per 100,000 Residents by State')
+    fig5.update_layout(margin=dict(l=0, r=0, t=50, b=0))
+    return fig5
+
+
+
+def distance_histogram(hub_routes, hub, budget=None):
+    """Flights into the hub by route length (each route weighted by its flights)."""
+    px = express()
+    known = hub_routes.dropna(subset=['Distance_miles'])
+    labels = {'Distance_miles': 'Route length (miles)', 'Flight_Count': 'Flights'}
+    bins = lod.binned(known['Distance_miles'], known['Flight_Count'], 30, budget)
+    if bins is None:
+        fig = px.histogram(known, x='Distance_miles', y='Flight_Count', histfunc='sum', nbins=30,
+                           labels=labels, title=f'Flights into {hub} by Route Length')
+    else:
+        # Over budget: only the bins are sent, not one value per route
+        centers, widths, totals = bins
+        fig = px.bar(x=centers, y=totals, labels={'x': labels['Distance_miles'], 'y': labels['Flight_Count']},
+                     title=f'Flights into {hub} by Route Length')
+        fig.update_traces(width=widths)
+    fig.update_traces(marker_color='steelblue')
+    fig.update_layout(yaxis_title='Number of Flights', bargap=0.05, margin=dict(l=40, r=40, t=60, b=40))
+    return fig
+
+
+def state_distance_bar(distance_stats, hub):
+    px = express()
+    hover = {'Flight_Count': True, 'Avg_miles': ':.0f'}
+    if 'Seat_miles' in distance_stats:
+        hover['Seat_miles'] = ':,.0f'
+    fig = px.bar(
+        distance_stats, x='Origin_state', y='Avg_miles', hover_data=hover,
+        labels={'Avg_miles': 'Average route length (miles)', 'Origin_state': 'State',
+                'Flight_Count': 'Flights', 'Seat_miles': 'Seat-miles'},
+        title=f'Average Flight Distance into {hub} by Origin State')
+    fig.update_traces(marker_color='slategray')
+    fig.update_layout(xaxis_tickangle=-45, margin=dict(l=40, r=40, t=60, b=40))
+    return fig
+
+# --- Tab 2: university dashboard ------------------------------------------
+
+MAJORS = ['Engineering Enrolled', 'Business Enrolled', 'Arts Enrolled', 'Science Enrolled']
+MAJOR_COLORS = {
+    'Engineering Enrolled': '#1f77b4',
+    'Business Enrolled': '#ff7f0e',
+    'Arts Enrolled': '#2ca02c',
+    'Science Enrolled': '#d62728'
+}
+RATE_COLORS = {'Retention Rate (%)': 'darkgreen', 'Student Satisfaction (%)': 'royalblue'}
+
+
+def term_axis(fig, filtered_students):
+    """Order a Term_Label axis by period, not by label text."""
+    fig.update_xaxes(categoryorder='array', categoryarray=filtered_students['Term_Label'].tolist())
+    return fig
+
+
+def admissions_area(filtered_students):
+    px = express()
+    category_order = ['Enrolled', 'Admitted', 'Applications']
+    melted = filtered_students.melt(
+        id_vars='Term_Label',
+        value_vars=category_order,
+        var_name='Category',
+        value_name='Count'
+    )
+    melted['Category'] = pd.Categorical(melted['Category'], categories=category_order, ordered=True)
+
+    fig_admissions = px.area(
+        melted,
+        x='Term_Label',
+        y='Count',
+        color='Category',
+        category_orders={'Category': category_order},
+        title='Applications, Admitted, and Enrolled by Term',
+        labels={'Term_Label': 'Term', 'Count': 'Number of Students'},
+    )
+
+    fig_admissions.update_layout(
+        xaxis_tickangle=-45,
+        margin=dict(l=40, r=40, t=50, b=40)
+    )
+    return term_axis(fig_admissions, filtered_students)
+
+
+def departments_area(filtered_students):
+    total_enrolled = filtered_students[MAJORS].sum(axis=1)
+
+    fig_departments = go.Figure()
+    for major in MAJORS:
+        percent = (filtered_students[major] / total_enrolled * 100).round(1)
+        hover_text = (
+            "<b>Term:</b> " + filtered_students['Term_Label'] + "<br>" +
+            f"<b>{major}:</b> " + filtered_students[major].map('{:,}'.format) +
+            " (" + percent.map('{:.1f}'.format) + "% of total)"
+        )
+
+        fig_departments.add_trace(go.Scatter(
+            x=filtered_students['Term_Label'],
+            y=filtered_students[major],
+            mode='lines',
+            name=major,
+            stackgroup='one',
+            line=dict(width=0.5),
+            marker=dict(color=MAJOR_COLORS[major]),
+            hoverinfo='text',
+            hovertext=hover_text,
+            opacity=0.9
+        ))
+
+    fig_departments.update_layout(
+        title='Enrolled Students by Major Over Time (% in Hover)',
+        xaxis=dict(title='Term', tickangle=-45),
+        yaxis=dict(title='Number of Enrolled Students'),
+        showlegend=True,
+        margin=dict(l=40, r=40, t=60, b=40),
+        legend_title_text='Major'
+    )
+    return term_axis(fig_departments, filtered_students)
+
+
+def growth_satisfaction_chart(changes):
+    """Bars of each major's enrollment growth, with the satisfaction change on a second axis.
+
+    ``changes`` has one row per year (``TermKPIs.yearly_changes``): percent
+    growth of each count and percentage-point change of each rate.
+    """
+    growth = changes.rename(columns={'Student Satisfaction (%)': 'Satisfaction Change'})
+
+    fig_growth_satisfaction = go.Figure()
+    for subject in MAJORS:
+        fig_growth_satisfaction.add_trace(go.Bar(
+            x=growth['Year'],
+            y=growth[subject],
+            name=subject.replace(' Enrolled', ''),
+            marker_color=MAJOR_COLORS[subject],
+            hovertemplate=f"%{{y:.1f}}% change<br><b>{subject.replace(' Enrolled', '')}</b><br>Year: %{{x}}<extra></extra>"
+        ))
+
+    fig_growth_satisfaction.add_trace(go.Scatter(
+        x=growth['Year'],
+        y=growth['Satisfaction Change'],
+        mode='lines+markers',
+        name='Change in Satisfaction Rate (%)',
+        line=dict(color='black', width=3, dash='dot'),
+        marker=dict(size=7),
+        yaxis='y2',
+        hovertemplate="Change: %{y:.1f} pts<br>Year: %{x}<extra></extra>"
+    ))
+
+    for year in growth['Year'][1:]:
+        fig_growth_satisfaction.add_vline(
+            x=year - 0.5,
+            line=dict(color='lightgray', width=1, dash='dash'),
+            layer='below'
+        )
+
+    fig_growth_satisfaction.update_layout(
+        title='Year-over-Year Enrollment Growth by Subject Area<br>with Change in Student Satisfaction Rate',
+        xaxis_title='Year',
+        yaxis=dict(title='Enrollment Growth (%)'),
+        yaxis2=dict(
+            title='Change in Satisfaction Rate (%)',
+            overlaying='y',
+            side='right',
+            showgrid=False
+        ),
+        barmode='group',
+        legend=dict(
+            title='Metric',
+            x=1.05,
+            y=1,
+            xanchor='left',
+            yanchor='top'
+        ),
+        margin=dict(l=80, r=200, t=100, b=80),
+        hovermode='x unified',
+        plot_bgcolor='white'
+    )
+    return fig_growth_satisfaction
+
+
+def rates_chart(filtered_students, rolling=None, window=2):
+    """Retention and satisfaction per term, plus their trailing ``window``-term averages if ``rolling`` is given."""
+    fig_rates = go.Figure()
+
+    # One line per rate
+    for rate, color in RATE_COLORS.items():
+        fig_rates.add_trace(go.Scatter(
+            x=filtered_students['Term_Label'],
+            y=filtered_students[rate],
+            mode='lines+markers',
+            name=rate,
+            line=dict(color=color, width=3),
+            marker=dict(size=6)
+        ))
+
+    # Trailing averages (TermKPIs.rolling), dashed in the same colours
+    if rolling is not None:
+        for rate, color in RATE_COLORS.items():
+            fig_rates.add_trace(go.Scatter(
+                x=rolling['Term_Label'],
+                y=rolling[rate],
+                mode='lines',
+                name=f'{rate.removesuffix(" (%)")}, {window}-term average',
+                line=dict(color=color, width=1.5, dash='dash'),
+                connectgaps=False
+            ))
+
+    # Layout
+    fig_rates.update_layout(
+        title='Student Satisfaction and Retention Rates Over Time',
+        xaxis=dict(title='Term', tickangle=-45),
+        yaxis=dict(title='Percent (%)', tickformat=".0f"),
+        showlegend=True,
+        legend_title_text='Metric',
+        margin=dict(l=40, r=40, t=60, b=60)
+    )
+    return term_axis(fig_rates, filtered_students)
+
+
+def term_comparison_chart(comparison, measure, first='Spring', second='Fall'):
+    """Two terms of ``measure`` side by side per year, with their difference on a second axis."""
+    fig = go.Figure()
+    for term, color in ((first, '#2ca02c'), (second, '#ff7f0e')):
+        fig.add_trace(go.Bar(x=comparison['Year'], y=comparison[term], name=term, marker_color=color,
+                             hovertemplate=f"{term} %{{x}}: %{{y:,.1f}}<extra></extra>"))
+    fig.add_trace(go.Scatter(
+        x=comparison['Year'], y=comparison['Difference'], mode='lines+markers', yaxis='y2',
+        name=f'{second} − {first}', line=dict(color='black', width=2, dash='dot'),
+        hovertemplate=f"{second} − {first}: %{{y:,.1f}}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=f'{measure}: {first} vs. {second} by Year',
+        xaxis=dict(title='Year', dtick=1),
+        yaxis=dict(title=measure),
+        yaxis2=dict(title=f'{second} − {first}', overlaying='y', side='right', showgrid=False, zeroline=True),
+        barmode='group',
+        hovermode='x unified',
+        legend=dict(orientation='h', y=-0.2),
+        margin=dict(l=40, r=60, t=60, b=40)
+    )
+    return fig
+
+
+def lag_correlation_chart(correlations, x='Retention Rate (%)', y='Student Satisfaction (%)'):
+    """Correlation of ``x`` with ``y`` some terms later, one bar per lag (positive: ``x`` leads)."""
+    colors = ['royalblue' if lag > 0 else 'darkgreen' if lag < 0 else 'gray' for lag in correlations['Lag']]
+    fig = go.Figure(go.Bar(
+        x=correlations['Lag'], y=correlations['Correlation'], marker_color=colors,
+        customdata=correlations['Pairs'],
+        hovertemplate="Lag %{x} terms: r = %{y:.2f}<br>%{customdata} term pairs<extra></extra>"
+    ))
+    x_name, y_name = x.removesuffix(' (%)'), y.removesuffix(' (%)')
+    fig.update_layout(
+        title=f'Correlation of {x_name} with {y_name} Terms Later',
+        xaxis=dict(title=f'Lag in terms (> 0: {x_name} leads, < 0: {y_name} leads)', dtick=1),
+        yaxis=dict(title='Pearson correlation', range=[-1, 1]),
+        margin=dict(l=40, r=40, t=60, b=60)
+    )
+    return fig
+
+
+# --- Tab 3: gender pay gap ------------------------------------------------
+
+def ugly_earnings_figure(totals):
+    """The deliberately bad total-earnings bar chart, as a Matplotlib Figure.
+
+    Built without pyplot so the figure is not tracked by pyplot's global
+    figure manager and can be garbage collected once rendered.
+    """
+    Figure = timeline.import_module('matplotlib.figure').Figure
+
+    fig = Figure(figsize=(6, 5))
+    ax = fig.subplots()
+    bars = ax.bar(totals.index, totals.values, color='orange')
+
+    # Add labels
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(
+            bar.get_x() + bar.get_width() / 2,
+            height + height * 0.02,
+            f'${int(height):,}',
+            ha='center',
+            color='orange',
+            fontsize=12,
+            weight='bold'
+        )
+
+    # Styling
+    ax.set_title('Total Earnings by Gender', color='orange', fontsize=14, weight='bold')
+    ax.set_ylabel('Total Earnings ($)', color='orange', fontsize=12)
+    ax.spines['bottom'].set_color('orange')
+    ax.spines['left'].set_color('orange')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    fig.tight_layout()
+    return fig
+
+
+def pay_gap_intervals(dimension_stats, dimension):
+    """Raw and adjusted gap per category (% of men's pay) with bootstrap intervals."""
+    raw = (1 - dimension_stats['Female_per_dollar']) * 100
+    raw_low = (1 - dimension_stats['Female_per_dollar_high']) * 100
+    raw_high = (1 - dimension_stats['Female_per_dollar_low']) * 100
+    adjusted = dimension_stats['Adjusted_gap_pct']
+    categories = dimension_stats['Category'].astype(str)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=raw, y=categories, mode='markers', name='Raw gap', marker=dict(color='orange', size=9),
+        error_x=dict(type='data', symmetric=False, array=raw_high - raw, arrayminus=raw - raw_low)))
+    fig.add_trace(go.Scatter(
+        x=adjusted, y=categories, mode='markers', name='Adjusted gap', marker=dict(color='steelblue', size=9),
+        error_x=dict(type='data', symmetric=False, array=dimension_stats['Adjusted_gap_pct_high'] - adjusted,
+                     arrayminus=adjusted - dimension_stats['Adjusted_gap_pct_low'])))
+    fig.add_vline(x=0, line_dash='dash', line_color='gray')
+    fig.update_layout(
+        title=f'Pay Gap by {dimension}, with 95% Bootstrap Intervals',
+        xaxis_title="Men's pay advantage (% of men's mean pay)", yaxis_title=dimension,
+        scattermode='group', legend=dict(orientation='h', y=-0.2), margin=dict(l=40, r=40, t=60, b=40))
+    return fig
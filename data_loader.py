@@ -0,0 +1,218 @@
+"""Shared, cached loading of the dashboard's CSV files.
+
+Each CSV is parsed once per data version and the resulting DataFrame is kept
+in a process-wide memo, so every Streamlit session (and every rerun) reuses
+the same object instead of calling ``pd.read_csv`` again.  The data version is
+built from the file size, its modification time and a content fingerprint, so
+editing or replacing a CSV automatically triggers a fresh load.
+
+When pyarrow is installed, parsed frames are also written to a Parquet
+"sidecar" file in ``.data_cache/``.  A new server process can then skip CSV
+parsing entirely as long as the source file has not changed.
+
+Dimension columns are loaded as categoricals (see ``schema``); airport
+codes in every file share one code table.
+
+Frames returned from here are shared: treat them as read-only and derive new
+columns with ``.assign`` or on a copy.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from schema import apply_schema, read_dtypes
+
+try:
+    import pyarrow  # noqa: F401
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+
+DATA_DIR = Path(os.environ.get("DASHBOARD_DATA_DIR", "."))
+CACHE_DIR = Path(os.environ.get("DASHBOARD_CACHE_DIR", DATA_DIR / ".data_cache"))
+
+FLIGHTS_CSV = "Airports_P 1.csv"
+AIRPORTS_CSV = "airports.csv"
+STUDENTS_CSV = "university_student_dashboard_data.csv"
+GENDERPAY_CSV = "Glassdoor Gender Pay Gap.csv"
+
+# Explicit column types so pandas does not have to infer them on every parse.
+# Columns missing from a file are simply ignored by read_csv.
+DTYPES = {
+    FLIGHTS_CSV: {
+        'Origin_airport': str,
+        'Destination_airport': str,
+        'Origin_city': str,
+        'Destination_city': str,
+        'Passengers': 'float64',
+        'Seats': 'float64',
+        'Flights': 'float64',
+        'Distance': 'float64',
+        'Origin_population': 'float64',
+        'Destination_population': 'float64',
+    },
+    AIRPORTS_CSV: {
+        'IATA': str,
+        'AIRPORT': str,
+        'CITY': str,
+        'STATE': str,
+        'COUNTRY': str,
+        'LATITUDE': 'float64',
+        'LONGITUDE': 'float64',
+    },
+    STUDENTS_CSV: {
+        'Year': 'int64',
+        'Term': str,
+        'Applications': 'int64',
+        'Admitted': 'int64',
+        'Enrolled': 'int64',
+        'Retention Rate (%)': 'float64',
+        'Student Satisfaction (%)': 'float64',
+        'Engineering Enrolled': 'int64',
+        'Business Enrolled': 'int64',
+        'Arts Enrolled': 'int64',
+        'Science Enrolled': 'int64',
+    },
+    GENDERPAY_CSV: {
+        'JobTitle': str,
+        'Gender': str,
+        'Age': 'int64',
+        'PerfEval': 'int64',
+        'Education': str,
+        'Dept': str,
+        'Seniority': 'int64',
+        'BasePay': 'int64',
+        'Bonus': 'int64',
+    },
+}
+
+_FINGERPRINT_BYTES = 1 << 16
+
+_memo = {}
+_locks = {}
+_locks_guard = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'sidecar_hits': 0, 'sidecar_writes': 0}
+
+
+def data_path(name):
+    return DATA_DIR / name
+
+
+def file_version(path):
+    """Return a short key that changes whenever the file contents change."""
+    path = Path(path)
+    st = path.stat()
+    digest = hashlib.sha1(f"{st.st_size}:{st.st_mtime_ns}".encode())
+    # Also fingerprint the first and last 64 KB, so a file rewritten within
+    # the same mtime tick is still picked up.
+    with open(path, 'rb') as fh:
+        digest.update(fh.read(_FINGERPRINT_BYTES))
+        if st.st_size > _FINGERPRINT_BYTES:
+            fh.seek(max(st.st_size - _FINGERPRINT_BYTES, _FINGERPRINT_BYTES))
+            digest.update(fh.read(_FINGERPRINT_BYTES))
+    return digest.hexdigest()[:16]
+
+
+def data_version(*names):
+    """Combined version key for one or more dashboard CSVs."""
+    return '-'.join(file_version(data_path(name)) for name in names)
+
+
+def _sidecar_path(name, version):
+    return CACHE_DIR / f"{Path(name).stem}.{version}.parquet"
+
+
+def _read_sidecar(name, version):
+    path = _sidecar_path(name, version)
+    if not (HAVE_ARROW and path.exists()):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        # A half-written or corrupt sidecar is just a cache miss.
+        return None
+
+
+def _write_sidecar(name, version, df):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Drop sidecars from older versions of the same CSV
+    for old in CACHE_DIR.glob(f"{Path(name).stem}.*.parquet"):
+        old.unlink(missing_ok=True)
+    tmp = _sidecar_path(name, version).with_suffix('.tmp')
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, _sidecar_path(name, version))
+    _count('sidecar_writes')
+
+
+def _count(stat):
+    with _locks_guard:
+        _stats[stat] += 1
+
+
+def _key_lock(key):
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def load_csv(name, use_sidecar=True):
+    """Load one of the dashboard CSVs, parsing it at most once per version."""
+    path = data_path(name)
+    version = file_version(path)
+    key = (str(path), version)
+
+    cached = _memo.get(key)
+    if cached is not None:
+        _count('hits')
+        return cached
+
+    # Only one session parses a given file version; others wait for it.
+    with _key_lock(key):
+        cached = _memo.get(key)
+        if cached is not None:
+            _count('hits')
+            return cached
+
+        _count('misses')
+        df = _read_sidecar(name, version) if use_sidecar else None
+        if df is not None:
+            _count('sidecar_hits')
+        else:
+            df = pd.read_csv(path, dtype=read_dtypes(DTYPES.get(name)))
+            if use_sidecar and HAVE_ARROW:
+                try:
+                    _write_sidecar(name, version, df)
+                except OSError:
+                    pass
+
+        apply_schema(df)
+
+        # Forget older versions of this file; loaders of other files insert
+        # concurrently, so the memo is only changed under the module lock
+        with _locks_guard:
+            for old_key in [k for k in _memo if k[0] == key[0]]:
+                del _memo[old_key]
+            _memo[key] = df
+        return df
+
+
+def load_airports():
+    return load_csv(AIRPORTS_CSV)
+
+
+def load_students():
+    return load_csv(STUDENTS_CSV)
+
+
+def load_genderpay():
+    return load_csv(GENDERPAY_CSV)
+
+
+def cache_stats():
+    """Hit/miss counters for the in-memory and Parquet caches."""
+    with _locks_guard:
+        return {**_stats, 'cached_files': len(_memo)}
@@ -0,0 +1,165 @@
+"""Worker pools for independent dashboard computations.
+
+``run_tasks`` runs a ``{name: callable}`` mapping on a thread or process
+pool and reports each task's time and the wall time.  It does not report
+a speedup: the only serial baseline at hand is the sum of the task times,
+and threads contending for the GIL stretch each task's own time, so that
+sum overstates the gain (``benchmarks/bench_parallel.py`` measures a real
+serial run instead).  With one worker (one core, or
+``DASHBOARD_WORKERS=1``), one task, or a pool that cannot be started, the
+tasks simply run serially in the calling thread.
+
+Thread pools suit work that populates this process's caches (CSV parsing
+and most pandas/Arrow kernels release the GIL).  Process pools suit pure
+NumPy number crunching; large inputs are handed over through
+``SharedArrays`` (named shared-memory blocks) instead of being pickled
+into every worker.
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+WORKERS = int(os.environ.get("DASHBOARD_WORKERS", 0)) or (os.cpu_count() or 1)
+
+_pools = {}
+_pools_lock = threading.Lock()
+# Shared-memory blocks created (and so owned) by this process
+_owned_blocks = {}
+
+
+def worker_count(requested=None):
+    """Workers to use: ``requested`` if given, else DASHBOARD_WORKERS or the core count."""
+    return max(1, requested if requested is not None else WORKERS)
+
+
+def _pool(kind, workers):
+    key = (kind, workers)
+    with _pools_lock:
+        if key not in _pools:
+            # A broken pool stays None, so later calls go straight to serial
+            try:
+                if kind == 'process':
+                    # Spawned workers: forking a multi-threaded server is unsafe
+                    _pools[key] = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+                else:
+                    _pools[key] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard')
+            except (OSError, NotImplementedError, ValueError):
+                _pools[key] = None
+        return _pools[key]
+
+
+@atexit.register
+def shutdown():
+    with _pools_lock:
+        for pool in _pools.values():
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_tasks(tasks, kind='thread', workers=None):
+    """Run ``{name: callable}`` and return ``(results, report)``.
+
+    Callables must be picklable (module-level functions or partials of
+    them) when ``kind='process'``.  ``report`` holds the mode actually used,
+    the worker count, per-task and wall times (ms) and ``task_ms_sum``.
+    Process workers do not share a GIL, so in process mode it also holds
+    ``overlap``: summed task time / wall time, roughly how many workers
+    were busy at once.
+    """
+    workers = min(worker_count(workers), len(tasks)) or 1
+    pool = _pool(kind, workers) if workers > 1 else None
+    mode = kind if pool is not None else 'serial'
+
+    start = time.perf_counter()
+    timed = None
+    if pool is not None:
+        try:
+            futures = {name: pool.submit(_timed, func) for name, func in tasks.items()}
+            timed = {name: future.result() for name, future in futures.items()}
+        except BrokenExecutor:
+            # Workers died (or could not start): forget the pool, run serially
+            with _pools_lock:
+                _pools[(kind, workers)] = None
+            pool, mode = None, 'serial'
+            start = time.perf_counter()
+    if timed is None:
+        timed = {name: _timed(func) for name, func in tasks.items()}
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    task_ms = {name: round(ms, 1) for name, (_, ms) in timed.items()}
+    task_ms_sum = sum(ms for _, ms in timed.values())
+    report = {'mode': mode, 'workers': workers if pool is not None else 1, 'wall_ms': round(wall_ms, 1),
+              'task_ms_sum': round(task_ms_sum, 1), 'tasks': task_ms}
+    if mode == 'process' and wall_ms:
+        report['overlap'] = round(task_ms_sum / wall_ms, 2)
+    return {name: result for name, (result, _) in timed.items()}, report
+
+
+class SharedArrays:
+    """NumPy arrays copied once into named shared memory.
+
+    ``handles`` is a small picklable description that worker processes pass
+    to ``attach_arrays`` to get zero-copy views of the same memory.  The
+    blocks are freed when the context exits.
+    """
+
+    def __init__(self, **arrays):
+        self._blocks = []
+        self.handles = {}
+        try:
+            for key, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._blocks.append(block)
+                _owned_blocks[block.name] = block
+                np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+                self.handles[key] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        for block in self._blocks:
+            _owned_blocks.pop(block.name, None)
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_arrays(handles):
+    """``(arrays, blocks)`` for ``SharedArrays.handles``; close the blocks when done."""
+    arrays, blocks = {}, []
+    for key, (name, shape, dtype) in handles.items():
+        if name in _owned_blocks:
+            # Same process (serial fallback): use the creating block directly
+            arrays[key] = np.ndarray(shape, np.dtype(dtype), buffer=_owned_blocks[name].buf)
+            continue
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            # Pool workers share the parent's resource tracker, where the
+            # block is already registered; the parent unlinks it
+            block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+    return arrays, blocks
@@ -0,0 +1,124 @@
+"""Process-wide LRU cache of built Plotly figures.
+
+Figures are keyed on ``(chart id, data version, filter values)``, so a rerun
+only rebuilds the charts whose inputs actually changed; everything else is
+served from the cache.  The cache is bounded both by entry count and by the
+total serialized size of the cached figures.
+
+Every build is timed and the figure's JSON size recorded, per chart, so the
+dashboard can show what each chart costs.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import plotly.io as pio
+
+MAX_ENTRIES = 128
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def _freeze(value):
+    """Turn filter values (lists, dicts, sets...) into a hashable key part."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(v) for v in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class FigureCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._building = {}
+        self._chart_stats = {}
+
+    def _stats_for(self, chart_id):
+        return self._chart_stats.setdefault(
+            chart_id, {'builds': 0, 'hits': 0, 'build_ms': None, 'bytes': None})
+
+    def _lookup(self, key, chart_id):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self._stats_for(chart_id)['hits'] += 1
+            return entry[0]
+
+    def get(self, chart_id, version, params, build):
+        """Return the cached figure for these inputs, calling ``build()`` on a miss."""
+        key = (chart_id, _freeze(version), _freeze(params))
+        fig = self._lookup(key, chart_id)
+        if fig is not None:
+            return fig
+
+        # One build per key: sessions (and the startup warm-up) asking for
+        # the same missing figure wait for it instead of building it again
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        with building:
+            fig = self._lookup(key, chart_id)
+            if fig is not None:
+                return fig
+            try:
+                start = time.perf_counter()
+                fig = build()
+                build_ms = (time.perf_counter() - start) * 1000
+                nbytes = len(pio.to_json(fig, validate=False))
+
+                with self._lock:
+                    stats = self._stats_for(chart_id)
+                    stats['builds'] += 1
+                    stats['build_ms'] = round(build_ms, 1)
+                    stats['bytes'] = nbytes
+                    if key not in self._entries:
+                        self._entries[key] = (fig, nbytes)
+                        self._bytes += nbytes
+                    self._evict()
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+        return fig
+
+    def _evict(self):
+        # Drop least recently used figures, but always keep the newest one
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._bytes -= nbytes
+
+    def entry_bytes(self, chart_id, version, params):
+        """Serialized size of a cached figure, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get((chart_id, _freeze(version), _freeze(params)))
+        return None if entry is None else entry[1]
+
+    def stats(self):
+        """Per-chart build count, cache hits, last build time (ms) and JSON size."""
+        with self._lock:
+            return {chart_id: dict(s) for chart_id, s in self._chart_stats.items()}
+
+    def info(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes,
+                    'max_entries': self.max_entries, 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._chart_stats.clear()
+
+
+figure_cache = FigureCache()
+
+
+def cached_figure(chart_id, version, params, build):
+    return figure_cache.get(chart_id, version, params, build)
@@ -0,0 +1,78 @@
+"""Flight-route preparation for the airports tab.
+
+The dashboard reads one hub's routes from the precomputed ``route_index``,
+built by reading the flight log in fixed-size chunks (``CHUNKSIZE`` rows,
+only ``FLIGHT_COLUMNS``), so peak memory is one chunk plus the route
+counts regardless of file size.  Each route row is enriched with
+airports.csv metadata for its origin (``enrich_origins``, gathered by IATA
+code through ``airport_lookup``) and carries a ``Flight_Count`` column
+holding the number of flight rows for that route.  The functions here
+summarize a hub's routes for the charts.
+"""
+
+import pandas as pd
+
+from airport_lookup import airport_lookup
+
+CHUNKSIZE = 500_000
+
+# Columns the airports tab actually needs from the flight log
+FLIGHT_COLUMNS = ['Origin_airport', 'Destination_airport', 'Origin_population']
+
+AIRPORT_COLUMNS = {
+    'AIRPORT': 'Origin_airport_name',
+    'CITY': 'Origin_city',
+    'STATE': 'Origin_state',
+    'COUNTRY': 'Origin_country',
+    'LATITUDE': 'Origin_latitude',
+    'LONGITUDE': 'Origin_longitude',
+}
+
+
+def enrich_origins(flights, airports):
+    """Origin airport metadata from airports.csv added to flight rows (a left join).
+
+    A gather by IATA code through the airport lookup rather than a merge.
+    """
+    meta = airport_lookup(airports).take(flights['Origin_airport'], {'IATA': 'IATA', **AIRPORT_COLUMNS})
+    return pd.concat([flights.reset_index(drop=True), meta], axis=1)
+
+
+def state_flight_counts(origins):
+    """Flights per origin state, most flights first (like ``value_counts``)."""
+    state_counts = (origins.groupby('Origin_state', sort=False)['Flight_Count'].sum()
+                    .sort_values(ascending=False, kind='stable').reset_index())
+    state_counts.columns = ['Origin_state', 'Flight_Count']
+    return state_counts
+
+
+def distance_summary(origins):
+    """Flight-weighted route-length figures for one hub's origins.
+
+    Returns the average flight distance, the longest route and, when the
+    flight log has a Seats column, total seat-miles.
+    """
+    known = origins[origins['Distance_miles'].notna()]
+    flights = known['Flight_Count'].to_numpy(dtype=float)
+    distance = known['Distance_miles'].to_numpy(dtype=float)
+    summary = {
+        'avg_miles': float(distance @ flights / flights.sum()) if flights.sum() else float('nan'),
+        'max_miles': float(distance.max()) if len(distance) else float('nan'),
+        'flight_miles': float(distance @ flights),
+    }
+    if 'Seats' in known:
+        summary['seat_miles'] = float(distance @ known['Seats'].to_numpy(dtype=float))
+    return summary
+
+
+def state_distance_stats(origins):
+    """Per origin state: flights, flight-weighted average distance and seat-miles."""
+    known = origins[origins['Distance_miles'].notna()]
+    weighted = known.assign(Flight_miles=known['Distance_miles'] * known['Flight_Count'])
+    columns = {'Flight_Count': 'sum', 'Flight_miles': 'sum'}
+    if 'Seats' in known:
+        weighted['Seat_miles'] = known['Distance_miles'] * known['Seats']
+        columns['Seat_miles'] = 'sum'
+    stats = weighted.groupby('Origin_state').agg(columns)
+    stats['Avg_miles'] = stats['Flight_miles'] / stats['Flight_Count']
+    return stats.sort_values('Avg_miles', ascending=False).reset_index()
@@ -0,0 +1,46 @@
+"""Vectorized great-circle helpers for the route maps and route lengths."""
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+def _unit_vectors(lon, lat):
+    lon, lat = np.radians(lon), np.radians(lat)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def great_circle_path(lon1, lat1, lon2, lat2, n_points=24):
+    """Points along the great circle from each (lon1, lat1) to (lon2, lat2).
+
+    All arguments broadcast against each other, so a whole column of origins
+    can be routed to one hub in a single call.  Returns ``(lons, lats)``
+    arrays of shape ``(routes, n_points)`` in degrees, endpoints included.
+    """
+    lon1, lat1, lon2, lat2 = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (lon1, lat1, lon2, lat2)))
+    start = _unit_vectors(lon1.ravel(), lat1.ravel())
+    end = _unit_vectors(lon2.ravel(), lat2.ravel())
+
+    omega = np.arccos(np.clip(np.einsum('ij,ij->i', start, end), -1.0, 1.0))[:, None]
+    t = np.linspace(0.0, 1.0, n_points)[None, :]
+    sin_omega = np.sin(omega)
+    # Spherical interpolation, falling back to linear for (near) identical points
+    with np.errstate(invalid='ignore', divide='ignore'):
+        a = np.where(sin_omega > 1e-12, np.sin((1 - t) * omega) / sin_omega, 1 - t)
+        b = np.where(sin_omega > 1e-12, np.sin(t * omega) / sin_omega, t)
+    points = a[..., None] * start[:, None, :] + b[..., None] * end[:, None, :]
+
+    lats = np.degrees(np.arctan2(points[..., 2], np.hypot(points[..., 0], points[..., 1])))
+    lons = np.degrees(np.arctan2(points[..., 1], points[..., 0]))
+    return lons, lats
+
+
+def haversine(lon1, lat1, lon2, lat2, radius=EARTH_RADIUS_MILES):
+    """Great-circle distance between points, in the units of ``radius`` (miles).
+
+    Arguments broadcast against each other, so whole columns of coordinates
+    are handled in one call; missing coordinates give NaN.
+    """
+    lon1, lat1, lon2, lat2 = (np.radians(np.asarray(a, dtype=float)) for a in (lon1, lat1, lon2, lat2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
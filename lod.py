@@ -0,0 +1,105 @@
+"""Level-of-detail reduction for dense charts.
+
+Chart builders take a ``budget``: the most marks (bar segments, bins or
+map points) a figure may send to the browser.  Data within the budget is
+drawn as-is; beyond it, it is reduced server-side so payload size stays
+bounded however large the data grows:
+
+* ``top_n`` / ``top_segments`` keep the largest categories and fold the
+  rest into an "Other" row (per group, for stacked bars);
+* ``binned`` pre-aggregates a dense numeric series into histogram bins;
+* ``path_points`` picks how many points each map path may use, and
+  ``top_rows`` which paths fit at all.
+
+``budget=None`` means full detail, which the dashboard offers on demand.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+POINT_BUDGET = int(os.environ.get("DASHBOARD_POINT_BUDGET", 5000))
+OTHER = 'Other'
+
+
+def over_budget(n, budget):
+    return budget is not None and n > budget
+
+
+def top_rows(frame, value, budget):
+    """The ``budget`` rows with the largest ``value``, in their original order."""
+    if not over_budget(len(frame), budget):
+        return frame
+    keep = frame[value].to_numpy().argsort(kind='stable')[::-1][:budget]
+    return frame.iloc[np.sort(keep)]
+
+
+def top_n(frame, key, value, budget, other=OTHER):
+    """``frame`` (one row per ``key``) with the rows beyond the largest ``budget - 1``
+    summed into a single ``other`` row (numeric columns only)."""
+    if not over_budget(len(frame), budget):
+        return frame
+    order = frame[value].to_numpy().argsort(kind='stable')[::-1]
+    kept, rest = frame.iloc[np.sort(order[:budget - 1])], frame.iloc[order[budget - 1:]]
+    folded = rest.select_dtypes('number').sum().to_frame().T
+    folded[key] = f"{other} ({len(rest)})"
+    return pd.concat([kept, folded], ignore_index=True)[frame.columns]
+
+
+def top_segments(frame, group, value, budget, label, other=OTHER):
+    """Stacked-bar rows, at most ``budget`` of them: the largest segments overall are
+    kept and the rest of each ``group`` becomes one ``other`` segment.
+
+    When there are at least ``budget`` groups, so not even one segment per
+    group would fit, only the largest groups (by total ``value``), half the
+    budget's worth, keep their bars; the others are folded into one bar
+    named ``other`` with their count, and the remaining budget goes to
+    segments of the kept groups.
+
+    Returns ``(frame, folded)``: ``frame`` has a ``Folded`` column with the
+    number of rows behind each segment (1 for kept rows), ``folded`` is the
+    number of rows folded away.  Folded segments all get ``label`` = other,
+    so they share one colour.
+    """
+    frame = frame.assign(Folded=1)
+    if not over_budget(len(frame), budget):
+        return frame, 0
+    totals = frame.groupby(group, sort=False)[value].sum()
+    folded_groups = []
+    if budget <= len(totals):
+        largest = totals.sort_values(ascending=False, kind='stable').index[:max(budget // 2, 1) - 1]
+        small = ~frame[group].isin(largest)
+        dropped = frame[small]
+        folded_groups = [pd.DataFrame({group: [f"{other} ({dropped[group].nunique()})"], label: [other],
+                                       value: [dropped[value].sum()], 'Folded': [len(dropped)]})]
+        frame, budget = frame[~small], budget - 1
+    groups = frame[group].nunique()
+    kept, rest = frame, frame.iloc[:0]
+    if over_budget(len(frame), budget):
+        order = frame[value].to_numpy().argsort(kind='stable')[::-1]
+        kept, rest = frame.iloc[np.sort(order[:budget - groups])], frame.iloc[order[budget - groups:]]
+    folded = rest.groupby(group, sort=False, observed=True).agg({value: 'sum', 'Folded': 'sum'}).reset_index()
+    folded[label] = other
+    n_folded = len(rest) + sum(int(part['Folded'].iloc[0]) for part in folded_groups)
+    return pd.concat([kept, folded, *folded_groups], ignore_index=True), n_folded
+
+
+def binned(values, weights, bins, budget):
+    """``(centers, widths, totals)`` of a weighted histogram, or None within budget.
+
+    Within budget the chart can ship the raw series and let the browser bin
+    it; beyond, the bins are computed here and only they are sent.
+    """
+    values = np.asarray(values, dtype=float)
+    if not over_budget(len(values), budget):
+        return None
+    totals, edges = np.histogram(values, bins=bins, weights=np.asarray(weights, dtype=float))
+    return (edges[:-1] + edges[1:]) / 2, np.diff(edges), totals
+
+
+def path_points(paths, budget, max_points, min_points=2):
+    """Points per map path so that ``paths`` paths (plus a gap each) fit the budget."""
+    if budget is None or not paths:
+        return max_points
+    return int(np.clip(budget // paths - 1, min_points, max_points))
@@ -0,0 +1,192 @@
+"""Gender pay-gap ratios for every dimension in one vectorized pass.
+
+Every dimension column is factorized to integer codes laid out side by side
+(dimension ``j`` gets codes ``offset[j] .. offset[j] + n_j``), so the mean
+pay per (dimension, category, gender) is a single ``np.bincount`` over all
+dimensions at once instead of one ``groupby``/``pivot`` per dimension.  Rows
+are aggregated in blocks so the memory needed stays bounded for very large
+employee tables; for large tables on several cores, row ranges are summed
+in worker processes that read the codes and pay from shared memory.
+
+``pay_gap_tables`` returns the same ``final_df`` (one row per category with
+Male/Female pay normalized to the better-paid gender) and ``summary`` (one
+row per dimension) that tab 3 used to build with a Python loop.
+"""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from data_loader import GENDERPAY_CSV, data_version, load_genderpay
+from executor import SharedArrays, attach_arrays, run_tasks, worker_count
+from shared_store import shared
+
+GROUP_COLS = ['JobTitle', 'Education', 'Dept', 'Seniority', 'PerfEval', 'Age']
+DIMENSION_LABELS = {
+    'JobTitle': 'Job Title',
+    'Education': 'Education Level',
+    'Dept': 'Department',
+    'Seniority': 'Seniority Level',
+    'PerfEval': 'Performance Evaluation',
+    'Age': 'Age Group'
+}
+
+BLOCK_ROWS = 1_000_000
+# Below this many rows a process pool costs more than it saves
+PARALLEL_MIN_ROWS = 2_000_000
+
+
+def load_genderpay_totals():
+    """genderpay.csv with its TotalPay column, one frame shared by all sessions per version."""
+    def build():
+        genderpay = load_genderpay()
+        return genderpay.assign(TotalPay=genderpay['BasePay'] + genderpay['Bonus'])
+    return shared('genderpay_totals', data_version(GENDERPAY_CSV), build)
+
+
+def total_pay(genderpay):
+    if 'TotalPay' in genderpay:
+        return genderpay['TotalPay'].to_numpy(dtype=float)
+    return (genderpay['BasePay'] + genderpay['Bonus']).to_numpy(dtype=float)
+
+
+def dimension_codes(genderpay, group_cols):
+    """(rows, dims) int32 codes, offset per dimension.
+
+    Missing values get code ``n_categories``, an extra bucket that is dropped
+    after aggregation.
+    """
+    uniques_per_col = []
+    col_codes = []
+    for col in group_cols:
+        codes, uniques = pd.factorize(genderpay[col], sort=True)
+        col_codes.append(codes)
+        uniques_per_col.append(uniques)
+    sizes = [len(u) for u in uniques_per_col]
+    n_categories = sum(sizes)
+    offsets = np.cumsum([0] + sizes[:-1])
+
+    codes = np.empty((len(genderpay), len(group_cols)), dtype=np.int32)
+    for j, (c, offset) in enumerate(zip(col_codes, offsets)):
+        codes[:, j] = np.where(c >= 0, c + offset, n_categories)
+    categories = np.concatenate([np.asarray(u, dtype=object) for u in uniques_per_col])
+    dims = np.repeat(np.array(group_cols, dtype=object), sizes)
+    return codes, categories, dims, n_categories
+
+
+def gender_codes(genderpay):
+    """0 = Female, 1 = Male, 2 = anything else (dropped like the missing bucket)."""
+    gender_code = np.full(len(genderpay), 2, dtype=np.int32)
+    gender_code[(genderpay['Gender'] == 'Female').to_numpy(dtype=bool)] = 0
+    gender_code[(genderpay['Gender'] == 'Male').to_numpy(dtype=bool)] = 1
+    return gender_code
+
+
+def _accumulate(codes, gender_code, pay, n_keys, block_rows=BLOCK_ROWS):
+    """Pay sums and row counts per (category, gender) key over these rows."""
+    sums = np.zeros(n_keys)
+    counts = np.zeros(n_keys)
+    n_dims = codes.shape[1]
+    for start in range(0, len(pay), block_rows):
+        block = slice(start, start + block_rows)
+        keys = (codes[block] * 3 + gender_code[block, None]).ravel()
+        sums += np.bincount(keys, weights=np.repeat(pay[block], n_dims), minlength=n_keys)
+        counts += np.bincount(keys, minlength=n_keys)
+    return sums, counts
+
+
+def _accumulate_shared(handles, start, stop, n_keys, block_rows):
+    """Worker-process side of ``_accumulate`` over one row range in shared memory."""
+    arrays, blocks = attach_arrays(handles)
+    try:
+        rows = slice(start, stop)
+        return _accumulate(arrays['codes'][rows], arrays['gender'][rows], arrays['pay'][rows], n_keys, block_rows)
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+def _parallel_accumulate(codes, gender_code, pay, n_keys, workers, block_rows):
+    bounds = np.linspace(0, len(pay), workers + 1).astype(int)
+    with SharedArrays(codes=codes, gender=gender_code, pay=pay) as shared:
+        tasks = {i: partial(_accumulate_shared, shared.handles, lo, hi, n_keys, block_rows)
+                 for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:]))}
+        results, _ = run_tasks(tasks, kind='process', workers=workers)
+    return sum(r[0] for r in results.values()), sum(r[1] for r in results.values())
+
+
+def mean_pay_by_gender(genderpay, group_cols=GROUP_COLS, block_rows=BLOCK_ROWS, workers=None):
+    """Mean TotalPay per (dimension, category) for women and men.
+
+    Returns a frame with ``Column``, ``Category``, ``Female`` and ``Male``
+    columns; categories are sorted within each dimension.  Tables of at
+    least ``PARALLEL_MIN_ROWS`` rows are split across ``workers`` processes
+    (default: DASHBOARD_WORKERS or the core count).
+    """
+    codes, categories, dims, n_categories = dimension_codes(genderpay, group_cols)
+    pay = total_pay(genderpay)
+    gender_code = gender_codes(genderpay)
+
+    n_keys = 3 * (n_categories + 1)
+    workers = worker_count(workers)
+    if workers > 1 and len(pay) >= PARALLEL_MIN_ROWS:
+        sums, counts = _parallel_accumulate(codes, gender_code, pay, n_keys, workers, block_rows)
+    else:
+        sums, counts = _accumulate(codes, gender_code, pay, n_keys, block_rows)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = (sums / counts).reshape(n_categories + 1, 3)[:n_categories, :2]
+    return pd.DataFrame({'Column': dims, 'Category': categories,
+                         'Female': means[:, 0], 'Male': means[:, 1]})
+
+
+def pay_ratios(genderpay, group_cols=GROUP_COLS, labels=DIMENSION_LABELS, workers=None):
+    """final_df: each gender's mean pay as a share of the better-paid gender."""
+    means = mean_pay_by_gender(genderpay, group_cols, workers=workers)
+    top = np.fmax(means['Male'], means['Female'])
+    final_df = pd.DataFrame({
+        'Dimension': means['Column'].map(labels),
+        'Category': means['Category'],
+        'Male': means['Male'] / top,
+        'Female': means['Female'] / top,
+    })
+    # Categories with no women and no men at all never appeared in the loop version
+    return final_df[means[['Male', 'Female']].notna().any(axis=1)].reset_index(drop=True)
+
+
+def _round_int(values):
+    return np.round(values).astype('int64')
+
+
+def pay_gap_summary(final_df):
+    """One row per dimension, with the columns of the original compute_summary."""
+    per_dim = final_df.assign(
+        Gap=(final_df['Male'] - final_df['Female']).abs(),
+        Female_less=final_df['Female'] < final_df['Male'],
+    ).groupby('Dimension').agg(
+        n=('Category', 'nunique'),
+        male=('Male', 'mean'),
+        female=('Female', 'mean'),
+        gap=('Gap', 'mean'),
+        female_less=('Female_less', 'sum'),
+    )
+    return pd.DataFrame({
+        'Number of Categories': per_dim['n'].astype('int64'),
+        '% of Categories Where Women Earn Less': _round_int(per_dim['female_less'] / per_dim['n'] * 100),
+        'Average Male Earnings (%)': _round_int(per_dim['male'] * 100),
+        'Average Female Earnings (%)': _round_int(per_dim['female'] * 100),
+        'Average Earnings Gap (%)': _round_int(per_dim['gap'] * 100),
+    }).reset_index()
+
+
+def pay_gap_tables(genderpay, version=None, workers=None):
+    """(final_df, summary), kept in the shared store per data version when one is given."""
+    def build():
+        final_df = pay_ratios(genderpay, workers=workers)
+        return final_df, pay_gap_summary(final_df)
+
+    if version is None:
+        return build()
+    return shared('pay_gap_tables', version, build)
@@ -0,0 +1,209 @@
+"""Bootstrap confidence intervals and a controlled ("adjusted") pay gap per category.
+
+For every (dimension, category) of the pay-gap table:
+
+* raw gap: women's mean TotalPay per $1 of men's, as in tab 3;
+* adjusted gap: per dimension, TotalPay is regressed on the controls
+  (JobTitle, Education and Dept as dummies; Seniority, PerfEval and Age as
+  standardized numbers) plus one Male indicator per category of that
+  dimension.  A category's Male coefficient is the dollar gap between men
+  and women in it with the other factors held equal.
+
+Both come with percentile bootstrap intervals from a bucketed Poisson
+bootstrap: every employee is assigned once to one of ``BUCKETS`` random
+buckets, one blocked pass over the rows collects per-bucket sufficient
+statistics (pay sums and counts per category and gender, the regressions'
+X'X and X'y), and each replicate reweights whole buckets with Poisson(1)
+weights.  A batch of replicates is then a few matrix products over buckets
+and one batched linear solve, independent of the row count.  Cells smaller
+than the bucket count are resampled employee by employee; larger cells by
+random groups of employees, which for means and linear fits closely matches
+the row-level bootstrap.
+
+``pay_gap_analysis`` results are kept in the shared store per data version.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from paygap import BLOCK_ROWS, DIMENSION_LABELS, GROUP_COLS, dimension_codes, gender_codes, total_pay
+from shared_store import shared
+
+CONTROL_DUMMIES = ['JobTitle', 'Education', 'Dept']
+CONTROL_NUMERIC = ['Seniority', 'PerfEval', 'Age']
+
+BUCKETS = 256
+REPLICATES = 1000
+# Replicates solved together (bounds the (replicates, p, p) systems in memory)
+REPLICATE_BATCH = 250
+CONFIDENCE = 0.95
+
+
+def _controls(genderpay):
+    """Dummy codes (code, levels) and the standardized numeric control matrix."""
+    dummies = []
+    for col in CONTROL_DUMMIES:
+        codes, uniques = pd.factorize(genderpay[col], sort=True)
+        dummies.append((codes, len(uniques)))
+    numeric = np.empty((len(genderpay), len(CONTROL_NUMERIC)))
+    for j, col in enumerate(CONTROL_NUMERIC):
+        x = genderpay[col].to_numpy(dtype=float)
+        sd = np.nanstd(x)
+        # Missing values sit at the mean
+        numeric[:, j] = np.nan_to_num((x - np.nanmean(x)) / (sd if sd > 0 else 1.0))
+    return dummies, numeric
+
+
+def _design(dummies, numeric, rows):
+    """Control design block for ``rows``: intercept, dummies (first level dropped), numerics."""
+    n = len(numeric[rows])
+    parts = [np.ones((n, 1))]
+    for codes, levels in dummies:
+        block = codes[rows]
+        d = np.zeros((n, max(levels - 1, 0)))
+        hit = np.flatnonzero(block > 0)
+        d[hit, block[hit] - 1] = 1.0
+        parts.append(d)
+    parts.append(numeric[rows])
+    return np.hstack(parts)
+
+
+def _bucket_stats(genderpay, codes, n_categories, buckets, seed, block_rows):
+    """One blocked pass: per-bucket raw and regression sufficient statistics."""
+    pay = total_pay(genderpay)
+    gender = gender_codes(genderpay)
+    dummies, numeric = _controls(genderpay)
+    bucket = np.random.default_rng(seed).integers(0, buckets, len(pay))
+    n_dims = codes.shape[1]
+    q = 1 + sum(max(levels - 1, 0) for _, levels in dummies) + numeric.shape[1]
+    slots = (n_categories + 1) * buckets
+
+    stats = {
+        # Raw: pay sums and counts per (category, gender, bucket)
+        'sums': np.zeros(3 * slots), 'counts': np.zeros(3 * slots),
+        # Regression: controls Z, per-category male indicators M, pay y
+        'ZtZ': np.zeros((buckets, q, q)), 'Zty': np.zeros((buckets, q)),
+        'MtZ': np.zeros((slots, q)), 'MtM': np.zeros(slots), 'Mty': np.zeros(slots),
+    }
+    for start in range(0, len(pay), block_rows):
+        rows = slice(start, start + block_rows)
+        c, g, y, b = codes[rows], gender[rows], pay[rows], bucket[rows]
+
+        keys = ((c * 3 + g[:, None]) * buckets + b[:, None]).ravel()
+        stats['sums'] += np.bincount(keys, weights=np.repeat(y, n_dims), minlength=3 * slots)
+        stats['counts'] += np.bincount(keys, minlength=3 * slots)
+
+        keep = g < 2
+        z, y, b, c = _design(dummies, numeric, rows)[keep], y[keep], b[keep], c[keep]
+        male = g[keep] == 1
+        # Z'Z and Z'y per bucket: rows sorted by bucket, one product per bucket
+        order = np.argsort(b, kind='stable')
+        zs, ys = z[order], y[order]
+        bounds = np.searchsorted(b[order], np.arange(buckets + 1))
+        for i in np.flatnonzero(np.diff(bounds)):
+            part = zs[bounds[i]:bounds[i + 1]]
+            stats['ZtZ'][i] += part.T @ part
+            stats['Zty'][i] += part.T @ ys[bounds[i]:bounds[i + 1]]
+        # M is one-hot over a row's categories, for men only: bincounts per (category, bucket)
+        mkeys = (c[male] * buckets + b[male, None]).ravel()
+        zm = z[male]
+        for col in range(q):
+            stats['MtZ'][:, col] += np.bincount(mkeys, weights=np.repeat(zm[:, col], n_dims), minlength=slots)
+        stats['MtM'] += np.bincount(mkeys, minlength=slots)
+        stats['Mty'] += np.bincount(mkeys, weights=np.repeat(y[male], n_dims), minlength=slots)
+    return stats
+
+
+def _replicate(stats, weights, n_categories, spans):
+    """Raw ratio, adjusted gap and male mean per category, for each row of ``weights``."""
+    buckets = weights.shape[1]
+    sums = np.einsum('rk,cgk->rcg', weights, stats['sums'].reshape(n_categories + 1, 3, buckets))
+    counts = np.einsum('rk,cgk->rcg', weights, stats['counts'].reshape(n_categories + 1, 3, buckets))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    female, male = means[:, :n_categories, 0], means[:, :n_categories, 1]
+    # Gaps need both genders in the (resampled) category
+    both = (counts[:, :n_categories, 0] > 0) & (counts[:, :n_categories, 1] > 0)
+
+    ztz = np.einsum('rk,kab->rab', weights, stats['ZtZ'])
+    zty = weights @ stats['Zty']
+    mtz = np.einsum('rk,ckq->rcq', weights, stats['MtZ'].reshape(n_categories + 1, buckets, -1))
+    mtm = weights @ stats['MtM'].reshape(n_categories + 1, buckets).T
+    mty = weights @ stats['Mty'].reshape(n_categories + 1, buckets).T
+
+    gap = np.full_like(female, np.nan)
+    q = ztz.shape[1]
+    for lo, hi in spans:
+        p = q + hi - lo
+        xtx = np.zeros((len(weights), p, p))
+        xtx[:, :q, :q] = ztz
+        xtx[:, q:, :q] = mtz[:, lo:hi]
+        xtx[:, :q, q:] = mtz[:, lo:hi].transpose(0, 2, 1)
+        xtx[:, np.arange(q, p), np.arange(q, p)] = mtm[:, lo:hi]
+        # A tiny ridge keeps categories with no men in a replicate solvable; they are masked below
+        diag = np.arange(p)
+        xtx[:, diag, diag] += 1e-9 * xtx[:, diag, diag].max(axis=1, keepdims=True) + 1e-12
+        xty = np.concatenate([zty, mty[:, lo:hi]], axis=1)
+        gap[:, lo:hi] = np.linalg.solve(xtx, xty[..., None])[:, q:, 0]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = female / male
+    return np.where(both, ratio, np.nan), np.where(both, gap, np.nan), male
+
+
+def _interval(values, confidence):
+    alpha = (1 - confidence) / 2
+    with warnings.catch_warnings():
+        # Categories that never had both genders are all-NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanquantile(values, [alpha, 1 - alpha], axis=0)
+
+
+def bootstrap_pay_gaps(genderpay, group_cols=GROUP_COLS, replicates=REPLICATES, buckets=BUCKETS,
+                       confidence=CONFIDENCE, seed=0, block_rows=BLOCK_ROWS):
+    """Raw and adjusted gap per category with bootstrap intervals.
+
+    Returns one row per category (in ``pay_ratios`` order) with the head
+    counts, ``Female_per_dollar`` (women's mean pay per $1 of men's),
+    ``Adjusted_gap`` (men minus women, dollars, controlled),
+    ``Adjusted_gap_pct`` (as a share of men's mean pay), ``_low``/``_high``
+    bounds for all three and ``Significant`` (adjusted interval excludes 0).
+    """
+    codes, categories, dims, n_categories = dimension_codes(genderpay, group_cols)
+    stats = _bucket_stats(genderpay, codes, n_categories, buckets, seed, block_rows)
+    sizes = pd.Series(dims).value_counts(sort=False).reindex(group_cols).to_numpy()
+    spans = list(zip(np.cumsum([0, *sizes[:-1]]), np.cumsum(sizes)))
+
+    ratio, gap, male = _replicate(stats, np.ones((1, buckets)), n_categories, spans)
+    estimates = {'Female_per_dollar': ratio[0], 'Adjusted_gap': gap[0], 'Adjusted_gap_pct': gap[0] / male[0] * 100}
+
+    rng = np.random.default_rng(seed + 1)
+    draws = {name: [] for name in estimates}
+    for start in range(0, replicates, REPLICATE_BATCH):
+        weights = rng.poisson(1.0, (min(REPLICATE_BATCH, replicates - start), buckets)).astype(float)
+        ratio, gap, male = _replicate(stats, weights, n_categories, spans)
+        draws['Female_per_dollar'].append(ratio)
+        draws['Adjusted_gap'].append(gap)
+        draws['Adjusted_gap_pct'].append(gap / male * 100)
+
+    counts = stats['counts'].reshape(n_categories + 1, 3, buckets).sum(axis=2)[:n_categories]
+    result = pd.DataFrame({'Dimension': pd.Series(dims).map(DIMENSION_LABELS), 'Category': categories,
+                           'Women': counts[:, 0].astype('int64'), 'Men': counts[:, 1].astype('int64')})
+    for name, estimate in estimates.items():
+        low, high = _interval(np.concatenate(draws[name]), confidence)
+        result[name], result[f'{name}_low'], result[f'{name}_high'] = estimate, low, high
+    result['Significant'] = (result['Adjusted_gap_low'] > 0) | (result['Adjusted_gap_high'] < 0)
+    # Same rows as pay_ratios: categories with at least one woman or man
+    return result[(result['Women'] + result['Men']) > 0].reset_index(drop=True)
+
+
+def pay_gap_analysis(genderpay, version=None, replicates=REPLICATES, seed=0):
+    """``bootstrap_pay_gaps``, kept in the shared store per data version when one is given."""
+    def build():
+        return bootstrap_pay_gaps(genderpay, replicates=replicates, seed=seed)
+
+    if version is None:
+        return build()
+    return shared('pay_gap_analysis', (version, replicates, seed), build)
@@ -0,0 +1,49 @@
+"""Data preparation for each tab, runnable in parallel.
+
+Each ``prepare_*`` function does a tab's heavy, filter-independent work and
+leaves the result in the process-wide caches the tab reads from (route
+index and route graph, university cube and term KPIs, pay-gap tables and
+intervals).  ``prepare_tabs`` runs all three on the thread pool; the
+startup warm-up (``startup.warm_up``) runs each of them, followed by the
+tab's default figures, in the background once per data version, so
+whichever tab a session opens first, the others are already warm when it
+switches.
+"""
+
+from data_loader import AIRPORTS_CSV, FLIGHTS_CSV, GENDERPAY_CSV, STUDENTS_CSV, data_version
+from data_loader import load_airports
+from executor import run_tasks
+
+
+def prepare_airports():
+    from route_graph import route_graph
+    from route_index import route_index
+
+    route_graph(route_index(load_airports()))
+
+
+def prepare_university():
+    from term_kpis import load_term_kpis
+
+    load_term_kpis()
+
+
+def prepare_paygap():
+    from paygap import load_genderpay_totals, pay_gap_tables
+    from paygap_stats import pay_gap_analysis
+
+    genderpay = load_genderpay_totals()
+    pay_gap_tables(genderpay, version=data_version(GENDERPAY_CSV))
+    pay_gap_analysis(genderpay, version=data_version(GENDERPAY_CSV))
+
+
+PIPELINES = {'airports': prepare_airports, 'university': prepare_university, 'paygap': prepare_paygap}
+# The CSVs each pipeline reads; a tab's caches are valid for one version of these
+PIPELINE_INPUTS = {'airports': (FLIGHTS_CSV, AIRPORTS_CSV), 'university': (STUDENTS_CSV,),
+                   'paygap': (GENDERPAY_CSV,)}
+
+
+def prepare_tabs(workers=None):
+    """Run every tab's preparation on the thread pool; returns the executor report."""
+    _, report = run_tasks(PIPELINES, kind='thread', workers=workers)
+    return report
@@ -0,0 +1,125 @@
+"""Named timing spans for dashboard reruns.
+
+A ``RerunProfile`` collects one record per stage of a rerun (data loading,
+aggregation, figure building, sending a chart to the browser): wall time,
+the change in process RSS across the stage and, where known, the size of
+the payload sent to the browser.  When profiling is off, ``span`` hands out
+a throwaway record and measures nothing.
+
+Finished profiles are appended to a JSON-lines log (one object per rerun)
+and a flat CSV log (one row per span) under ``PROFILE_DIR``, tagged with the
+release and the size of the input CSVs, so runs can be compared across data
+sizes and versions of the dashboard.
+"""
+
+import csv
+import json
+import os
+import resource
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from data_loader import CACHE_DIR
+
+PROFILE_DIR = Path(os.environ.get("DASHBOARD_PROFILE_DIR", CACHE_DIR / "profile"))
+RELEASE = os.environ.get("DASHBOARD_RELEASE", "dev")
+
+CSV_FIELDS = ['timestamp', 'run_id', 'kind', 'release', 'data_mb', 'section', 'stage',
+              'ms', 'rss_mb', 'rss_delta_mb', 'payload_bytes']
+
+_log_lock = threading.Lock()
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is missing)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def data_size_mb(paths):
+    """Total size of the input files, so logs can be grouped by data size."""
+    total = 0
+    for path in paths:
+        try:
+            total += Path(path).stat().st_size
+        except OSError:
+            pass
+    return round(total / 2**20, 2)
+
+
+class RerunProfile:
+    def __init__(self, kind='full', enabled=True, release=RELEASE, data_mb=None):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.enabled = enabled
+        self.release = release
+        self.data_mb = data_mb
+        self.timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.section = None
+        self.spans = []
+        self.total_ms = None
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, stage, payload_bytes=None):
+        """Time ``stage``; set ``record['payload_bytes']`` inside the block if known."""
+        record = {'section': self.section, 'stage': stage, 'payload_bytes': payload_bytes}
+        if not self.enabled:
+            yield record
+            return
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            rss_after = rss_mb()
+            record['ms'] = round((time.perf_counter() - start) * 1000, 2)
+            record['rss_mb'] = round(rss_after, 1)
+            record['rss_delta_mb'] = round(rss_after - rss_before, 2)
+            self.spans.append(record)
+
+    def finish(self):
+        self.total_ms = round((time.perf_counter() - self._start) * 1000, 2)
+        return self
+
+    def frame(self):
+        """One row per span, in the order they ran."""
+        columns = ['section', 'stage', 'ms', 'rss_delta_mb', 'rss_mb', 'payload_bytes']
+        return pd.DataFrame(self.spans, columns=columns)
+
+    def to_dict(self):
+        return {'timestamp': self.timestamp, 'run_id': self.run_id, 'kind': self.kind,
+                'release': self.release, 'data_mb': self.data_mb, 'total_ms': self.total_ms,
+                'spans': self.spans}
+
+    def write_log(self, directory=None):
+        """Append this rerun to ``profile.jsonl`` and its spans to ``profile.csv``."""
+        if not (self.enabled and self.spans):
+            return
+        directory = Path(directory or PROFILE_DIR)
+        header = {'timestamp': self.timestamp, 'run_id': self.run_id, 'kind': self.kind,
+                  'release': self.release, 'data_mb': self.data_mb}
+        with _log_lock:
+            try:
+                directory.mkdir(parents=True, exist_ok=True)
+                with open(directory / 'profile.jsonl', 'a') as fh:
+                    fh.write(json.dumps(self.to_dict()) + '\n')
+                csv_path = directory / 'profile.csv'
+                new_file = not csv_path.exists()
+                with open(csv_path, 'a', newline='') as fh:
+                    writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
+                    if new_file:
+                        writer.writeheader()
+                    for span in self.spans:
+                        writer.writerow({**header, **span})
+            except OSError:
+                pass
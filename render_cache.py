@@ -0,0 +1,84 @@
+"""Rendered-image cache for the Matplotlib charts.
+
+Matplotlib figures are drawn once per data version, rasterized to PNG (or
+SVG) bytes and kept in a bounded, process-wide byte cache; reruns and other
+sessions are served the cached bytes with ``st.image``.  Figures are created
+with ``matplotlib.figure.Figure`` rather than ``pyplot``, so they are never
+registered with pyplot's global figure manager and are freed as soon as the
+bytes are written, keeping server memory flat over many sessions.
+"""
+
+import io
+import threading
+from collections import OrderedDict
+
+MAX_BYTES = 16 * 1024 * 1024
+
+# Same output as st.pyplot's defaults
+SAVEFIG_DEFAULTS = {'bbox_inches': 'tight', 'dpi': 200}
+
+
+class ByteCache:
+    """LRU cache of rendered images, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = data
+            self._bytes += len(data)
+            while len(self._entries) > 1 and self._bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._bytes -= len(dropped)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+image_cache = ByteCache()
+
+
+def render_figure(fig, fmt='png', **savefig_kwargs):
+    """Rasterize (or vectorize) a Matplotlib figure to bytes and release it."""
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, **{**SAVEFIG_DEFAULTS, **savefig_kwargs})
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+def cached_render(chart_id, version, build_figure, fmt='png'):
+    """Image bytes for ``chart_id`` at this data version, rendering on a miss."""
+    key = (chart_id, version, fmt)
+    data = image_cache.get(key)
+    if data is None:
+        data = render_figure(build_figure(), fmt=fmt)
+        image_cache.put(key, data)
+    return data
@@ -0,0 +1,302 @@
+"""Headless batch reports: every dashboard figure and table, without Streamlit.
+
+Fans out over a parameter grid, one job per tab slice:
+
+* airports: one job per hub (all hubs, the busiest N, or a list of codes);
+* university: one job per institution (and all institutions) and year
+  window, with the term KPI tables (year-over-year changes, Spring vs.
+  Fall, lag correlation);
+* paygap: an overview job plus one job per pay-gap dimension (ratios,
+  bootstrap intervals and adjusted gaps).
+
+Jobs use the same data preparation and figure builders as the dashboard
+(route index, term KPIs, pay-gap tables, ``charts``) and run on the
+executor's thread pool, sharing the process-wide caches.  Building the
+job list only reads what the grid needs (hub codes, institutions and
+years); the route index, pay-gap tables and bootstrap intervals are
+prepared by the first job that uses them, so a rerun that skips every job
+does not pay for them.  Figures are written as HTML (plus PNG with
+``--formats png``, which needs the optional kaleido package; Matplotlib
+charts are always PNG), tables as Parquet (or CSV without pyarrow).
+
+A manifest in the output directory records each job's input fingerprint
+(data version, parameters, options), so a rerun skips jobs whose inputs
+have not changed and whose files are still there.
+
+    DASHBOARD_DATA_DIR=/data python report.py --out reports --hubs 50 --workers 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import charts
+from data_loader import AIRPORTS_CSV, FLIGHTS_CSV, GENDERPAY_CSV, HAVE_ARROW, STUDENTS_CSV, data_version
+from data_loader import load_airports
+from executor import run_tasks
+from flights import state_distance_stats, state_flight_counts
+from paygap import DIMENSION_LABELS, GROUP_COLS, load_genderpay_totals, pay_gap_tables
+from paygap_stats import pay_gap_analysis
+from render_cache import render_figure
+from route_index import route_index
+from term_kpis import load_term_kpis
+
+try:
+    import kaleido  # noqa: F401
+    HAVE_KALEIDO = True
+except ImportError:
+    HAVE_KALEIDO = False
+
+# Bump when the layout or content of the outputs changes
+REPORT_FORMAT = 3
+MANIFEST = 'manifest.json'
+TABS = ('airports', 'university', 'paygap')
+
+# ``key`` is the job's output directory; ``build()`` returns (figures, tables)
+Job = namedtuple('Job', 'key fingerprint build')
+
+
+def _slug(value):
+    if value is None:
+        return 'all'
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(value)).strip('_') or 'all'
+
+
+def _fingerprint(*parts):
+    return hashlib.sha1(json.dumps([REPORT_FORMAT, *parts], default=str).encode()).hexdigest()[:16]
+
+
+def _atomic(path, write):
+    """Write through a temporary file, so readers never see half a file."""
+    tmp = path.with_name(path.name + '.tmp')
+    write(tmp)
+    os.replace(tmp, path)
+    return path
+
+
+# --- Job grids ---------------------------------------------------------------
+
+def airports_jobs(hubs=None, budget=None):
+    """One job per hub: ``hubs`` is a list of codes, a count (busiest first) or None for all.
+
+    A list of codes is taken as given, without building the route index; a
+    code with no routes fails its job.
+    """
+    version = data_version(FLIGHTS_CSV, AIRPORTS_CSV)
+    if hubs is None or isinstance(hubs, int):
+        destinations = route_index(load_airports()).destinations()
+        hubs = destinations if hubs is None else destinations[:hubs]
+
+    def build(hub):
+        routes = route_index(load_airports())
+        if hub not in routes.offsets:
+            raise KeyError(f'no routes into {hub}')
+        info = routes.hub_info(hub)
+        hub_routes = routes.hub_routes(hub)
+        state_counts = state_flight_counts(hub_routes)
+        combined = charts.flights_per_capita(hub_routes, state_counts)
+        distances = state_distance_stats(hub_routes)
+        figures = {
+            'route_map': charts.route_map(hub_routes, hub, info['AIRPORT'], info['LONGITUDE'], info['LATITUDE'],
+                                          budget=budget),
+            'state_flights_bar': charts.state_flights_bar(state_counts, hub, info['AIRPORT'], budget=budget),
+            'city_population_bar': charts.city_population_bar(hub_routes, budget=budget),
+            'per_capita_bar': charts.per_capita_bar(combined, hub),
+            'per_capita_choropleth': charts.per_capita_choropleth(combined, hub),
+            'distance_histogram': charts.distance_histogram(hub_routes, hub, budget=budget),
+            'state_distance_bar': charts.state_distance_bar(distances, hub),
+        }
+        tables = {'hub_routes': hub_routes, 'state_counts': state_counts, 'per_capita': combined,
+                  'state_distances': distances}
+        return figures, tables
+
+    return [Job(f'airports/{_slug(hub)}', _fingerprint(version, hub, budget), lambda hub=hub: build(hub))
+            for hub in hubs]
+
+
+def university_jobs(year_window=3):
+    """One job per institution (plus all institutions) and window of ``year_window`` years.
+
+    Each institution also gets a job over all of its years.
+    """
+    kpis = load_term_kpis()
+    version = data_version(STUDENTS_CSV)
+    institutions = [None] + (kpis.institutions if len(kpis.institutions) > 1 else [])
+
+    def build(institution, years):
+        frame = kpis.terms(institution, years)
+        changes = kpis.yearly_changes(institution, years)
+        comparison = kpis.term_comparison('Enrolled', institution, years)
+        correlations = kpis.lag_correlation(institution, years)
+        figures = {
+            'admissions_area': charts.admissions_area(frame),
+            'departments_area': charts.departments_area(frame),
+            'growth_satisfaction': charts.growth_satisfaction_chart(changes),
+            'rates_chart': charts.rates_chart(frame, kpis.rolling(institution, years)),
+            'term_comparison': charts.term_comparison_chart(comparison, 'Enrolled'),
+            'lag_correlation': charts.lag_correlation_chart(correlations),
+        }
+        tables = {'term_frame': frame, 'yearly_changes': changes, 'term_changes': kpis.changes(institution, years),
+                  'spring_vs_fall': comparison, 'lag_correlation': correlations}
+        return figures, tables
+
+    jobs = []
+    for institution in institutions:
+        years = kpis.years(institution)
+        windows = [years] + [years[i:i + year_window] for i in range(len(years) - year_window + 1)
+                             if year_window < len(years)]
+        for window in windows:
+            key = f'university/{_slug(institution)}/{window[0]}-{window[-1]}'
+            jobs.append(Job(key, _fingerprint(version, institution, window),
+                            lambda institution=institution, window=window: build(institution, window)))
+    return jobs
+
+
+def paygap_jobs():
+    """An overview job (earnings chart, summary, all ratios) plus one per dimension."""
+    version = data_version(GENDERPAY_CSV)
+
+    def overview():
+        genderpay = load_genderpay_totals()
+        final_df, summary = pay_gap_tables(genderpay, version=version)
+        totals = genderpay.groupby('Gender', observed=True)['TotalPay'].sum()
+        return ({'ugly_earnings': charts.ugly_earnings_figure(totals)},
+                {'pay_gap_summary': summary, 'pay_ratios': final_df})
+
+    def dimension(name):
+        genderpay = load_genderpay_totals()
+        final_df, _ = pay_gap_tables(genderpay, version=version)
+        analysis = pay_gap_analysis(genderpay, version=version)
+        stats = analysis[analysis['Dimension'] == name]
+        return ({'pay_gap_intervals': charts.pay_gap_intervals(stats, name)},
+                {'pay_ratios': final_df[final_df['Dimension'] == name], 'pay_gap_intervals': stats})
+
+    jobs = [Job('paygap/overview', _fingerprint(version), overview)]
+    jobs += [Job(f'paygap/{_slug(name)}', _fingerprint(version, name), lambda name=name: dimension(name))
+             for name in sorted(DIMENSION_LABELS[col] for col in GROUP_COLS)]
+    return jobs
+
+
+# --- Writing -----------------------------------------------------------------
+
+def write_figure(fig, stem, formats=('html',)):
+    """Write one figure; Plotly figures as HTML and/or PNG, Matplotlib as PNG."""
+    if hasattr(fig, 'savefig'):
+        data = render_figure(fig)
+        return [_atomic(stem.with_suffix('.png'), lambda tmp: tmp.write_bytes(data))]
+    written = []
+    if 'html' in formats:
+        written.append(_atomic(stem.with_suffix('.html'),
+                               lambda tmp: fig.write_html(tmp, include_plotlyjs='cdn', full_html=True)))
+    if 'png' in formats:
+        written.append(_atomic(stem.with_suffix('.png'), lambda tmp: fig.write_image(tmp, format='png')))
+    return written
+
+
+def write_table(df, stem, table_format='parquet'):
+    if table_format == 'parquet' and HAVE_ARROW:
+        # Parquet wants one type per column: mixed labels (pay-gap categories) become text
+        mixed = [col for col in df.columns if df[col].dtype == object and df[col].map(type).nunique() > 1]
+        df = df.astype({col: str for col in mixed})
+        return _atomic(stem.with_suffix('.parquet'), lambda tmp: df.to_parquet(tmp, index=False))
+    return _atomic(stem.with_suffix('.csv'), lambda tmp: df.to_csv(tmp, index=False))
+
+
+def run_job(job, out, formats, table_format):
+    """Build one job's outputs and write them; returns the written paths (relative to ``out``)."""
+    figures, tables = job.build()
+    directory = out / job.key
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, fig in figures.items():
+        written += write_figure(fig, directory / name, formats)
+    for name, df in tables.items():
+        written.append(write_table(df, directory / name, table_format))
+    return [str(path.relative_to(out)) for path in written]
+
+
+def _read_manifest(out):
+    try:
+        return json.loads((out / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def generate(out, tabs=TABS, hubs=None, year_window=3, budget=None, formats=('html',),
+             table_format='parquet', workers=None, force=False):
+    """Build every job for ``tabs`` whose inputs changed; returns a summary dict."""
+    if 'png' in formats and not HAVE_KALEIDO:
+        raise ValueError("PNG figures need the kaleido package (pip install kaleido)")
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    grids = {'airports': lambda: airports_jobs(hubs, budget), 'university': lambda: university_jobs(year_window),
+             'paygap': paygap_jobs}
+    jobs = [job for tab in tabs for job in grids[tab]()]
+
+    # Options that change the files are part of every fingerprint
+    options = [sorted(formats), table_format, HAVE_KALEIDO, HAVE_ARROW]
+    manifest = _read_manifest(out)
+    pending, skipped = {}, 0
+    for job in jobs:
+        fingerprint = _fingerprint(job.fingerprint, options)
+        entry = manifest.get(job.key)
+        if not force and entry and entry['fingerprint'] == fingerprint and \
+                all((out / path).exists() for path in entry['files']):
+            skipped += 1
+            continue
+        pending[job.key] = (job, fingerprint)
+
+    def task(job):
+        try:
+            return run_job(job, out, formats, table_format), None
+        except Exception as exc:
+            return None, repr(exc)
+
+    results, report = run_tasks({key: (lambda job=job: task(job)) for key, (job, _) in pending.items()},
+                                kind='thread', workers=workers)
+    failed = {}
+    for key, (files, error) in results.items():
+        if error is not None:
+            failed[key] = error
+            manifest.pop(key, None)
+        else:
+            manifest[key] = {'fingerprint': pending[key][1], 'files': files}
+    _atomic(out / MANIFEST, lambda tmp: tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True)))
+
+    return {'jobs': len(jobs), 'written': len(results) - len(failed), 'skipped': skipped, 'failed': failed,
+            'wall_s': round(time.perf_counter() - start, 2), 'executor': {k: report[k] for k in
+                                                                          ('mode', 'workers', 'wall_ms')}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default='reports', help='output directory')
+    parser.add_argument('--tabs', nargs='+', default=list(TABS), choices=TABS)
+    parser.add_argument('--hubs', nargs='+', help='hub codes, or one number for the busiest N (default: all)')
+    parser.add_argument('--year-window', type=int, default=3, help='years per university window')
+    parser.add_argument('--budget', type=int, help='point budget for dense charts (default: full detail)')
+    parser.add_argument('--formats', nargs='+', default=['html'], choices=['html', 'png'],
+                        help='Plotly figure formats (png needs the optional kaleido package)')
+    parser.add_argument('--tables', default='parquet', choices=['parquet', 'csv'])
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--force', action='store_true', help='rebuild even if inputs are unchanged')
+    args = parser.parse_args()
+    if 'png' in args.formats and not HAVE_KALEIDO:
+        parser.error("--formats png needs the kaleido package (pip install kaleido)")
+
+    hubs = args.hubs
+    if hubs and len(hubs) == 1 and hubs[0].isdigit():
+        hubs = int(hubs[0])
+    summary = generate(args.out, args.tabs, hubs, args.year_window, args.budget, tuple(args.formats),
+                       args.tables, args.workers, args.force)
+    print(json.dumps(summary, indent=1))
+
+
+if __name__ == '__main__':
+    main()
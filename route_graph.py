@@ -0,0 +1,172 @@
+"""Whole-network metrics over the route graph.
+
+Every airport that appears in the flight log or in airports.csv is a node,
+numbered by its code in the shared ``schema.IATA`` code table.  The routes from the
+route index become a compact CSR adjacency: ``indptr``/``indices``/``weights``
+arrays over origins (outbound edges) and the same over destinations
+(inbound edges), with the number of flight rows as edge weight.
+
+``network_metrics`` computes, for all airports at once: in/out degree,
+weighted inbound/outbound flow, a flow-weighted PageRank hub score and the
+number of airports reachable within 1..``MAX_HOPS`` flights.  Reachability
+is a bit-parallel BFS: each airport's reached set is a packed bitset, and a
+hop ORs together the bitsets of its out-neighbours, one
+``np.bitwise_or.reduceat`` over the CSR arrays per hop.
+
+Metrics are computed once per route index and shared by all sessions
+through ``route_graph``.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from schema import IATA
+
+MAX_HOPS = 3
+DAMPING = 0.85
+PAGERANK_TOL = 1e-10
+PAGERANK_MAX_ITER = 200
+# Edges gathered per reachability step, bounding its scratch memory
+EDGE_BLOCK = 1 << 16
+
+_graph = {}
+_graph_lock = threading.Lock()
+
+
+def _popcount(bits):
+    """Set bits per row of a packed (rows, words) uint64 bitset."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(bits.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+
+def _csr(rows, cols, weights, n):
+    """CSR arrays for edges ``rows -> cols`` over ``n`` nodes."""
+    order = np.lexsort((cols, rows))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32), weights[order]
+
+
+class RouteGraph:
+    """CSR route graph keyed by IATA code."""
+
+    def __init__(self, routes, airports):
+        src = IATA.encode(routes['Origin_airport']).cat.codes.to_numpy()
+        dst = IATA.encode(routes['Destination_airport']).cat.codes.to_numpy()
+        # Encoded last, so its categories cover every code used above
+        self.codes = pd.Index(IATA.encode(airports['IATA']).cat.categories, dtype=object)
+        self.n = len(self.codes)
+
+        weights = routes['Flight_Count'].to_numpy(dtype=np.float64)
+        # Self-loops add nothing to connectivity; unknown codes are dropped
+        keep = (src != dst) & (src >= 0) & (dst >= 0)
+        src, dst, weights = src[keep], dst[keep], weights[keep]
+
+        self.out_indptr, self.out_indices, self.out_weights = _csr(src, dst, weights, self.n)
+        self.in_indptr, self.in_indices, self.in_weights = _csr(dst, src, weights, self.n)
+
+    def index(self, code):
+        """Node number of an IATA code (-1 if unknown)."""
+        return int(self.codes.get_indexer([code])[0])
+
+    def out_degree(self):
+        return np.diff(self.out_indptr)
+
+    def in_degree(self):
+        return np.diff(self.in_indptr)
+
+    def out_flow(self):
+        return np.bincount(np.repeat(np.arange(self.n), self.out_degree()), self.out_weights, minlength=self.n)
+
+    def in_flow(self):
+        return np.bincount(np.repeat(np.arange(self.n), self.in_degree()), self.in_weights, minlength=self.n)
+
+    def pagerank(self, damping=DAMPING, tol=PAGERANK_TOL, max_iter=PAGERANK_MAX_ITER):
+        """Flow-weighted PageRank; airports with no outbound routes spread evenly."""
+        n = self.n
+        if n == 0:
+            return np.zeros(0)
+        out_flow = self.out_flow()
+        src = np.repeat(np.arange(n), self.out_degree())
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share = self.out_weights / out_flow[src]
+        dangling = out_flow == 0
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = np.bincount(self.out_indices, rank[src] * share, minlength=n)
+            new = (1 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+            if np.abs(new - rank).sum() < tol:
+                return new
+            rank = new
+        return rank
+
+    def reachability(self, max_hops=MAX_HOPS):
+        """(n, max_hops) counts of other airports reachable within 1..max_hops flights."""
+        n = self.n
+        counts = np.zeros((n, max_hops), dtype=np.int32)
+        if n == 0:
+            return counts
+        words = (n + 63) // 64
+        has_out = self.out_indptr[:-1] < self.out_indptr[1:]
+        n_edges = len(self.out_indices)
+        cuts = np.searchsorted(self.out_indptr, np.arange(EDGE_BLOCK, n_edges, EDGE_BLOCK), side='right') - 1
+        row_bounds = np.unique(np.concatenate([[0], cuts, [n]]))
+
+        # reached[v] = bitset of airports within h hops of v
+        src = np.repeat(np.arange(n), self.out_degree())
+        dst = self.out_indices.astype(np.int64)
+        reached = np.zeros((n, words), dtype=np.uint64)
+        np.bitwise_or.at(reached, (src, dst // 64), np.left_shift(np.uint64(1), (dst % 64).astype(np.uint64)))
+        nodes = np.arange(n)
+        not_self = np.full((n, words), np.iinfo(np.uint64).max, dtype=np.uint64)
+        not_self[nodes, nodes // 64] ^= np.left_shift(np.uint64(1), (nodes % 64).astype(np.uint64))
+
+        for hop in range(max_hops):
+            if hop:
+                grown = reached.copy()
+                for r0, r1 in zip(row_bounds[:-1], row_bounds[1:]):
+                    rows = has_out[r0:r1]
+                    if not rows.any():
+                        continue
+                    e0, e1 = self.out_indptr[r0], self.out_indptr[r1]
+                    starts = self.out_indptr[r0:r1][rows] - e0
+                    grown[r0:r1][rows] |= np.bitwise_or.reduceat(reached[self.out_indices[e0:e1]], starts, axis=0)
+                reached = grown
+            counts[:, hop] = _popcount(reached & not_self)
+        return counts
+
+
+def network_metrics(graph, airports, max_hops=MAX_HOPS):
+    """One row per airport with degree, flow, hub score and k-hop reach."""
+    names = airports.drop_duplicates('IATA').astype({'IATA': object}).set_index('IATA')['AIRPORT']
+    rank = graph.pagerank()
+    metrics = pd.DataFrame({
+        'IATA': graph.codes,
+        'Airport': names.reindex(graph.codes).to_numpy(),
+        'Origins': graph.in_degree(),
+        'Destinations': graph.out_degree(),
+        'Inbound_flights': graph.in_flow().astype(np.int64),
+        'Outbound_flights': graph.out_flow().astype(np.int64),
+        'PageRank': rank,
+    })
+    metrics['Hub_rank'] = metrics['PageRank'].rank(ascending=False, method='min').astype(np.int32)
+    reach = graph.reachability(max_hops)
+    for hop in range(max_hops):
+        metrics[f'Reach_{hop + 1}'] = reach[:, hop]
+    return metrics.set_index('IATA')
+
+
+def route_graph(routes):
+    """Process-wide (RouteGraph, metrics) for a RouteIndex, computed once per index."""
+    with _graph_lock:
+        cached = _graph.get(id(routes))
+        if cached is not None and cached[0] is routes:
+            return cached[1:]
+        graph = RouteGraph(routes.routes, routes.lookup.frame)
+        metrics = network_metrics(graph, routes.lookup.frame)
+        _graph.clear()
+        _graph[id(routes)] = (routes, graph, metrics)
+        return graph, metrics
@@ -0,0 +1,245 @@
+"""Precomputed destination -> origin route index for the hub selector.
+
+The flight log is scanned once (in chunks) and folded into one row per
+(destination, origin) route holding the number of flight rows, the origin
+population, the position of the route's first row in the file and, when
+the log has them, summed Passengers/Seats/Flights capacity columns.  Each
+route also gets its great-circle length from airports.csv.  Routes
+are stored sorted by destination, with a ``destination -> (start, stop)``
+offset table, so selecting a hub is a slice of that hub's routes instead of
+a filter and merge over the whole flight table.
+
+The route table is persisted in ``.data_cache/`` together with the number of
+bytes and rows it covers, in one file (Parquet schema metadata, or a
+pickled pair without pyarrow) replaced in one step, so the table never
+disagrees with what it says it covers.  When rows are appended to the
+flight log only the new bytes are read and folded into the existing
+counts; other changes (detected from the file size, mtime and the bytes at
+either end of the indexed part) trigger a full rebuild.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+from airport_lookup import airport_lookup
+from data_loader import CACHE_DIR, DTYPES, FLIGHTS_CSV, HAVE_ARROW, data_path
+from flights import CHUNKSIZE, FLIGHT_COLUMNS, enrich_origins
+from geo import haversine
+from schema import IATA, apply_schema, materialize, read_dtypes
+
+ROUTE_KEYS = ['Destination_airport', 'Origin_airport']
+# Summed per route when present in the flight log
+CAPACITY_COLUMNS = ['Passengers', 'Seats', 'Flights']
+# Bumped whenever the persisted route table changes shape
+INDEX_FORMAT = 3
+# Parquet schema metadata key holding the meta dict
+META_KEY = b'route_index'
+
+_EDGE_BYTES = 1 << 16
+
+_index = {}
+_index_lock = threading.Lock()
+
+
+def _index_path():
+    return CACHE_DIR / f"route_index.{'parquet' if HAVE_ARROW else 'pkl'}"
+
+
+def _edge_digest(path, size):
+    """Hash of the first and last bytes before ``size``, used to detect appends."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        digest.update(fh.read(min(size, _EDGE_BYTES)))
+        fh.seek(max(size - _EDGE_BYTES, 0))
+        digest.update(fh.read(min(size, _EDGE_BYTES)))
+    return digest.hexdigest()
+
+
+def _fold_chunks(chunks, capacity=(), first_row=0):
+    """Reduce flight-row chunks to one row per route."""
+    parts = []
+    for chunk in chunks:
+        # Airport codes become IATA table codes, so grouping compares integers
+        chunk = apply_schema(chunk.assign(First_row=pd.RangeIndex(first_row, first_row + len(chunk))))
+        first_row += len(chunk)
+        parts.append(chunk.groupby(ROUTE_KEYS, sort=False, observed=True).agg(
+            Flight_Count=('First_row', 'size'),
+            Origin_population=('Origin_population', 'first'),
+            First_row=('First_row', 'min'),
+            **{col: (col, 'sum') for col in capacity},
+        ).reset_index())
+    return parts, first_row
+
+
+def _combine(parts, capacity=()):
+    if not parts:
+        return pd.DataFrame(columns=ROUTE_KEYS + ['Flight_Count', 'Origin_population', 'First_row'] + list(capacity))
+    # Parts were encoded as the code table grew; give them all its final categories
+    dtype = IATA.dtype()
+    parts = [part.astype({key: dtype for key in ROUTE_KEYS}) for part in parts]
+    # Parts are in file order, so 'first' keeps the earliest population value
+    routes = pd.concat(parts, ignore_index=True).groupby(ROUTE_KEYS, sort=False, observed=True).agg(
+        Flight_Count=('Flight_Count', 'sum'),
+        Origin_population=('Origin_population', 'first'),
+        First_row=('First_row', 'min'),
+        **{col: (col, 'sum') for col in capacity},
+    ).reset_index()
+    return routes.sort_values(['Destination_airport', 'First_row'], kind='stable', ignore_index=True)
+
+
+def build_routes(path, chunksize=CHUNKSIZE):
+    """Scan the whole flight log and return (routes, meta)."""
+    stat = os.stat(path)
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    capacity = [col for col in CAPACITY_COLUMNS if col in header]
+    reader = pd.read_csv(path, dtype=read_dtypes(DTYPES[FLIGHTS_CSV]), usecols=FLIGHT_COLUMNS + capacity,
+                         chunksize=chunksize)
+    parts, rows = _fold_chunks(reader, capacity)
+    meta = {'format': INDEX_FORMAT, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'rows': rows,
+            'edges': _edge_digest(path, stat.st_size), 'columns': header, 'capacity': capacity}
+    return _combine(parts, capacity), meta
+
+
+def update_routes(path, routes, meta, chunksize=CHUNKSIZE):
+    """Fold rows appended since ``meta`` was written into ``routes``.
+
+    Returns None when the file was changed in some other way than appending,
+    in which case the caller should rebuild from scratch.
+    """
+    stat = os.stat(path)
+    if stat.st_size == meta['size'] and stat.st_mtime_ns == meta['mtime_ns']:
+        return routes, meta
+    # Anything but a pure append (same leading bytes, more of them) is a rebuild
+    if stat.st_size <= meta['size'] or _edge_digest(path, meta['size']) != meta['edges']:
+        return None
+
+    with open(path, 'rb') as fh:
+        fh.seek(meta['size'])
+        reader = pd.read_csv(fh, header=None, names=meta['columns'], usecols=FLIGHT_COLUMNS + meta['capacity'],
+                             dtype=read_dtypes(DTYPES[FLIGHTS_CSV]), chunksize=chunksize)
+        parts, rows = _fold_chunks(reader, meta['capacity'], first_row=meta['rows'])
+    meta = dict(meta, size=stat.st_size, mtime_ns=stat.st_mtime_ns, rows=rows,
+                edges=_edge_digest(path, stat.st_size))
+    return _combine([routes] + parts, meta['capacity']), meta
+
+
+def _read_persisted():
+    path = _index_path()
+    if not path.exists():
+        return None
+    try:
+        if HAVE_ARROW:
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(path)
+            meta = json.loads(table.schema.metadata[META_KEY])
+            routes = table.to_pandas()
+        else:
+            routes, meta = pd.read_pickle(path)
+    except Exception:
+        # Unreadable, or written without its meta: rebuild
+        return None
+    return apply_schema(routes), meta
+
+
+def _persist(routes, meta):
+    """Write the table and its meta as one file, replaced in one step."""
+    path = _index_path()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Per writer, so replicas sharing the cache directory never interleave
+    tmp = path.with_suffix(f'.{os.getpid()}-{threading.get_ident()}.tmp')
+    try:
+        if HAVE_ARROW:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(routes, preserve_index=False)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                                   META_KEY: json.dumps(meta).encode()})
+            pq.write_table(table, tmp)
+        else:
+            pd.to_pickle((routes, meta), tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _try_persist(routes, meta):
+    # A read-only cache directory only costs us the next cold start
+    try:
+        _persist(routes, meta)
+    except OSError:
+        pass
+
+
+def load_routes(path=None):
+    """Route table for the flight log, reusing or extending the persisted one."""
+    path = path or data_path(FLIGHTS_CSV)
+    persisted = _read_persisted()
+    if (persisted is not None and persisted[1].get('format') == INDEX_FORMAT
+            and persisted[1].get('source') == os.path.abspath(path)):
+        updated = update_routes(path, *persisted)
+        if updated is not None:
+            if updated[1] is not persisted[1]:
+                _try_persist(*updated)
+            return updated
+    routes, meta = build_routes(path)
+    meta['source'] = os.path.abspath(path)
+    _try_persist(routes, meta)
+    return routes, meta
+
+
+class RouteIndex:
+    """Enriched routes sorted by destination, with per-destination offsets."""
+
+    def __init__(self, routes, airports):
+        self.lookup = airport_lookup(airports)
+        self.routes = enrich_origins(routes, airports)
+        # Great-circle length of every route, computed once per airport pair
+        hubs = self.lookup.take(self.routes['Destination_airport'], ['LONGITUDE', 'LATITUDE'])
+        self.routes['Distance_miles'] = haversine(
+            self.routes['Origin_longitude'], self.routes['Origin_latitude'],
+            hubs['LONGITUDE'].to_numpy(), hubs['LATITUDE'].to_numpy())
+        dest = self.routes['Destination_airport'].array
+        # Routes are sorted by destination, so each hub is one contiguous block
+        starts = pd.Series(range(len(dest))).groupby(dest, sort=False, observed=True).agg(['min', 'max'])
+        self.offsets = {d: (lo, hi + 1) for d, lo, hi in starts.itertuples()}
+        self.totals = self.routes.groupby('Destination_airport', observed=True)['Flight_Count'].sum()
+        # Selector label of every hub, so the selectbox does not look up each option per rerun
+        hubs = self.destinations()
+        names = self.lookup.take(hubs, ['AIRPORT'])['AIRPORT']
+        self.hub_labels = {code: f"{code} – {name}" for code, name in zip(hubs, names)}
+
+    def destinations(self):
+        """Destinations that have routes and a known location, busiest first."""
+        known = self.totals[self.lookup.contains(self.totals.index)]
+        # Ties in alphabetical order, whatever the code table's order
+        known.index = known.index.astype(object)
+        return known.sort_index().sort_values(ascending=False, kind='stable').index.tolist()
+
+    def hub_routes(self, destination):
+        """One row per origin flying into ``destination`` (with Flight_Count)."""
+        lo, hi = self.offsets.get(destination, (0, 0))
+        # Only these rows get rendered, so only they get string labels back
+        return materialize(self.routes.iloc[lo:hi].reset_index(drop=True))
+
+    def hub_info(self, destination):
+        """Airport metadata row (name, city, coordinates...) for a hub."""
+        return self.lookup.info(destination)
+
+
+def route_index(airports):
+    """Process-wide RouteIndex, refreshed when the flight log changes."""
+    path = data_path(FLIGHTS_CSV)
+    stat = os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns, id(airports))
+    with _index_lock:
+        if key not in _index:
+            routes, _ = load_routes(path)
+            _index.clear()
+            _index[key] = RouteIndex(routes, airports)
+        return _index[key]
@@ -0,0 +1,69 @@
+"""Batched Scattergeo traces for the route maps.
+
+Instead of one trace per route, routes are grouped by colour (origin state)
+and each group becomes a single ``lines`` trace whose coordinates are the
+routes' points separated by NaN, which Plotly draws as breaks in the line.
+Trace count is then bounded by the number of colours, not routes.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from geo import great_circle_path
+
+DEFAULT_COLOR = 'rgba(128,128,128,0.5)'
+
+
+def route_coordinates(routes, hub_lon, hub_lat, n_points=2):
+    """(routes, n_points) lon/lat arrays from each origin to the hub.
+
+    With ``n_points`` > 2 the paths follow the great circle; otherwise they
+    are straight origin -> hub segments.
+    """
+    lon = routes['Origin_longitude'].to_numpy(dtype=float)
+    lat = routes['Origin_latitude'].to_numpy(dtype=float)
+    if n_points > 2:
+        return great_circle_path(lon, lat, hub_lon, hub_lat, n_points)
+    return (np.column_stack([lon, np.full_like(lon, hub_lon)]),
+            np.column_stack([lat, np.full_like(lat, hub_lat)]))
+
+
+def _nan_separated(values):
+    """Flatten (routes, points) to one array with a NaN after every route."""
+    gap = np.full((len(values), 1), np.nan)
+    return np.hstack([values, gap]).ravel()
+
+
+def route_path_traces(routes, hub_lon, hub_lat, color_map=None, group_col='Origin_state',
+                      great_circle=False, n_points=16):
+    """One NaN-separated Scattergeo trace per ``group_col`` value.
+
+    ``color_map`` maps group values to line colours; with ``group_col=None``
+    every route goes into a single trace.  Hover text shows the origin
+    airport, city and state, as the per-route traces did.
+    """
+    lons, lats = route_coordinates(routes, hub_lon, hub_lat, n_points if great_circle else 2)
+    per_route = lons.shape[1] + 1
+    hover = (routes['Origin_airport_name'].astype(str) + " (" + routes['Origin_city'].astype(str)
+             + ", " + routes['Origin_state'].astype(str) + ")").to_numpy(dtype=object)
+
+    if group_col is None:
+        groups = {None: np.arange(len(routes))}
+    else:
+        groups = routes.groupby(group_col, sort=False, dropna=False).indices
+
+    color_map = color_map or {}
+    traces = []
+    for name, idx in groups.items():
+        color = color_map.get(name, DEFAULT_COLOR) if name == name else DEFAULT_COLOR
+        traces.append(go.Scattergeo(
+            locationmode='USA-states',
+            lon=_nan_separated(lons[idx]),
+            lat=_nan_separated(lats[idx]),
+            mode='lines',
+            line=dict(width=1, color=color),
+            hoverinfo='text',
+            text=np.repeat(hover[idx], per_route),
+            name=str(name) if name is not None else 'Routes'
+        ))
+    return traces
@@ -0,0 +1,111 @@
+"""Categorical schema for the dashboard's dimension columns.
+
+Low-cardinality text columns (airport codes, states, cities, terms, job
+titles...) are held as pandas categoricals: one small table of distinct
+values plus an integer code per row, instead of one Python string object per
+row.  Parquet sidecars store them dictionary-encoded, so the encoding
+survives a restart.
+
+Airport codes share a single process-wide ``CodeTable``, ``IATA``, used by
+the flight log's origin/destination columns and by airports.csv alike.  The
+table is append-only, so a code, once assigned, means the same airport in
+every column encoded through it, and doubles as a dense node number for
+the route graph.  A column's categories, though, are the table as it was
+when that column was encoded: a prefix of the current table, not all of
+it.  Re-cast to ``IATA.dtype()`` before comparing, concatenating or merging
+columns encoded at different times (``route_index._combine`` does), or
+bound-check codes against the table size the other side was built with
+(``AirportLookup.positions`` does).
+
+Labels are only turned back into strings for the rows that are actually
+rendered (see ``materialize``).
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class CodeTable:
+    """Append-only dictionary of values to integer codes, shared by several columns.
+
+    New values are only ever appended, so the codes of a categorical
+    encoded against an earlier state of the table stay valid.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._values = pd.Index([], dtype=object)
+        self._lock = threading.Lock()
+
+    @property
+    def values(self):
+        return self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    def dtype(self):
+        return pd.CategoricalDtype(self._values)
+
+    def encode(self, column):
+        """``column`` (strings or a categorical) as a categorical over this table."""
+        column = pd.Series(column)
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype('category')
+        categories = pd.Index(column.cat.categories, dtype=object)
+        with self._lock:
+            new = categories.difference(self._values, sort=False)
+            if len(new):
+                self._values = self._values.append(new.sort_values())
+            values = self._values
+        # Distinct values are few, so recoding is one small lookup plus a take
+        mapping = np.append(values.get_indexer(categories), -1).astype(np.int32)
+        codes = mapping[column.cat.codes.to_numpy()]
+        return pd.Series(pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(values)),
+                         index=column.index, name=column.name)
+
+
+IATA = CodeTable('IATA')
+
+# Columns encoded against a shared code table
+SHARED_COLUMNS = {
+    'IATA': IATA,
+    'Origin_airport': IATA,
+    'Destination_airport': IATA,
+}
+
+# Other dimension columns, each with its own categories
+CATEGORICAL_COLUMNS = {
+    'Origin_city', 'Destination_city', 'CITY', 'STATE', 'COUNTRY',
+    'Term', 'JobTitle', 'Gender', 'Education', 'Dept',
+}
+
+
+def read_dtypes(dtypes):
+    """read_csv dtypes with every dimension column parsed straight to a categorical."""
+    return {col: 'category' if col in SHARED_COLUMNS or col in CATEGORICAL_COLUMNS else dtype
+            for col, dtype in (dtypes or {}).items()}
+
+
+def apply_schema(df):
+    """Encode ``df``'s dimension columns (in place) and return it."""
+    for col in df.columns:
+        if col in SHARED_COLUMNS:
+            df[col] = SHARED_COLUMNS[col].encode(df[col])
+        elif col in CATEGORICAL_COLUMNS and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def materialize(df):
+    """Copy of ``df`` with categorical columns turned back into plain labels.
+
+    Meant for the handful of rows that get rendered: string concatenation
+    and plotting then behave exactly as on the uncategorized data.
+    """
+    categorical = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    if not categorical:
+        return df
+    return df.assign(**{col: df[col].astype(object) for col in categorical})
@@ -0,0 +1,89 @@
+"""Process-wide, read-only store for the objects every session shares.
+
+Derived data (frames with computed columns, the university cube, pay-gap
+tables...) is built once per data version and handed to every Streamlit
+session by reference, so memory does not grow with the number of users;
+per-session state is left with filter selections and small slices.
+
+Values are keyed by ``(name, version)``; building a newer version of a name
+drops the older one.  Concurrent sessions asking for the same missing value
+wait for a single build.  pandas copy-on-write means slices and ``assign``
+results taken from a shared frame never write back into it; treat the
+shared objects themselves as immutable.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def nbytes(value):
+    """Approximate memory held by a stored value (frames, arrays, containers, plain objects)."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(nbytes(v) for v in value.values())
+    if hasattr(value, '__dict__'):
+        return sum(nbytes(v) for v in vars(value).values())
+    return 0
+
+
+class SharedStore:
+    def __init__(self):
+        self._values = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def _name_lock(self, name):
+        with self._guard:
+            return self._locks.setdefault(name, threading.Lock())
+
+    def _count(self, counter):
+        # Every session thread updates these; ``+=`` on an attribute is not atomic
+        with self._guard:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, name, version, build):
+        """The value stored for ``(name, version)``, calling ``build()`` once if missing."""
+        entry = self._values.get(name)
+        if entry is not None and entry[0] == version:
+            self._count('hits')
+            return entry[1]
+        with self._name_lock(name):
+            entry = self._values.get(name)
+            if entry is not None and entry[0] == version:
+                self._count('hits')
+                return entry[1]
+            value = build()
+            with self._guard:
+                self._values[name] = (version, value)
+                self.builds += 1
+            return value
+
+    def stats(self):
+        """Entries with their data version and size, plus hit/build counters."""
+        with self._guard:
+            values, hits, builds = list(self._values.items()), self.hits, self.builds
+        entries = {name: {'version': str(version), 'bytes': nbytes(value)} for name, (version, value) in values}
+        return {'entries': entries, 'bytes': sum(e['bytes'] for e in entries.values()),
+                'hits': hits, 'builds': builds}
+
+    def clear(self):
+        with self._guard:
+            self._values.clear()
+            self.hits = self.builds = 0
+
+
+shared_store = SharedStore()
+
+
+def shared(name, version, build):
+    return shared_store.get(name, version, build)
@@ -0,0 +1,316 @@
+"""Cold start: import timing, warm-up of the default views, time to first paint.
+
+A new dashboard process (e.g. a replica started by the autoscaler) pays for
+its imports, its data loading and its first figure builds before the first
+user sees anything.  This module keeps that off the first request:
+
+* Heavy, tab-specific modules are imported where they are used (Matplotlib
+  when tab 3 renders its image, ``plotly.express`` in the chart builders
+  that need it), through ``timeline.import_module`` so the cold import time
+  of each is recorded.
+* ``warm_up`` prepares every tab's data (``pipelines``) and builds the
+  figures of each tab's default view into the figure and image caches,
+  with the same parameters the tabs use, so the first session is served
+  from cache.  ``start_warm_up`` runs it in the background once per data
+  version, warming each tab whose input CSVs are present (a missing file
+  only skips the tabs that read it); the dashboard calls it on every run,
+  and ``python startup.py`` calls it before starting the Streamlit server,
+  so warming begins at boot rather than with the first session.
+* ``timeline`` records milestones in ms since the process started: the
+  dashboard's imports, the end of the warm-up, and the first paint (the
+  end of the first complete script run).  They are shown in the sidebar
+  and appended once per process to ``startup.jsonl`` in the profile
+  directory.
+
+Only the standard library is imported at the top, so the launcher starts
+the server without waiting for pandas or Plotly.
+
+    python startup.py                    # warm up in the background and serve testone.py
+    python startup.py -- --server.port 8080
+    python startup.py --warm-only        # warm the on-disk caches, print timings, exit
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+APP = Path(__file__).resolve().parent / 'testone.py'
+
+# Default view of each tab: what a new session sees before touching a widget
+DEFAULT_HUB = 'ORD'
+DEFAULT_TERM_METRIC = 'Enrolled'
+
+
+def _process_start():
+    """Wall-clock time this process started (from /proc, else now)."""
+    try:
+        with open('/proc/self/stat') as fh:
+            start_ticks = int(fh.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as fh:
+            uptime = float(fh.read().split()[0])
+        return time.time() - (uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return time.time()
+
+
+class StartupTimeline:
+    """Process-wide cold-start measurements; every value is recorded once, the first time."""
+
+    def __init__(self):
+        self.process_start = _process_start()
+        self.imports = {}
+        self.milestones = {}
+        self.logged = False
+        self._lock = threading.Lock()
+
+    def since_start_ms(self):
+        return (time.time() - self.process_start) * 1000
+
+    def mark(self, name, ms=None):
+        """Record ``name`` at ``ms`` (default: now, in ms since the process started)."""
+        with self._lock:
+            self.milestones.setdefault(name, round(self.since_start_ms() if ms is None else ms, 1))
+
+    @contextmanager
+    def timed_imports(self, name):
+        """Time the imports in the block; only the first (cold) run of it counts."""
+        start = time.perf_counter()
+        yield
+        with self._lock:
+            self.imports.setdefault(name, round((time.perf_counter() - start) * 1000, 1))
+
+    def import_module(self, module):
+        """``importlib.import_module``, recording how long a cold import took."""
+        if module in sys.modules:
+            return sys.modules[module]
+        with self.timed_imports(module):
+            return importlib.import_module(module)
+
+    def to_dict(self):
+        with self._lock:
+            return {'process_start': datetime.fromtimestamp(self.process_start, timezone.utc)
+                    .isoformat(timespec='milliseconds'),
+                    'imports_ms': dict(self.imports), 'milestones_ms': dict(self.milestones)}
+
+    def write_log(self, directory=None):
+        """Append this process's timeline to ``startup.jsonl``, once."""
+        from profiling import PROFILE_DIR, RELEASE
+
+        with self._lock:
+            if self.logged:
+                return
+            self.logged = True
+        directory = Path(directory or PROFILE_DIR)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(directory / 'startup.jsonl', 'a') as fh:
+                fh.write(json.dumps({'release': RELEASE, 'pid': os.getpid(), **self.to_dict(),
+                                     'warm_up': warm_up_report()}) + '\n')
+        except OSError:
+            pass
+
+
+timeline = StartupTimeline()
+
+
+def default_hub(hubs):
+    return DEFAULT_HUB if DEFAULT_HUB in hubs else hubs[0]
+
+
+def default_dimension(final_df):
+    return sorted(final_df['Dimension'].unique())[0]
+
+
+# --- Default views -----------------------------------------------------------
+# Same chart ids, data versions and parameters as the tabs' ``show_figure`` calls
+
+def warm_airports():
+    import charts
+    from data_loader import AIRPORTS_CSV, FLIGHTS_CSV, data_version, load_airports
+    from figure_cache import cached_figure
+    from flights import state_distance_stats, state_flight_counts
+    from lod import POINT_BUDGET as budget
+    from route_index import route_index
+
+    routes = route_index(load_airports())
+    version = data_version(FLIGHTS_CSV, AIRPORTS_CSV)
+    hubs = routes.destinations()
+    if not hubs:
+        return
+    hub = default_hub(hubs)
+    info = routes.hub_info(hub)
+    hub_routes = routes.hub_routes(hub)
+    state_counts = state_flight_counts(hub_routes)
+    combined = charts.flights_per_capita(hub_routes, state_counts)
+    distances = state_distance_stats(hub_routes)
+    views = [
+        ('route_map', (hub, False, budget), lambda: charts.route_map(
+            hub_routes, hub, info['AIRPORT'], info['LONGITUDE'], info['LATITUDE'], great_circle=False, budget=budget)),
+        ('state_flights_bar', (hub, budget),
+         lambda: charts.state_flights_bar(state_counts, hub, info['AIRPORT'], budget=budget)),
+        ('city_population_bar', (hub, budget), lambda: charts.city_population_bar(hub_routes, budget=budget)),
+        ('per_capita_bar', hub, lambda: charts.per_capita_bar(combined, hub)),
+        ('per_capita_choropleth', hub, lambda: charts.per_capita_choropleth(combined, hub)),
+        ('distance_histogram', (hub, budget), lambda: charts.distance_histogram(hub_routes, hub, budget=budget)),
+        ('state_distance_bar', hub, lambda: charts.state_distance_bar(distances, hub)),
+    ]
+    for chart_id, params, build in views:
+        cached_figure(chart_id, version, params, build)
+
+
+def warm_university():
+    import charts
+    from data_loader import STUDENTS_CSV, data_version
+    from figure_cache import cached_figure
+    from term_kpis import ROLLING_TERMS, load_term_kpis
+
+    kpis = load_term_kpis()
+    version = data_version(STUDENTS_CSV)
+    years = kpis.years()
+    filter_key = (None, tuple(years))
+    terms = kpis.terms(None, years)
+    changes = kpis.yearly_changes(None, years)
+    rolling = kpis.rolling(None, years, ROLLING_TERMS)
+    comparison = kpis.term_comparison(DEFAULT_TERM_METRIC, None, years)
+    correlations = kpis.lag_correlation(None, years)
+    views = [
+        ('admissions_area', filter_key, lambda: charts.admissions_area(terms)),
+        ('departments_area', filter_key, lambda: charts.departments_area(terms)),
+        ('growth_satisfaction', filter_key, lambda: charts.growth_satisfaction_chart(changes)),
+        ('rates_chart', filter_key, lambda: charts.rates_chart(terms, rolling, ROLLING_TERMS)),
+        ('term_comparison', filter_key + (DEFAULT_TERM_METRIC,),
+         lambda: charts.term_comparison_chart(comparison, DEFAULT_TERM_METRIC)),
+        ('lag_correlation', filter_key, lambda: charts.lag_correlation_chart(correlations)),
+    ]
+    for chart_id, params, build in views:
+        cached_figure(chart_id, version, params, build)
+
+
+def warm_paygap():
+    import charts
+    from data_loader import GENDERPAY_CSV, data_version
+    from figure_cache import cached_figure
+    from paygap import load_genderpay_totals, pay_gap_tables
+    from paygap_stats import pay_gap_analysis
+    from render_cache import cached_render
+
+    genderpay = load_genderpay_totals()
+    version = data_version(GENDERPAY_CSV)
+    totals = genderpay.groupby('Gender', observed=True)['TotalPay'].sum()
+    cached_render('ugly_earnings', version, lambda: charts.ugly_earnings_figure(totals))
+    final_df, _ = pay_gap_tables(genderpay, version=version)
+    dimension = default_dimension(final_df)
+    analysis = pay_gap_analysis(genderpay, version=version)
+    stats = analysis[analysis['Dimension'] == dimension]
+    cached_figure('pay_gap_intervals', version, dimension, lambda: charts.pay_gap_intervals(stats, dimension))
+
+
+WARM_UPS = {'airports': warm_airports, 'university': warm_university, 'paygap': warm_paygap}
+
+
+# --- Warm-up -----------------------------------------------------------------
+
+_warm_ups = {}
+_warm_lock = threading.Lock()
+
+
+def warm_up(workers=None, tabs=None):
+    """Prepare each tab's data and build its default figures, one task per tab.
+
+    ``tabs`` defaults to all of them.  Returns the executor report plus any
+    per-tab errors; a tab that fails here (e.g. a missing CSV) reports the
+    error itself when it renders.
+    """
+    from executor import run_tasks
+    from pipelines import PIPELINES
+
+    timeline.mark('warm_up_start')
+
+    def task(tab):
+        try:
+            PIPELINES[tab]()
+            WARM_UPS[tab]()
+        except Exception as exc:
+            return repr(exc)
+
+    results, report = run_tasks({tab: (lambda tab=tab: task(tab)) for tab in (tabs or WARM_UPS)},
+                                kind='thread', workers=workers)
+    timeline.mark('warm_up_done')
+    errors = {tab: error for tab, error in results.items() if error is not None}
+    return {**report, **({'errors': errors} if errors else {})}
+
+
+def _run_warm_up(version):
+    try:
+        report = warm_up(tabs=[tab for tab, _ in version])
+    except Exception as exc:
+        report = {'error': repr(exc)}
+    with _warm_lock:
+        # A newer version may have started meanwhile; do not put this one back
+        if version in _warm_ups:
+            _warm_ups[version] = report
+
+
+def start_warm_up():
+    """Start ``warm_up`` in the background, once per version of the tabs' inputs."""
+    from data_loader import data_version
+    from pipelines import PIPELINE_INPUTS
+
+    version = []
+    for tab, inputs in PIPELINE_INPUTS.items():
+        try:
+            version.append((tab, data_version(*inputs)))
+        except OSError:
+            # A missing CSV is reported by the tab that needs it; the others still warm up
+            continue
+    version = tuple(version)
+    if not version:
+        return
+    with _warm_lock:
+        if version in _warm_ups:
+            return
+        _warm_ups.clear()
+        _warm_ups[version] = None
+    threading.Thread(target=_run_warm_up, args=(version,), name='dashboard-warm-up', daemon=True).start()
+
+
+def warm_up_report():
+    """Executor report of the latest warm-up (None while it is running)."""
+    with _warm_lock:
+        return next(iter(_warm_ups.values()), None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--warm-only', action='store_true',
+                        help='warm up in the foreground, print the timings and exit')
+    parser.add_argument('streamlit_args', nargs=argparse.REMAINDER,
+                        help='passed on to "streamlit run" (after --)')
+    args = parser.parse_args()
+
+    if args.warm_only:
+        report = warm_up()
+        print(json.dumps({**timeline.to_dict(), 'warm_up': report}, indent=1))
+        return
+
+    # The server runs the app in this process, so the app finds the caches warmed here
+    start_warm_up()
+    with timeline.timed_imports('streamlit'):
+        from streamlit.web import cli
+
+    extra = [arg for arg in args.streamlit_args if arg != '--']
+    sys.argv = ['streamlit', 'run', str(APP), *extra]
+    sys.exit(cli.main())
+
+
+if __name__ == '__main__':
+    # Run as the ``startup`` module the app imports, not a second copy named __main__
+    import startup
+    startup.main()
@@ -0,0 +1,229 @@
+"""Term-level KPI time series for tab 2.
+
+Every institution, plus the all-institutions roll-up, is one series on a
+shared grid of periods: (Year, Term) pairs in calendar order (Spring before
+Fall), numbered consecutively from the first year in the data.  Lags and
+windows count periods, not rows, so a missing term leaves a gap instead of
+shifting its neighbours, and filtering years never changes what "the
+previous year" is.
+
+The (series, period, measure) array is built once per data version from the
+university cube and kept in the shared store; ``TermKPIs`` derives from it,
+with whole-array operations over all series at once:
+
+* term series in the charts' wide layout, with an ordered ``Term_Label``;
+* trailing rolling and expanding means over terms;
+* year-over-year changes per term and per year (percent for counts,
+  percentage points for rates);
+* per-year comparisons of two terms (Spring vs. Fall);
+* the correlation of two measures at a range of lags.
+
+Queries take an institution (``None`` for all of them) and the selected
+years; changes and windows still look back into years outside the
+selection.
+"""
+
+import numpy as np
+import pandas as pd
+
+from data_loader import STUDENTS_CSV, data_version
+from shared_store import shared
+from university_cube import RATE_MEASURES, load_cube, term_totals
+
+RATES = list(RATE_MEASURES)
+# Trailing window of the rolling averages: one academic year of terms
+ROLLING_TERMS = 2
+MAX_LAG = 4
+
+
+def _shift(values, lag):
+    """``values`` moved ``lag`` periods later along axis 1, NaN where nothing moved in."""
+    shifted = np.full_like(values, np.nan)
+    if lag < values.shape[1]:
+        shifted[:, lag:] = values[:, :values.shape[1] - lag]
+    return shifted
+
+
+def _changes(values, lag, is_rate):
+    """Change from ``lag`` periods earlier: percent for counts, points for rates."""
+    previous = _shift(values, lag)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(is_rate, values - previous, (values / previous - 1) * 100)
+
+
+def _window_means(values, window):
+    """Trailing mean over ``window`` periods (NaN unless all are present); expanding mean if None."""
+    present = ~np.isnan(values)
+    zero = np.zeros_like(values[:, :1])
+    sums = np.concatenate([zero, np.cumsum(np.where(present, values, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([zero, np.cumsum(present, axis=1)], axis=1)
+    start = np.zeros(values.shape[1], dtype=int)
+    if window is not None:
+        start = np.maximum(np.arange(1, values.shape[1] + 1) - window, 0)
+    sums, counts = sums[:, 1:] - sums[:, start], counts[:, 1:] - counts[:, start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts >= (window or 1), sums / counts, np.nan)
+
+
+class TermKPIs:
+    """Query API over the per-institution term series."""
+
+    def __init__(self, cube):
+        facts = cube.facts
+        self.institutions = cube.institutions()
+        self._series_of = {name: i + 1 for i, name in enumerate(self.institutions)}
+        self.term_names = facts['Term'].cat.categories.tolist()
+        years = facts['Year'].to_numpy()
+        self.first_year = int(years.min()) if len(years) else 0
+        n_years = int(years.max()) - self.first_year + 1 if len(years) else 0
+        n_terms = len(self.term_names)
+        self.labels = np.array([f'{self.first_year + p // n_terms} {self.term_names[p % n_terms]}'
+                                for p in range(n_years * n_terms)], dtype=object)
+
+        rollup = term_totals(facts).reset_index()
+        per_institution = term_totals(facts, ['Institution']).reset_index()
+        self.measures = [col for col in rollup.columns if col not in ('Year', 'Term')]
+        self.is_rate = np.isin(self.measures, RATES)
+        # Series 0 is the roll-up, institution i is series i + 1
+        self.values = np.full((len(self.institutions) + 1, n_years * n_terms, len(self.measures)), np.nan)
+        for series, frame in ((0, rollup), (per_institution['Institution'].cat.codes.to_numpy() + 1,
+                                            per_institution)):
+            periods = (frame['Year'].to_numpy(dtype=int) - self.first_year) * n_terms + frame['Term'].cat.codes
+            self.values[series, periods.to_numpy()] = frame[self.measures].to_numpy(dtype=float)
+        self.present = ~np.isnan(self.values).all(axis=2)
+
+        self._term_changes = _changes(self.values, n_terms, self.is_rate)
+        self._yearly_values = self._fold_years()
+        self._yearly_changes = _changes(self._yearly_values, 1, self.is_rate)
+        self._windows = {}
+        self._slices = {}
+
+    def _fold_years(self):
+        """(series, year, measure): counts summed over terms, rates weighted by enrollment."""
+        n_series, _, n_measures = self.values.shape
+        by_term = self.values.reshape(n_series, -1, len(self.term_names), n_measures)
+        enrolled = by_term[..., self.measures.index('Enrolled')]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            yearly = np.where(np.isnan(by_term).all(axis=2), np.nan, np.nansum(by_term, axis=2))
+            for m in np.flatnonzero(self.is_rate):
+                weights = np.where(np.isnan(by_term[..., m]), 0.0, np.nan_to_num(enrolled))
+                yearly[..., m] = np.nansum(by_term[..., m] * weights, axis=2) / weights.sum(axis=2)
+        return yearly
+
+    def _series(self, institution):
+        return 0 if institution is None else self._series_of[institution]
+
+    def _periods(self, series, years):
+        """Periods with data in ``series``, restricted to ``years``."""
+        periods = np.flatnonzero(self.present[series])
+        if years is not None:
+            periods = periods[np.isin(self.first_year + periods // len(self.term_names), list(years))]
+        return periods
+
+    def _frame(self, periods, values, measures=None):
+        """Rows for ``periods`` of a (period, measure) array, in the ``terms`` layout."""
+        measures = self.measures if measures is None else measures
+        columns = [self.measures.index(m) for m in measures]
+        n_terms = len(self.term_names)
+        frame = pd.DataFrame(values[np.ix_(periods, columns)], columns=measures)
+        frame.insert(0, 'Year', self.first_year + periods // n_terms)
+        frame.insert(1, 'Term', [self.term_names[t] for t in periods % n_terms])
+        frame['Term_Label'] = self.labels[periods].astype(str)
+        return frame
+
+    def _memo(self, key, build):
+        cached = self._slices.get(key)
+        if cached is None:
+            if len(self._slices) > 256:
+                self._slices.clear()
+            cached = self._slices[key] = build()
+        return cached
+
+    def years(self, institution=None):
+        periods = np.flatnonzero(self.present[self._series(institution)])
+        return sorted(set((self.first_year + periods // len(self.term_names)).tolist()))
+
+    def terms(self, institution=None, years=None):
+        """One row per (Year, Term) in period order, in the raw CSV's wide layout plus Term_Label."""
+        def build():
+            series = self._series(institution)
+            frame = self._frame(self._periods(series, years), self.values[series])
+            # Counts are whole numbers unless a department is missing in some term
+            return frame.astype({m: 'int64' for m in self.measures
+                                 if not self.is_rate[self.measures.index(m)] and frame[m].notna().all()})
+        return self._memo(('terms', institution, _years_key(years)), build)
+
+    def changes(self, institution=None, years=None):
+        """Year-over-year change of every measure at each term (vs. the same term a year earlier)."""
+        series = self._series(institution)
+        return self._frame(self._periods(series, years), self._term_changes[series])
+
+    def rolling(self, institution=None, years=None, window=ROLLING_TERMS, measures=RATES):
+        """Mean of ``measures`` over the trailing ``window`` terms (``None``: all terms so far)."""
+        if window not in self._windows:
+            self._windows[window] = _window_means(self.values, window)
+        series = self._series(institution)
+        return self._frame(self._periods(series, years), self._windows[window][series], measures)
+
+    def _yearly_frame(self, values, institution, years):
+        series = self._series(institution)
+        selected = np.array(self.years(institution) if years is None else
+                            sorted(set(years) & set(self.years(institution))), dtype=int)
+        frame = pd.DataFrame(values[series, selected - self.first_year], columns=self.measures)
+        frame.insert(0, 'Year', selected)
+        return frame
+
+    def yearly(self, institution=None, years=None):
+        """Per-year totals: counts summed over the terms, rates enrollment-weighted."""
+        return self._yearly_frame(self._yearly_values, institution, years)
+
+    def yearly_changes(self, institution=None, years=None):
+        """Change of the yearly values from the year before (percent for counts, points for rates)."""
+        return self._memo(('yearly_changes', institution, _years_key(years)),
+                          lambda: self._yearly_frame(self._yearly_changes, institution, years))
+
+    def term_comparison(self, measure, institution=None, years=None, first='Spring', second='Fall'):
+        """Per year: ``measure`` in two terms, and the second minus the first (also in percent)."""
+        series = self._series(institution)
+        by_term = self.values[series, :, self.measures.index(measure)].reshape(-1, len(self.term_names))
+        frame = self._yearly_frame(self._yearly_values, institution, years)[['Year']]
+        rows = frame['Year'].to_numpy() - self.first_year
+        a = by_term[rows, self.term_names.index(first)]
+        b = by_term[rows, self.term_names.index(second)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return frame.assign(**{first: a, second: b, 'Difference': b - a, 'Difference (%)': (b / a - 1) * 100})
+
+    def lag_correlation(self, institution=None, years=None, x=RATES[0], y=RATES[1], max_lag=MAX_LAG):
+        """Pearson correlation of ``x`` at each term with ``y`` ``lag`` terms later.
+
+        Positive lags mean ``x`` leads ``y``.  Only pairs where both terms
+        are in the selected years count; ``Pairs`` is how many there were.
+        """
+        series = self._series(institution)
+        n_periods = self.values.shape[1]
+        selected = np.zeros(n_periods, dtype=bool)
+        selected[self._periods(series, years)] = True
+        xs = np.where(selected, self.values[series, :, self.measures.index(x)], np.nan)
+        ys = np.where(selected, self.values[series, :, self.measures.index(y)], np.nan)
+
+        # (lag, period) matrices: x at t against y at t + lag
+        lags = np.arange(-max_lag, max_lag + 1)
+        later = np.arange(n_periods)[None, :] + lags[:, None]
+        b = np.where((later >= 0) & (later < n_periods), ys[np.clip(later, 0, max(n_periods - 1, 0))], np.nan)
+        a = np.broadcast_to(xs, b.shape)
+        ok = ~np.isnan(a) & ~np.isnan(b)
+        pairs = ok.sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            da = np.where(ok, a - np.where(ok, a, 0).sum(axis=1, keepdims=True) / pairs[:, None], 0.0)
+            db = np.where(ok, b - np.where(ok, b, 0).sum(axis=1, keepdims=True) / pairs[:, None], 0.0)
+            corr = (da * db).sum(axis=1) / np.sqrt((da ** 2).sum(axis=1) * (db ** 2).sum(axis=1))
+        return pd.DataFrame({'Lag': lags, 'Correlation': np.where(pairs >= 3, corr, np.nan), 'Pairs': pairs})
+
+
+def _years_key(years):
+    return None if years is None else tuple(sorted(years))
+
+
+def load_term_kpis():
+    """Process-wide term series for the current students CSV, built once per version."""
+    return shared('term_kpis', data_version(STUDENTS_CSV), lambda: TermKPIs(load_cube()))
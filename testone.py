@@ -1,22 +1,94 @@
+import functools
+import os
+import time
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
+
+from startup import DEFAULT_TERM_METRIC, default_dimension, default_hub, start_warm_up, timeline, warm_up_report
+
+run_start = time.perf_counter()
+# Timed on the process's first run; Matplotlib and plotly.express are imported later, by the charts that use them
+with timeline.timed_imports('dashboard modules'):
+    import pandas as pd
+
+    import charts
+    from data_loader import AIRPORTS_CSV, FLIGHTS_CSV, GENDERPAY_CSV, STUDENTS_CSV, cache_stats, data_version
+    from data_loader import data_path, load_airports
+    from figure_cache import cached_figure, figure_cache
+    from flights import distance_summary, state_distance_stats, state_flight_counts
+    from lod import POINT_BUDGET, over_budget
+    from paygap import load_genderpay_totals, pay_gap_tables
+    from paygap_stats import pay_gap_analysis
+    from profiling import PROFILE_DIR, RerunProfile, data_size_mb
+    from render_cache import cached_render, image_cache
+    from shared_store import shared_store
+    from route_graph import route_graph
+    from route_index import route_index
+    from term_kpis import ROLLING_TERMS, load_term_kpis
 
 # App title
 st.set_page_config(page_title="My Streamlit Dashboard", layout="wide")
 st.title("Bridget Anna Sibley Test 1 DSA 506")
 
-# Main tab setup
-tab1, tab2, tab3 = st.tabs(["Q1: Airports", "Q2: University Dashboard", "Q3: Best & Worst Graph"])
-
-with tab1:
-    import plotly.graph_objects as go
-    import plotly.express as px
-    import pandas as pd
-    import streamlit as st
-
-    st.header("🛫 Chicago O'Hare International Airport (ORD)")
+TAB_NAMES = ["Q1: Airports", "Q2: University Dashboard", "Q3: Best & Worst Graph"]
+DATA_FILES = (FLIGHTS_CSV, AIRPORTS_CSV, STUDENTS_CSV, GENDERPAY_CSV)
+
+
+def new_profile(kind):
+    return RerunProfile(kind, enabled=st.session_state.get('profiling', False),
+                        data_mb=data_size_mb(data_path(name) for name in DATA_FILES))
+
+
+def stage(name, payload_bytes=None):
+    """Timing span for one stage of the current rerun (see profiling.py)."""
+    return st.session_state['profile'].span(name, payload_bytes)
+
+
+def show_figure(chart_id, version, params, build):
+    """Build (or reuse) a cached Plotly figure and send it to the browser, profiling both."""
+    with stage(f'build {chart_id}'):
+        fig = cached_figure(chart_id, version, params, build)
+    with stage(f'send {chart_id}', figure_cache.entry_bytes(chart_id, version, params)):
+        st.plotly_chart(fig, width='stretch')
+
+
+def count_skipped(names):
+    """Credit tabs that did not run with the time their last run took."""
+    timings = st.session_state.get('tab_timings', {})
+    for name in names:
+        if name in timings:
+            timings[name]['skipped'] += 1
+            timings[name]['saved_ms'] = round(timings[name]['saved_ms'] + timings[name]['last_ms'], 1)
+
+
+def timed_tab(name):
+    """Record how long each run of a tab body takes (in session state)."""
+    def decorator(render):
+        @functools.wraps(render)
+        def wrapper():
+            # A fragment-only rerun gets its own profile
+            fragment_run = not st.session_state.get('full_rerun')
+            if fragment_run:
+                st.session_state['profile'] = new_profile('fragment')
+            st.session_state['profile'].section = name
+            start = time.perf_counter()
+            render()
+            timing = st.session_state.setdefault('tab_timings', {}).setdefault(
+                name, {'runs': 0, 'last_ms': 0.0, 'skipped': 0, 'saved_ms': 0.0})
+            timing['runs'] += 1
+            timing['last_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            # A fragment-only rerun skipped every other tab
+            if fragment_run:
+                count_skipped(n for n in TAB_NAMES if n != name)
+                st.session_state['profile'].finish().write_log()
+        return wrapper
+    return decorator
+
+
+# Each tab body is a fragment: widgets inside a tab only rerun that tab
+@st.fragment
+@timed_tab(TAB_NAMES[0])
+def airports_tab():
     st.markdown("""
     ### ✈️ Problem 1: Flight Route Analysis
 
@@ -30,155 +102,160 @@ with tab1:
         - Operational performance
     """)
 
-    # Load data
-    flights = pd.read_csv("Airports_P 1.csv")
-    airports = pd.read_csv("airports.csv")
-
-    # Filter and enrich
-    ord_flights = flights[flights['Destination_airport'] == 'ORD']
-    ord_enriched = ord_flights.merge(
-        airports[['IATA', 'AIRPORT', 'CITY', 'STATE', 'COUNTRY', 'LATITUDE', 'LONGITUDE']],
-        how='left', left_on='Origin_airport', right_on='IATA'
-    ).rename(columns={
-        'AIRPORT': 'Origin_airport_name',
-        'CITY': 'Origin_city',
-        'STATE': 'Origin_state',
-        'COUNTRY': 'Origin_country',
-        'LATITUDE': 'Origin_latitude',
-        'LONGITUDE': 'Origin_longitude'
-    })
-
-    ord_enriched_unique = ord_enriched.drop_duplicates(subset='Origin_airport')
+    # Load data (parsed once per file version, shared across sessions)
+    with stage('load airports'):
+        airports = load_airports()
+    flights_version = data_version(FLIGHTS_CSV, AIRPORTS_CSV)
+    # Dense charts are reduced to the point budget unless full detail is on
+    budget = None if st.session_state.get('full_detail') else POINT_BUDGET
+
+    # Route index: destination -> origins with flight counts, built once per flight log
+    with stage('route index'):
+        routes = route_index(airports)
+
+    # Hub selector (defaults to O'Hare)
+    hub_options = routes.destinations()
+    if not hub_options:
+        st.info("The flight log has no routes into a known airport.")
+        return
+    hub = st.selectbox(
+        "Select destination airport:",
+        hub_options,
+        index=hub_options.index(default_hub(hub_options)),
+        format_func=routes.hub_labels.get
+    )
+    hub_info = routes.hub_info(hub)
+    hub_name = hub_info['AIRPORT']
+    hub_lon, hub_lat = hub_info['LONGITUDE'], hub_info['LATITUDE']
+
+    st.header(f"🛫 {hub_name} Airport ({hub})")
+
+    # One row per origin airport flying into the hub, with its number of flights
+    with stage('hub routes'):
+        hub_routes = routes.hub_routes(hub)
+
+    # Network-wide metrics for every airport, computed once per route index
+    with stage('route graph'):
+        _, network = route_graph(routes)
+    hub_stats = network.loc[hub]
+    st.subheader(f"🕸️ {hub} in the Route Network")
+    col_in, col_out, col_flow, col_rank, col_reach = st.columns(5)
+    col_in.metric("Origin airports", f"{hub_stats['Origins']:,}")
+    col_out.metric("Destinations served", f"{hub_stats['Destinations']:,}")
+    col_flow.metric("Flights in / out", f"{hub_stats['Inbound_flights']:,} / {hub_stats['Outbound_flights']:,}")
+    col_rank.metric("Hub rank (PageRank)", f"#{hub_stats['Hub_rank']} of {len(network)}")
+    col_reach.metric("Reachable in 1 / 2 / 3 flights",
+                     f"{hub_stats['Reach_1']} / {hub_stats['Reach_2']} / {hub_stats['Reach_3']}")
+    with st.expander("Top hubs across the network"):
+        st.dataframe(network.sort_values('Hub_rank').head(20), column_config={
+            'PageRank': st.column_config.NumberColumn(format="%.4f")})
 
     # Flight path map
-    st.subheader("📺 Flight Paths into O'Hare")
-    st.markdown("""
-    This interactive map visualizes **unique flight routes into Chicago O'Hare International Airport (ORD)**.
+    st.subheader(f"📺 Flight Paths into {hub}")
+    st.markdown(f"""
+    This interactive map visualizes **unique flight routes into {hub_name} Airport ({hub})**.
 
     - Each line = a direct flight from a U.S. origin airport.
     - Color indicates **origin state**.
     - Hover to see origin airport, city, and state.
     """)
 
-    unique_states = ord_enriched_unique['Origin_state'].unique()
-    color_pool = px.colors.qualitative.Alphabet + px.colors.qualitative.Set3 + px.colors.qualitative.Dark24
-    color_map = {state: color.replace('rgb', 'rgba').replace(')', ',0.5)') for state, color in zip(unique_states, color_pool)}
-
-    flight_paths = [
-        go.Scattergeo(
-            locationmode='USA-states',
-            lon=[row['Origin_longitude'], -87.9073],
-            lat=[row['Origin_latitude'], 41.9742],
-            mode='lines',
-            line=dict(width=1, color=color_map[row['Origin_state']]),
-            hoverinfo='text',
-            text=f"{row['Origin_airport_name']} ({row['Origin_city']}, {row['Origin_state']})",
-            name=row['Origin_state']
-        ) for _, row in ord_enriched_unique.iterrows()
-    ]
-
-    fig = go.Figure(data=flight_paths)
-    fig.update_layout(
-        title="Unique Flight Routes into Chicago O'Hare (ORD) by Origin State",
-        geo=dict(scope='usa', projection_type='albers usa', showland=True, landcolor='rgb(243, 243, 243)',
-                 subunitwidth=1, countrywidth=1, subunitcolor='rgb(217, 217, 217)', countrycolor='rgb(217, 217, 217)'),
-        margin=dict(l=0, r=0, t=40, b=0)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    great_circle = st.checkbox("Draw curved (great-circle) flight paths", value=False)
+    show_figure('route_map', flights_version, (hub, great_circle, budget), lambda: charts.route_map(
+        hub_routes, hub, hub_name, hub_lon, hub_lat, great_circle=great_circle, budget=budget))
+    if over_budget(3 * len(hub_routes), budget):
+        st.caption("Only the busiest routes are drawn. Turn on **Full chart detail** in the sidebar to see them all.")
 
-    st.markdown("""
-    ### Learnings:
+    if hub == 'ORD':
+        st.markdown("""
+        ### Learnings:
     
-    As a major international airport and travel hub, **Chicago O'Hare** is a destination flight for airports around the world.  
-    The following graphic supports this knowledge — the sheer number of airport flights is clearly visible.  
-    Few patterns are visible otherwise, as color can only distinguish between limited variables.
-    """)
+        As a major international airport and travel hub, **Chicago O'Hare** is a destination flight for airports around the world.  
+        The following graphic supports this knowledge — the sheer number of airport flights is clearly visible.  
+        Few patterns are visible otherwise, as color can only distinguish between limited variables.
+        """)
     # Flights by state
-    st.subheader("📊 Number of Flights into O'Hare by State")
-    state_counts = ord_enriched['Origin_state'].value_counts().reset_index()
-    state_counts.columns = ['Origin_state', 'Flight_Count']
-    fig2 = go.Figure(go.Bar(
-        x=state_counts['Origin_state'], y=state_counts['Flight_Count'],
-        text=state_counts['Flight_Count'], textposition='outside', marker_color='green'))
-    fig2.update_layout(
-        title="Flights into Chicago O'Hare (ORD) by Origin State",
-        xaxis_title="Origin State", yaxis_title="Number of Flights",
-        xaxis_tickangle=-45, bargap=0.2, margin=dict(l=20, r=20, t=60, b=40))
-    st.plotly_chart(fig2, use_container_width=True)
-    st.markdown("""
-    ### Learnings:
+    st.subheader(f"📊 Number of Flights into {hub} by State")
+    with stage('state flight counts'):
+        state_counts = state_flight_counts(hub_routes)
+    show_figure('state_flights_bar', flights_version, (hub, budget),
+                lambda: charts.state_flights_bar(state_counts, hub, hub_name, budget=budget))
+    if hub == 'ORD':
+        st.markdown("""
+        ### Learnings:
     
-    This graphic more clearly shows which airports send the most flights to **Chicago**.  
-    The top four states have unclear reasons for being so: **New York** and **California**, with large state populations and more than one international travel hub, are logical front runners — but otherwise there isn't a clear pattern?
-    """)
+        This graphic more clearly shows which airports send the most flights to **Chicago**.  
+        The top four states have unclear reasons for being so: **New York** and **California**, with large state populations and more than one international travel hub, are logical front runners — but otherwise there isn't a clear pattern?
+        """)
 
     # Stacked bar: population by city/state
     st.subheader("🏢 Origin City Populations by State")
-    data = ord_enriched_unique[['Origin_state', 'Origin_city', 'Origin_airport_name', 'Origin_population']].dropna()
-    state_totals = data.groupby('Origin_state')['Origin_population'].sum().sort_values(ascending=False)
-    data['hover_text'] = data['Origin_airport_name'] + "<br>Population: " + data['Origin_population'].astype(int).astype(str)
-    fig3 = px.bar(
-        data, x='Origin_state', y='Origin_population', color='Origin_city', text='hover_text',
-        category_orders={'Origin_state': state_totals.index.tolist()},
-        labels={'Origin_population': 'Population', 'Origin_state': 'State'},
-        title='Stacked Bar: Origin City Populations by State')
-    fig3.update_traces(hoverinfo='text', texttemplate=None)
-    fig3.update_layout(barmode='stack', xaxis_tickangle=-45, yaxis_title='Total Population (Sum)',
-                       showlegend=False, margin=dict(l=0, r=0, t=40, b=0))
-    st.plotly_chart(fig3, use_container_width=True)
-    st.markdown("""
-    ### Learnings:
+    show_figure('city_population_bar', flights_version, (hub, budget),
+                lambda: charts.city_population_bar(hub_routes, budget=budget))
+    if over_budget(len(hub_routes), budget):
+        # Smaller cities are folded into "Other"; drill into one state at full detail
+        with st.expander("Drill into one state's cities"):
+            state = st.selectbox("Origin state:", sorted(hub_routes['Origin_state'].dropna().unique()))
+            show_figure('city_population_bar', flights_version, (hub, 'state', state), lambda: charts.city_population_bar(
+                hub_routes[hub_routes['Origin_state'] == state]))
+    if hub == 'ORD':
+        st.markdown("""
+        ### Learnings:
     
-    Examining the populations represented by airports sending flights to **Chicago**, more is revealed.  
-    **New York** has two large airports that service the largest population in the country.  
-    This graphic shows that one reason a state may send more flights to Chicago than another is if it happens to have airports servicing a large population of people.
-    """)
+        Examining the populations represented by airports sending flights to **Chicago**, more is revealed.  
+        **New York** has two large airports that service the largest population in the country.  
+        This graphic shows that one reason a state may send more flights to Chicago than another is if it happens to have airports servicing a large population of people.
+        """)
 
     # Population-normalized flight count
     st.subheader("✈️ Flights per 100,000 Residents by State")
-    pop_by_state = ord_enriched_unique.groupby('Origin_state')['Origin_population'].sum().reset_index()
-    flights_by_state = ord_enriched.groupby('Origin_state').size().reset_index(name='Flight_Count')
-    combined = pd.merge(pop_by_state, flights_by_state, on='Origin_state')
-    combined['Flights_per_100k'] = (combined['Flight_Count'] / combined['Origin_population']) * 100000
-    combined['hover_text'] = "State: " + combined['Origin_state'] + "<br>Flights: " + combined['Flight_Count'].astype(str) + "<br>Population: " + combined['Origin_population'].astype(int).astype(str)
-    combined = combined.sort_values(by='Flights_per_100k', ascending=False)
-    fig4 = px.bar(
-        combined, x='Flights_per_100k', y='Origin_state', orientation='h',
-        text=combined['Flights_per_100k'].round(1),
-        labels={'Flights_per_100k': 'Flights per 100,000 Residents', 'Origin_state': 'State'},
-        title='Flights into ORD per 100,000 Residents by State')
-    fig4.update_traces(hoverinfo='text', hovertext=combined['hover_text'], marker_color='darkgreen', textposition='outside')
-    fig4.update_layout(xaxis_title='Flights per 100,000 Residents', yaxis_title='Origin State',
-                       showlegend=False, margin=dict(l=40, r=40, t=60, b=40))
-    st.plotly_chart(fig4, use_container_width=True)
-    st.markdown("""
-    ### Learnings:
+    with stage('flights per capita'):
+        combined = charts.flights_per_capita(hub_routes, state_counts)
+    show_figure('per_capita_bar', flights_version, hub, lambda: charts.per_capita_bar(combined, hub))
+    if hub == 'ORD':
+        st.markdown("""
+        ### Learnings:
     
-    When examining how many flights are sent to **Chicago per capita** by state, additional findings emerge.  
-    The states with high numbers of flights per capita tend to be **small population states** without major travel hubs or international airports—outliers rather than meaningful trends.  
-    Interestingly, **New York**, despite sending the most total flights to Chicago, has one of the **lowest numbers of flights per capita**.
-    """)
+        When examining how many flights are sent to **Chicago per capita** by state, additional findings emerge.  
+        The states with high numbers of flights per capita tend to be **small population states** without major travel hubs or international airports—outliers rather than meaningful trends.  
+        Interestingly, **New York**, despite sending the most total flights to Chicago, has one of the **lowest numbers of flights per capita**.
+        """)
 
     # Choropleth
     st.subheader("🌍 Choropleth Map: Flights per 100,000 Residents")
-    fig5 = px.choropleth(
-        combined,
-        locations='Origin_state', locationmode='USA-states', color='Flights_per_100k',
-        color_continuous_scale='Greens', scope='usa',
-        hover_data={'Flights_per_100k': ':.1f', 'Flight_Count': True, 'Origin_population': True, 'Origin_state': False},
-        labels={'Flights_per_100k': 'Flights per 100,000'},
-        title='Flights into ORD per 100,000 Residents by State')
-    fig5.update_layout(margin=dict(l=0, r=0, t=50, b=0))
-    st.plotly_chart(fig5, use_container_width=True)
-    st.markdown("""
-    ### Learnings:
+    show_figure('per_capita_choropleth', flights_version, hub,
+                lambda: charts.per_capita_choropleth(combined, hub))
+    if hub == 'ORD':
+        st.markdown("""
+        ### Learnings:
     
-    Another view of the **number of flights to Chicago per capita**.  
-    Areas to consider investigating in the future include **why Vermont and Iowa** have such high numbers of flights to Chicago.
-    """)
-
+        Another view of the **number of flights to Chicago per capita**.  
+        Areas to consider investigating in the future include **why Vermont and Iowa** have such high numbers of flights to Chicago.
+        """)
 
-with tab2:
+    # Route lengths: great-circle distance per route, weighted by its flights
+    st.subheader(f"📏 Route Lengths into {hub}")
+    with stage('distance stats'):
+        distances = state_distance_stats(hub_routes)
+        summary = distance_summary(hub_routes)
+    col_avg, col_max, col_miles = st.columns(3)
+    col_avg.metric("Average flight distance", f"{summary['avg_miles']:,.0f} mi")
+    col_max.metric("Longest route", f"{summary['max_miles']:,.0f} mi")
+    if 'seat_miles' in summary:
+        col_miles.metric("Seat-miles", f"{summary['seat_miles']:,.0f}")
+    else:
+        col_miles.metric("Flight-miles", f"{summary['flight_miles']:,.0f}")
+    col_hist, col_state = st.columns(2)
+    with col_hist:
+        show_figure('distance_histogram', flights_version, (hub, budget),
+                    lambda: charts.distance_histogram(hub_routes, hub, budget=budget))
+    with col_state:
+        show_figure('state_distance_bar', flights_version, hub, lambda: charts.state_distance_bar(distances, hub))
+
+
+@st.fragment
+@timed_tab(TAB_NAMES[1])
+def university_tab():
     st.markdown("""
     ### Problem 2: University Student Admissions Dashboard
     
@@ -206,20 +283,34 @@ with tab2:
 
 
 
-    # Load and prepare data
-    students = pd.read_csv('university_student_dashboard_data.csv')
-    students['Term_Label'] = students['Year'].astype(str) + ' ' + students['Term']
+    # Term series per institution (from the pre-aggregated cube), built once per data version
+    with stage('load term KPIs'):
+        kpis = load_term_kpis()
+    students_version = data_version(STUDENTS_CSV)
+
+    # Institution filter, only when the data covers more than one
+    institution = None
+    if len(kpis.institutions) > 1:
+        institution = st.selectbox("Select Institution:", [None] + kpis.institutions,
+                                   format_func=lambda name: "All institutions" if name is None else name)
 
     # Year Filter Below Header
     st.markdown("Use the dropdown below to filter by academic year:")
-    all_years = sorted(students['Year'].unique())
+    all_years = kpis.years(institution)
     selected_years = st.multiselect(
         label="Select Year(s):",
         options=all_years,
         default=all_years
     )
+    if not selected_years:
+        st.info("Select at least one year to see the charts.")
+        return
 
-    filtered_students = students[students['Year'].isin(selected_years)].copy()
+    with stage('term series'):
+        filtered_students = kpis.terms(institution, selected_years)
+        yearly_changes = kpis.yearly_changes(institution, selected_years)
+        rolling_rates = kpis.rolling(institution, selected_years, ROLLING_TERMS)
+    filter_key = (institution, tuple(sorted(selected_years)))
 
     # Row 1 - Two columns
     st.markdown("## Admissions and Enrollment")
@@ -228,72 +319,14 @@ with tab2:
     with col1_row1:
         st.subheader("Total Applications, Admissions, and Enrollment Over Time")
 
-        category_order = ['Enrolled', 'Admitted', 'Applications']
-        melted = filtered_students.melt(
-            id_vars='Term_Label',
-            value_vars=category_order,
-            var_name='Category',
-            value_name='Count'
-        )
-        melted['Category'] = pd.Categorical(melted['Category'], categories=category_order, ordered=True)
-
-        fig_admissions = px.area(
-            melted,
-            x='Term_Label',
-            y='Count',
-            color='Category',
-            category_orders={'Category': category_order},
-            title='Applications, Admitted, and Enrolled by Term',
-            labels={'Term_Label': 'Term', 'Count': 'Number of Students'},
-        )
-
-        fig_admissions.update_layout(
-            xaxis_tickangle=-45,
-            margin=dict(l=40, r=40, t=50, b=40)
-        )
-
-        st.plotly_chart(fig_admissions, use_container_width=True)
+        show_figure('admissions_area', students_version, filter_key,
+                    lambda: charts.admissions_area(filtered_students))
 
     with col2_row1:
         st.subheader("Enrollment by Department Over Time")
 
-        majors = ['Engineering Enrolled', 'Business Enrolled', 'Arts Enrolled', 'Science Enrolled']
-        colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
-
-        filtered_students['Total_Enrolled'] = filtered_students[majors].sum(axis=1)
-
-        fig_departments = go.Figure()
-        for i, major in enumerate(majors):
-            percent = (filtered_students[major] / filtered_students['Total_Enrolled'] * 100).round(1)
-            hover_text = (
-                "<b>Term:</b> " + filtered_students['Term_Label'] + "<br>" +
-                f"<b>{major}:</b> " + filtered_students[major].map('{:,}'.format) +
-                " (" + percent.map('{:.1f}'.format) + "% of total)"
-            )
-
-            fig_departments.add_trace(go.Scatter(
-                x=filtered_students['Term_Label'],
-                y=filtered_students[major],
-                mode='lines',
-                name=major,
-                stackgroup='one',
-                line=dict(width=0.5),
-                marker=dict(color=colors[i]),
-                hoverinfo='text',
-                hovertext=hover_text,
-                opacity=0.9
-            ))
-
-        fig_departments.update_layout(
-            title='Enrolled Students by Major Over Time (% in Hover)',
-            xaxis=dict(title='Term', tickangle=-45),
-            yaxis=dict(title='Number of Enrolled Students'),
-            showlegend=True,
-            margin=dict(l=40, r=40, t=60, b=40),
-            legend_title_text='Major'
-        )
-
-        st.plotly_chart(fig_departments, use_container_width=True)
+        show_figure('departments_area', students_version, filter_key,
+                    lambda: charts.departments_area(filtered_students))
 
     # Spacer
     st.markdown("---")
@@ -305,113 +338,47 @@ with tab2:
     with col1_row2:
         st.subheader("Department Growth and Satisfaction Rates")
 
-        subjects = ['Engineering Enrolled', 'Business Enrolled', 'Arts Enrolled', 'Science Enrolled']
-        subject_colors = {
-            'Engineering Enrolled': '#1f77b4',
-            'Business Enrolled': '#ff7f0e',
-            'Arts Enrolled': '#2ca02c',
-            'Science Enrolled': '#d62728'
-        }
-
-        yearly = filtered_students.groupby('Year')[subjects + ['Student Satisfaction (%)']].sum().reset_index()
-        growth = yearly.copy()
-        for subject in subjects:
-            growth[subject] = yearly[subject].pct_change() * 100
-        growth['Satisfaction Change'] = yearly['Student Satisfaction (%)'].diff()
-
-        fig_growth_satisfaction = go.Figure()
-        for subject in subjects:
-            fig_growth_satisfaction.add_trace(go.Bar(
-                x=growth['Year'],
-                y=growth[subject],
-                name=subject.replace(' Enrolled', ''),
-                marker_color=subject_colors[subject],
-                hovertemplate=f"%{{y:.1f}}% change<br><b>{subject.replace(' Enrolled', '')}</b><br>Year: %{{x}}<extra></extra>"
-            ))
-
-        fig_growth_satisfaction.add_trace(go.Scatter(
-            x=growth['Year'],
-            y=growth['Satisfaction Change'],
-            mode='lines+markers',
-            name='Change in Satisfaction Rate (%)',
-            line=dict(color='black', width=3, dash='dot'),
-            marker=dict(size=7),
-            yaxis='y2',
-            hovertemplate="Change: %{y:.1f}%<br>Year: %{x}<extra></extra>"
-        ))
-
-        for year in growth['Year'][1:]:
-            fig_growth_satisfaction.add_vline(
-                x=year - 0.5,
-                line=dict(color='lightgray', width=1, dash='dash'),
-                layer='below'
-            )
-
-        fig_growth_satisfaction.update_layout(
-            title='Year-over-Year Enrollment Growth by Subject Area<br>with Change in Student Satisfaction Rate',
-            xaxis_title='Year',
-            yaxis=dict(title='Enrollment Growth (%)'),
-            yaxis2=dict(
-                title='Change in Satisfaction Rate (%)',
-                overlaying='y',
-                side='right',
-                showgrid=False
-            ),
-            barmode='group',
-            legend=dict(
-                title='Metric',
-                x=1.05,
-                y=1,
-                xanchor='left',
-                yanchor='top'
-            ),
-            margin=dict(l=80, r=200, t=100, b=80),
-            hovermode='x unified',
-            plot_bgcolor='white'
-        )
-
-        st.plotly_chart(fig_growth_satisfaction, use_container_width=True)
-
-with col2_row2:
+        show_figure('growth_satisfaction', students_version, filter_key,
+                    lambda: charts.growth_satisfaction_chart(yearly_changes))
+
+    with col2_row2:
         st.subheader("Retention and Satisfaction Over Time")
-        fig_rates = go.Figure()
-
-        # Add Retention Rate line
-        fig_rates.add_trace(go.Scatter(
-            x=filtered_students['Term_Label'],
-            y=filtered_students['Retention Rate (%)'],
-            mode='lines+markers',
-            name='Retention Rate (%)',
-            line=dict(color='darkgreen', width=3),
-            marker=dict(size=6)
-        ))
-    
-        # Add Satisfaction Rate line
-        fig_rates.add_trace(go.Scatter(
-            x=filtered_students['Term_Label'],
-            y=filtered_students['Student Satisfaction (%)'],
-            mode='lines+markers',
-            name='Student Satisfaction (%)',
-            line=dict(color='royalblue', width=3),
-            marker=dict(size=6)
-        ))
-    
-        # Layout
-        fig_rates.update_layout(
-            title='Student Satisfaction and Retention Rates Over Time',
-            xaxis=dict(title='Term', tickangle=-45),
-            yaxis=dict(title='Percent (%)', tickformat=".0f"),
-            showlegend=True,
-            legend_title_text='Metric',
-            margin=dict(l=40, r=40, t=60, b=60)
-        )
-    
-        st.plotly_chart(fig_rates, use_container_width=True)
+        show_figure('rates_chart', students_version, filter_key,
+                    lambda: charts.rates_chart(filtered_students, rolling_rates, ROLLING_TERMS))
+
+    # Spacer
+    st.markdown("---")
+
+    # Row 3 - Term comparisons and lead/lag between the rates
+    st.markdown("## Term Trends")
+    col1_row3, col2_row3 = st.columns(2)
+
+    with col1_row3:
+        st.subheader("Spring vs. Fall")
+        measure = st.selectbox("Select Metric:", kpis.measures, index=kpis.measures.index(DEFAULT_TERM_METRIC))
+        with stage('term comparison'):
+            comparison = kpis.term_comparison(measure, institution, selected_years)
+        show_figure('term_comparison', students_version, filter_key + (measure,),
+                    lambda: charts.term_comparison_chart(comparison, measure))
+
+    with col2_row3:
+        st.subheader("Does Retention Lead Satisfaction?")
+        with stage('lag correlation'):
+            correlations = kpis.lag_correlation(institution, selected_years)
+        show_figure('lag_correlation', students_version, filter_key,
+                    lambda: charts.lag_correlation_chart(correlations))
+        st.markdown("""
+        Each bar correlates retention in one term with satisfaction some terms later (positive lags) or
+        earlier (negative lags). A peak at a positive lag would suggest retention leads; when both rates
+        trend upward together, every lag correlates and the peak stays at zero.
+        """)
 
 
 
         
-with tab3:
+@st.fragment
+@timed_tab(TAB_NAMES[2])
+def paygap_tab():
     st.markdown("""
 ### Problem 3: Gender Pay Gap Visualizations: Best & Worst
 
@@ -441,40 +408,18 @@ Include a brief explanation comparing both visualizations.
 
 
                     
-        # Load dataset
-        genderpay = pd.read_csv('Glassdoor Gender Pay Gap.csv')
-
-        # Calculate total earnings
-        genderpay['TotalPay'] = genderpay['BasePay'] + genderpay['Bonus']
-        totals = genderpay.groupby('Gender')['TotalPay'].sum()
-
-        # Plotting
-        fig, ax = plt.subplots(figsize=(6, 5))
-        bars = ax.bar(totals.index, totals.values, color='orange')
-
-        # Add labels
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(
-                bar.get_x() + bar.get_width() / 2,
-                height + height * 0.02,
-                f'${int(height):,}',
-                ha='center',
-                color='orange',
-                fontsize=12,
-                weight='bold'
-            )
-
-        # Styling
-        ax.set_title('Total Earnings by Gender', color='orange', fontsize=14, weight='bold')
-        ax.set_ylabel('Total Earnings ($)', color='orange', fontsize=12)
-        ax.spines['bottom'].set_color('orange')
-        ax.spines['left'].set_color('orange')
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-
-        plt.tight_layout()
-        st.pyplot(fig)
+        # Load dataset and calculate total earnings (shared by both charts below)
+        with stage('load genderpay'):
+            genderpay = load_genderpay_totals()
+            totals = genderpay.groupby('Gender', observed=True)['TotalPay'].sum()
+
+        # Rendered to PNG once per data version and served from a bounded byte cache
+        genderpay_version = data_version(GENDERPAY_CSV)
+        with stage('render ugly_earnings'):
+            earnings_png = cached_render('ugly_earnings', genderpay_version,
+                                         lambda: charts.ugly_earnings_figure(totals))
+        with stage('send ugly_earnings', len(earnings_png)):
+            st.image(earnings_png, width='stretch')
 
         st.subheader("Better Chart Highlighting Gender Pay Disparities")
         
@@ -482,64 +427,22 @@ Include a brief explanation comparing both visualizations.
         st.header("Gender Pay Gap Across Dimensions")
        
         
-        # Load dataset
-        genderpay = pd.read_csv('Glassdoor Gender Pay Gap.csv')
-        
-        # Create TotalPay column
-        genderpay['TotalPay'] = genderpay['BasePay'] + genderpay['Bonus']
-        
-        # Define dimensions and display names
-        group_cols = ['JobTitle', 'Education', 'Dept', 'Seniority', 'PerfEval', 'Age']
-        dimension_labels = {
-            'JobTitle': 'Job Title',
-            'Education': 'Education Level',
-            'Dept': 'Department',
-            'Seniority': 'Seniority Level',
-            'PerfEval': 'Performance Evaluation',
-            'Age': 'Age Group'
-        }
-        
-        # Process data into normalized earnings ratios
-        all_results = []
-        for col in group_cols:
-            group = genderpay.groupby([col, 'Gender'])['TotalPay'].mean().reset_index()
-            pivot = group.pivot(index=col, columns='Gender', values='TotalPay')
-            pivot['Male_ratio'] = pivot['Male'] / pivot[['Male', 'Female']].max(axis=1)
-            pivot['Female_ratio'] = pivot['Female'] / pivot[['Male', 'Female']].max(axis=1)
-            result = pivot[['Male_ratio', 'Female_ratio']].rename(columns={'Male_ratio': 'Male', 'Female_ratio': 'Female'}).reset_index()
-            result['Dimension'] = dimension_labels[col]
-            result = result.rename(columns={col: 'Category'})
-            all_results.append(result)
-        
-        # Combine into one dataframe
-        final_df = pd.concat(all_results, ignore_index=True)
-        final_df = final_df[['Dimension', 'Category', 'Male', 'Female']]
-        
-        # Compute summary
-        def compute_summary(group):
-            num_groups = group['Category'].nunique()
-            avg_male = int(round(group['Male'].mean() * 100))
-            avg_female = int(round(group['Female'].mean() * 100))
-            avg_gap = int(round((group['Male'] - group['Female']).abs().mean() * 100))
-            female_less = (group['Female'] < group['Male']).sum()
-            percent_female_less = int(round((female_less / num_groups) * 100))
-            return pd.Series({
-                'Number of Categories': num_groups,
-                '% of Categories Where Women Earn Less': percent_female_less,
-                'Average Male Earnings (%)': avg_male,
-                'Average Female Earnings (%)': avg_female,
-                'Average Earnings Gap (%)': avg_gap
-            })
-        
-        summary = final_df.groupby('Dimension').apply(compute_summary).reset_index()
+        # Normalized earnings ratios for every dimension plus a per-dimension
+        # summary, computed in one vectorized pass and cached per data version
+        with stage('pay gap tables'):
+            final_df, summary = pay_gap_tables(genderpay, version=genderpay_version)
+
         # Dropdown to view by dimension
-        dimension_choice = st.selectbox("Select Dimension to View Category-Level Pay Ratios:", sorted(final_df['Dimension'].unique()))
+        dimensions = sorted(final_df['Dimension'].unique())
+        dimension_choice = st.selectbox("Select Dimension to View Category-Level Pay Ratios:", dimensions,
+                                        index=dimensions.index(default_dimension(final_df)))
         filtered_view = final_df[final_df['Dimension'] == dimension_choice]
         
      
         # Show tables
         st.subheader("For Every $1 Made by a Man, Women will Earn Less by Almost All Dimensions.")
-        st.dataframe(filtered_view.style.format({'Male': '{:.2%}', 'Female': '{:.2%}'}))
+        with stage('send pay gap table', int(filtered_view.memory_usage(deep=True).sum())):
+            st.dataframe(filtered_view.style.format({'Male': '{:.2%}', 'Female': '{:.2%}'}))
         st.markdown("""
         **Learnings:**  
         This graphic is not pretty, and could definitely look a bit better—if I'm being honest.  
@@ -550,9 +453,86 @@ Include a brief explanation comparing both visualizations.
         3. **Limitations Acknowledged:** While I’m not a statistician and this may not be the perfect visualization method, it is more honest, informative, and transparent than the 'Ugly' graph shown above.
         """)
 
-    
-
-
-    
-
-
+        # Which gaps are more than noise, and which survive controlling for the other factors
+        st.subheader("Which Gaps Hold Up? Bootstrap Intervals and Adjusted Gaps")
+        with stage('pay gap bootstrap'):
+            analysis = pay_gap_analysis(genderpay, version=genderpay_version)
+        dimension_stats = analysis[analysis['Dimension'] == dimension_choice]
+        show_figure('pay_gap_intervals', genderpay_version, dimension_choice,
+                    lambda: charts.pay_gap_intervals(dimension_stats, dimension_choice))
+        st.markdown("""
+        The **raw gap** compares average pay of men and women in each category; the **adjusted gap** compares them
+        with job title, education, department, seniority, performance rating and age held equal.
+        Bars are 95% bootstrap intervals: a gap whose interval crosses zero could well be noise from small groups.
+        """)
+        with st.expander("Interval table"):
+            st.dataframe(dimension_stats.drop(columns='Dimension'), hide_index=True, column_config={
+                col: st.column_config.NumberColumn(format="%.3f" if 'per_dollar' in col else "%.1f")
+                for col in dimension_stats.columns if col.startswith(('Female_per_dollar', 'Adjusted_gap'))})
+
+
+# Profiling toggle: when on, every rerun is timed stage by stage and logged
+st.sidebar.toggle("Profile reruns", key='profiling',
+                  value=os.environ.get("DASHBOARD_PROFILE", "") not in ("", "0"))
+st.session_state['profile'] = new_profile('full')
+# Dense charts are downsampled to a point budget; this sends every point instead
+st.sidebar.toggle("Full chart detail", key='full_detail',
+                  help=f"Draw every route, city and value, even beyond {POINT_BUDGET:,} points per chart.")
+
+# Warm every tab's data and default figures in the background (once per data
+# version; already running if the server was started with startup.py), so
+# switching tabs does not wait for their first computation
+start_warm_up()
+
+# Main tab setup: only the selected tab's body runs on a full rerun
+tabs = st.tabs(TAB_NAMES, key='active_tab', on_change='rerun')
+st.session_state['full_rerun'] = True
+try:
+    for name, tab, render in zip(TAB_NAMES, tabs, (airports_tab, university_tab, paygap_tab)):
+        with tab:
+            if tab.open:
+                render()
+            else:
+                count_skipped([name])
+finally:
+    # A failing tab must not leave later fragment reruns counted as full ones
+    st.session_state['full_rerun'] = False
+profile = st.session_state['profile'].finish()
+profile.write_log()
+# Time to first paint: this session's first complete run, and the process's first one
+st.session_state.setdefault('first_paint_ms', round((time.perf_counter() - run_start) * 1000, 1))
+timeline.mark('first_paint')
+timeline.write_log()
+
+
+# Data cache counters: cold loads should happen once per data version, not per click
+with st.sidebar.expander("Data cache"):
+    st.json(cache_stats())
+
+# Figure cache: per-chart build time (ms), serialized size (bytes) and hits
+with st.sidebar.expander("Figure cache"):
+    st.json(figure_cache.info())
+    st.dataframe(pd.DataFrame.from_dict(figure_cache.stats(), orient='index'))
+
+# Per-tab timing: last run time, and time saved by not running hidden tabs
+with st.sidebar.expander("Tab timing"):
+    st.dataframe(pd.DataFrame.from_dict(st.session_state.get('tab_timings', {}), orient='index'))
+
+# Cold start: import times, ms from process start to warm-up and first paint, and the
+# background warm-up's per-tab and wall times
+with st.sidebar.expander("Startup"):
+    st.caption(f"This session's first paint: {st.session_state['first_paint_ms']:,.0f} ms")
+    st.json({**timeline.to_dict(), 'warm_up': warm_up_report() or {'status': 'running'}})
+
+# Rendered Matplotlib images held in the byte cache
+with st.sidebar.expander("Image cache"):
+    st.json(image_cache.stats())
+
+with st.sidebar.expander("Shared store"):
+    st.json(shared_store.stats())
+
+# Stage timings, RSS deltas and browser payload sizes of this rerun
+if profile.enabled:
+    with st.sidebar.expander("Rerun profile", expanded=True):
+        st.caption(f"{profile.kind} rerun, {profile.total_ms:.0f} ms total; logged to {PROFILE_DIR}")
+        st.dataframe(profile.frame(), hide_index=True)
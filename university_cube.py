@@ -0,0 +1,130 @@
+"""Pre-aggregated (institution, year, term, department) cube for tab 2.
+
+The raw admissions table is folded once per data version into a long fact
+table with one row per (Institution, Year, Term, Department).  Department
+``'All'`` rows carry the institution-wide measures (applications, admitted,
+enrolled and the two rates); per-department rows carry that department's
+enrolled count.  Rates are stored enrollment-weighted (rate x enrolled) so
+that any slice can be re-aggregated across institutions correctly.
+
+Dimensions are stored as categoricals and measures as compact numeric
+columns, and the cube is written to a Parquet file in ``.data_cache/`` when
+pyarrow is available.  ``term_totals`` folds any slice of it back into the
+original CSV's wide per-term layout; the tab-2 charts read the term series
+``term_kpis`` derives from it.
+"""
+
+import pandas as pd
+
+from data_loader import CACHE_DIR, HAVE_ARROW, STUDENTS_CSV, data_version, load_students
+from shared_store import shared
+
+DEFAULT_INSTITUTION = 'University'
+ALL_DEPARTMENTS = 'All'
+TERM_ORDER = ['Spring', 'Fall']
+
+COUNT_MEASURES = ['Applications', 'Admitted', 'Enrolled']
+RATE_MEASURES = {'Retention Rate (%)': 'Retention_weighted',
+                 'Student Satisfaction (%)': 'Satisfaction_weighted'}
+DIMENSIONS = ['Institution', 'Year', 'Term', 'Department']
+
+
+def department_columns(students):
+    return [c for c in students.columns if c.endswith(' Enrolled') and c != 'Enrolled']
+
+
+def build_cube(students):
+    """Fold the raw admissions table into the long fact table."""
+    if 'Institution' not in students:
+        students = students.assign(Institution=DEFAULT_INSTITUTION)
+    weighted = {name: students[rate] * students['Enrolled'] for rate, name in RATE_MEASURES.items()}
+    base = students[['Institution', 'Year', 'Term'] + COUNT_MEASURES].assign(**weighted)
+
+    totals = base.assign(Department=ALL_DEPARTMENTS)
+    majors = department_columns(students)
+    per_department = students[['Institution', 'Year', 'Term'] + majors].melt(
+        id_vars=['Institution', 'Year', 'Term'], var_name='Department', value_name='Enrolled')
+    per_department['Department'] = per_department['Department'].str.removesuffix(' Enrolled')
+
+    # Department rows only carry Enrolled; their other measures are zero
+    facts = pd.concat([totals, per_department], ignore_index=True)
+    facts = facts.fillna({col: 0 for col in COUNT_MEASURES + list(RATE_MEASURES.values())})
+    # Several raw rows per cell (e.g. per campus) are summed into one
+    facts = facts.groupby(DIMENSIONS, sort=False, observed=True).sum().reset_index()
+
+    departments = [ALL_DEPARTMENTS] + [m.removesuffix(' Enrolled') for m in majors]
+    terms = TERM_ORDER + sorted(set(facts['Term']) - set(TERM_ORDER))
+    return facts.astype({
+        'Institution': 'category',
+        'Year': 'int16',
+        'Term': pd.CategoricalDtype(terms, ordered=True),
+        'Department': pd.CategoricalDtype(departments, ordered=True),
+        'Applications': 'int32',
+        'Admitted': 'int32',
+        'Enrolled': 'int32',
+        'Retention_weighted': 'float64',
+        'Satisfaction_weighted': 'float64',
+    }).sort_values(['Institution', 'Year', 'Term', 'Department'], ignore_index=True)
+
+
+def term_totals(facts, by=()):
+    """Wide per-term measures of ``facts``, indexed by ``by`` + (Year, Term).
+
+    Counts are summed over everything else and rates are enrollment-weighted
+    averages; each department's enrollment gets a ``'<Department> Enrolled'``
+    column.
+    """
+    by = list(by)
+    measures = COUNT_MEASURES + list(RATE_MEASURES.values())
+    cells = (facts.groupby(by + ['Year', 'Term', 'Department'], observed=True)[measures].sum()
+             .astype({m: 'int64' for m in COUNT_MEASURES}))
+    totals = cells.xs(ALL_DEPARTMENTS, level='Department') if len(cells) else cells.droplevel('Department')
+    frame = totals[COUNT_MEASURES].copy()
+    for rate, weighted in RATE_MEASURES.items():
+        frame[rate] = totals[weighted] / totals['Enrolled']
+    by_department = cells['Enrolled'].unstack('Department')
+    for department in facts['Department'].cat.categories:
+        if department != ALL_DEPARTMENTS:
+            frame[f'{department} Enrolled'] = by_department.get(department, pd.Series(dtype='int64'))
+    return frame
+
+
+class UniversityCube:
+    """The fact table; ``term_kpis`` builds the tab-2 term series from it."""
+
+    def __init__(self, facts):
+        self.facts = facts
+
+    def institutions(self):
+        return self.facts['Institution'].cat.categories.tolist()
+
+
+def _cube_path(version):
+    return CACHE_DIR / f'university_cube.{version}.parquet'
+
+
+def load_cube():
+    """Process-wide cube for the current students CSV, built once per version."""
+    version = data_version(STUDENTS_CSV)
+
+    def build():
+        path = _cube_path(version)
+        facts = None
+        if HAVE_ARROW and path.exists():
+            try:
+                facts = pd.read_parquet(path)
+            except Exception:
+                facts = None
+        if facts is None:
+            facts = build_cube(load_students())
+            if HAVE_ARROW:
+                try:
+                    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    for old in CACHE_DIR.glob('university_cube.*.parquet'):
+                        old.unlink(missing_ok=True)
+                    facts.to_parquet(path, index=False)
+                except OSError:
+                    pass
+        return UniversityCube(facts)
+
+    return shared('university_cube', version, build)